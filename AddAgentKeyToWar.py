@@ -7,13 +7,11 @@
 # and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
 #######################################################################################################################
 import getopt
-import json
-import os
-import subprocess
 import sys
 
 # python -m pip install --upgrade git+https://github.com/HCL-TECH-SOFTWARE/asoc_automation_iast
 import asoc_automation_iast.IastUtils as IastUtils
+from asoc_automation_iast.AgentPackaging import add_config_to_war, asoc_config_json
 
 
 def print_usage():
@@ -45,25 +43,18 @@ def main():
         print_usage()
         exit(1)
 
-    # create a user config file
-    with open(IastUtils.asoc_config_filename, 'w') as user_config_file:
-        json.dump({'accessToken': agent_key, 'host': host}, user_config_file)
-
     # allow for path with or without the filename
     if not path_to_war.endswith(IastUtils.war_name):
         path_to_war += "/" + IastUtils.war_name
 
-    # add the json file to the war
-    command = f'jar -uvf "{path_to_war}" "{IastUtils.asoc_config_filename}"'
-    result = subprocess.run(command, stderr=subprocess.PIPE, shell=True)
-    if result.returncode != 0:
-        sys.stderr.write(f'Error - command [{command}] failed')
-        sys.stderr.write(str(result.stderr))
+    # add the json config to the war
+    try:
+        add_config_to_war(path_to_war, asoc_config_json(agent_key, host))
+    except (IastUtils.IastException, OSError) as e:
+        sys.stderr.write(f'Error - adding {IastUtils.asoc_config_filename} to {path_to_war} failed')
+        sys.stderr.write(str(e))
         exit(1)
     print(f"Copied {IastUtils.asoc_config_filename} to {path_to_war}")
-
-    # remove the json file
-    os.remove(IastUtils.asoc_config_filename)
     exit(0)
 
 
@@ -0,0 +1,99 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+import getopt
+import sys
+import time
+
+import urllib3
+
+# python -m pip install --upgrade git+https://github.com/HCL-TECH-SOFTWARE/asoc_automation_iast
+from asoc_automation_iast.AsocTokenProvider import AsocTokenProvider
+from asoc_automation_iast.IastUtils import IastException
+from asoc_automation_iast.Provisioning import read_manifest, provision_agents, format_provisioning_summary, \
+    default_provisioning_workers
+from asoc_automation_iast.RequestApi import AsocSession
+
+
+def print_usage():
+    print("Description: Provision IAST agents for all the apps / scans of a manifest file, with a single login")
+    print(f"Usage: {sys.argv[0]} --id=value --secret=value --manifest=agents.csv [--output_dir=path --host=host_url "
+          f"--workers=8 --token_cache=path --agent_cache=path]")
+    print("manifest: .csv file with a header line, or .json file with a list of objects. the fields of every agent are "
+          "app_id, app_name, scan_id, scan_name, asset_group, output (agent package file name) and agent_type (Java, "
+          "DotNet or NodeJS), same as the options of ConfigureIastAgent.py. all fields are optional. the base agent of "
+          "every agent type is downloaded once, all types at the same time")
+    print("output_dir: directory to write the agent zip files to (default: current directory)")
+    print("workers: number of agents provisioned at the same time")
+
+
+def main():
+    key_id = None
+    key_secret = None
+    manifest = None
+    output_dir = "."
+    host = None
+    workers = default_provisioning_workers
+    token_cache = None
+    agent_cache = None
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "h", ['id=', 'secret=', 'manifest=', 'output_dir=', 'host=',
+                                                       'workers=', 'token_cache=', 'agent_cache='])
+        for opt, arg in opts:
+            if opt == '--id':
+                key_id = arg
+            elif opt == '--secret':
+                key_secret = arg
+            elif opt == '--manifest':
+                manifest = arg
+            elif opt == '--output_dir':
+                output_dir = arg
+            elif opt == '--host':
+                host = arg
+            elif opt == '--workers':
+                workers = int(arg)
+            elif opt == '--token_cache':
+                token_cache = arg
+            elif opt == '--agent_cache':
+                agent_cache = arg
+            elif opt == '-h':
+                print_usage()
+                exit(0)
+    except (getopt.GetoptError, ValueError) as e:
+        sys.stderr.write(f"Invalid command line: {sys.argv[1:]}\n")
+        sys.stderr.write(str(e) + "\n")
+        print_usage()
+        exit(1)
+
+    if key_id is None or key_secret is None or manifest is None:
+        sys.stderr.write(f"Wrong or missing input arguments: {sys.argv[1:]}\n")
+        print_usage()
+        exit(1)
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    started = time.monotonic()
+    with AsocSession(pool_size=workers) as session:
+        try:
+            items = read_manifest(manifest)
+            # one login for all the agents
+            token = AsocTokenProvider(key_id, key_secret, host, cache_dir=token_cache, retries=3, session=session)
+            token.get_token()
+            provision_agents(items, token, output_dir, host, workers=workers, agent_cache=agent_cache,
+                             session=session)
+        except IastException as e:
+            sys.stderr.write("\nAn error has occurred:")
+            sys.stderr.write("\n" + str(e))
+            sys.stderr.write("\nExiting.")
+            exit(1)
+
+    print(format_provisioning_summary(items, time.monotonic() - started))
+    exit(0 if all(item.succeeded for item in items) else 1)
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,112 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+import getopt
+import os
+import sys
+
+import urllib3
+
+# python -m pip install --upgrade git+https://github.com/HCL-TECH-SOFTWARE/asoc_automation_iast
+from asoc_automation_iast.AgentUpgrade import find_installed_agent, check_for_upgrade, upgrade_agent
+from asoc_automation_iast.AsocTokenProvider import AsocTokenProvider
+from asoc_automation_iast.IastUtils import IastException
+from asoc_automation_iast.RequestApi import AsocSession
+
+
+def print_usage():
+    print("Description: Upgrade an IAST agent package to the latest agent build, keeping its asoc-config.json and "
+          "custom configuration (user-config.json, DotNet content/)")
+    print(f"Usage: {sys.argv[0]} [--agent=path --agent_type=Java --output=path --host=host_url --id=value "
+          f"--secret=value --token_cache=path --agent_cache=path --check --force]")
+    print("agent: the agent package to upgrade, or the directory holding it (default: current directory)")
+    print("agent_type: Java (default), DotNet or NodeJS")
+    print("output: path of the upgraded package (default: the package name of the new build, next to the agent)")
+    print("id, secret: download the agent with an api key, instead of the agent key of the installed agent")
+    print("check: only check whether a newer build is available")
+    print("force: write the upgraded package even if the agent is up to date")
+
+
+def main():
+    agent = "."
+    agent_type = "Java"
+    output = None
+    host = None
+    key_id = None
+    key_secret = None
+    token_cache = None
+    agent_cache = None
+    check_only = False
+    force = False
+    try:
+        opts, args = getopt.getopt(sys.argv[1:], "h", ['agent=', 'agent_type=', 'output=', 'host=', 'id=', 'secret=',
+                                                       'token_cache=', 'agent_cache=', 'check', 'force'])
+        for opt, arg in opts:
+            if opt == '--agent':
+                agent = arg
+            elif opt == '--agent_type':
+                agent_type = arg
+            elif opt == '--output':
+                output = arg
+            elif opt == '--host':
+                host = arg
+            elif opt == '--id':
+                key_id = arg
+            elif opt == '--secret':
+                key_secret = arg
+            elif opt == '--token_cache':
+                token_cache = arg
+            elif opt == '--agent_cache':
+                agent_cache = arg
+            elif opt == '--check':
+                check_only = True
+            elif opt == '--force':
+                force = True
+            elif opt == '-h':
+                print_usage()
+                exit(0)
+    except getopt.GetoptError as e:
+        sys.stderr.write(f"Invalid command line: {sys.argv[1:]}\n")
+        sys.stderr.write(str(e) + "\n")
+        print_usage()
+        exit(1)
+
+    if (key_id is None) != (key_secret is None):
+        sys.stderr.write(f"Wrong or missing input arguments: {sys.argv[1:]}\n")
+        print_usage()
+        exit(1)
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    with AsocSession() as session:
+        try:
+            installed = find_installed_agent(agent_type, agent) if os.path.isdir(agent) else agent
+            if installed is None or not os.path.isfile(installed):
+                raise IastException(f"no {agent_type} agent package found in {agent}")
+            token = None
+            if key_id is not None:
+                token = AsocTokenProvider(key_id, key_secret, host, cache_dir=token_cache, retries=3, session=session)
+            if check_only:
+                upgrade = check_for_upgrade(agent_type, installed, host, token, agent_cache, session)
+                upgrade.discard_download()
+                print(f"a newer {agent_type} agent build is available for {installed}" if upgrade.available
+                      else f"{installed} is up to date")
+                exit(0)
+            print(f"checking for a newer {agent_type} agent build for {installed}")
+            upgrade = upgrade_agent(agent_type, installed, output, host, token, agent_cache, session, force=force)
+        except IastException as e:
+            sys.stderr.write("\nAn error has occurred:")
+            sys.stderr.write("\n" + str(e))
+            sys.stderr.write("\nExiting.")
+            exit(1)
+
+    print(f"upgraded {installed} to {upgrade.destination}" if upgrade.upgraded else f"{installed} is up to date")
+    exit(0)
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,225 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# on-disk cache of downloaded IAST agent zips (without agent key), so that repeated provisioning only downloads the
+# agent when ASoC has a new build:
+#     cache = AgentCache("~/.asoc_automation_iast/agents")
+#     base_zip = cache.get_agent(token, "Java", host)
+#     package_agent_zip(base_zip, "IASTAgent.zip", asoc_config_json(agent_key))
+# agents are stored by content (<sha256>.zip) and indexed by host + agent type, with the ETag / Last-Modified of the
+# download. a cached agent is revalidated with a conditional request (If-None-Match / If-Modified-Since) and only
+# downloaded again if the server does not answer 304 Not Modified. the sha256 of a cached agent is verified before
+# it is used, and the least recently used agents are evicted when the cache grows over max_size bytes. agents of
+# different types are downloaded at the same time, the index is locked only while it is read and written.
+
+import json
+import logging
+import os
+import threading
+import time
+
+from .AsocUtils import download_agent, download_agent_iast_api, get_host
+from .IastUtils import IastException
+from .RequestApi import file_sha256
+
+default_agent_cache_dir = os.path.join(os.path.expanduser("~"), ".asoc_automation_iast", "agents")
+default_agent_cache_size = 1024 * 1024 * 1024
+index_filename = "index.json"
+
+# cache directory: lock of its index, and (cache directory, cache key): lock held while the agent of the key is
+# checked and downloaded - shared by all the AgentCache objects of the directory
+index_locks = {}
+key_locks = {}
+index_locks_lock = threading.Lock()
+
+
+class AgentCache:
+    #     max_size: max total bytes of cached agents, least recently used agents are evicted above it
+    #     revalidate_after: seconds after a check with the server in which the cached agent is used without a new
+    #                       check. 0 sends a conditional request on every use
+    #     verify: check the sha256 of the cached agent before it is used
+    def __init__(self, cache_dir=default_agent_cache_dir, max_size=default_agent_cache_size, revalidate_after=0,
+                 verify=True):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_size = max_size
+        self.revalidate_after = revalidate_after
+        self.verify = verify
+        with index_locks_lock:
+            self.lock = index_locks.setdefault(os.path.abspath(self.cache_dir), threading.RLock())
+        self.hits = 0
+        self.downloads = 0
+
+    # returns the path of the cached agent zip of the given type (Java, DotNet, NodeJS), downloaded with
+    # AsocUtils.download_agent (ASoC api token) if missing or outdated
+    def get_agent(self, token, agent_type="Java", host=None, session=None):
+        def download(destination, headers):
+            return download_agent(token, agent_type, host, session=session, destination=destination, headers=headers)
+        return self.get(get_host(host), agent_type, download)
+
+    # same as get_agent, downloading with AsocUtils.download_agent_iast_api (agent key of a scan). the agent does not
+    # depend on the key, so it is cached by host (and the agent type of the scan, if given) only
+    def get_agent_iast_api(self, agent_key, host=None, retries=0, session=None, agent_type=None):
+        def download(destination, headers):
+            return download_agent_iast_api(agent_key, host, retries=retries, session=session, destination=destination,
+                                           headers=headers)
+        return self.get(get_host(host), "iast-api" if agent_type in (None, "Java") else f"iast-api-{agent_type}",
+                        download)
+
+    # returns the path of the cached artifact of host + name. download(destination, headers) downloads it to
+    # destination with the given (conditional) headers and returns the response
+    def get(self, host, name, download):
+        key = cache_key(host, name)
+        with self.key_lock(key):
+            with self.lock:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                index = self.load_index()
+                entry = index.get(key)
+                if entry is not None and not self.is_valid(entry):
+                    logging.warning(f"cached agent {entry['file']} is missing or corrupt, downloading it again")
+                    del index[key]
+                    self.remove_unused_file(index, entry)
+                    self.save_index(index)
+                    entry = None
+                if entry is not None and time.time() - entry.get("checked", 0) < self.revalidate_after:
+                    return self.use(key, entry, checked=False)
+
+            headers = {}
+            if entry is not None and entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry is not None and entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            temp_path = os.path.join(self.cache_dir, f"download.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                try:
+                    response = download(temp_path, headers)
+                except IastException as e:
+                    if entry is None:
+                        raise
+                    logging.warning(f"failed checking for a new agent, using the cached agent: {str(e)}")
+                    return self.use(key, entry, checked=False)
+                if response.status_code == 304:
+                    if entry is not None and os.path.isfile(os.path.join(self.cache_dir, entry["file"])):
+                        return self.use(key, entry, checked=True)
+                    # not modified, but nothing cached to use (no entry, or its file was removed meanwhile by
+                    # another process): download it again without conditional headers
+                    logging.warning(f"got 304 Not Modified for {name} without a cached agent, downloading it again")
+                    response = download(temp_path, {})
+                    if response.status_code == 304:
+                        raise IastException(f"agent download of {name} answered 304 Not Modified without "
+                                            f"conditional headers")
+                with self.lock:
+                    entry = self.add(temp_path, host, name, response)
+                    self.downloads += 1
+                    # other keys may have changed the index during the download
+                    index = self.load_index()
+                    previous = index.get(key)
+                    index[key] = entry
+                    if previous is not None:
+                        self.remove_unused_file(index, previous)
+                    self.evict(index, keep=key)
+                    self.save_index(index)
+                    return os.path.join(self.cache_dir, entry["file"])
+            finally:
+                for path in (temp_path, temp_path + ".part"):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+    def key_lock(self, key):
+        with index_locks_lock:
+            return key_locks.setdefault((os.path.abspath(self.cache_dir), key), threading.Lock())
+
+    def use(self, key, entry, checked):
+        with self.lock:
+            index = self.load_index()
+            entry = index.get(key, entry)
+            entry["last_used"] = time.time()
+            if checked:
+                entry["checked"] = entry["last_used"]
+            index[key] = entry
+            self.hits += 1
+            self.save_index(index)
+            return os.path.join(self.cache_dir, entry["file"])
+
+    # moves a downloaded file into the cache under its sha256 and returns its index entry
+    def add(self, path, host, name, response):
+        sha256 = file_sha256(path)
+        file_name = sha256 + ".zip"
+        size = os.path.getsize(path)
+        os.replace(path, os.path.join(self.cache_dir, file_name))
+        now = time.time()
+        return {"host": host, "name": name, "file": file_name, "sha256": sha256, "size": size,
+                "etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified"),
+                "checked": now, "last_used": now}
+
+    def is_valid(self, entry):
+        path = os.path.join(self.cache_dir, entry["file"])
+        if not os.path.isfile(path) or os.path.getsize(path) != entry["size"]:
+            return False
+        return not self.verify or file_sha256(path) == entry["sha256"]
+
+    # removes the least recently used entries (except keep) until the cached files fit in max_size
+    def evict(self, index, keep=None):
+        # entries with the same content share a file, which counts once and is removed with its last entry
+        file_entries = {}
+        file_sizes = {}
+        for entry in index.values():
+            file_entries[entry["file"]] = file_entries.get(entry["file"], 0) + 1
+            file_sizes[entry["file"]] = entry["size"]
+        total_size = sum(file_sizes.values())
+        for key, entry in sorted(index.items(), key=lambda item: item[1]["last_used"]):
+            if total_size <= self.max_size:
+                break
+            if key == keep:
+                continue
+            del index[key]
+            file_entries[entry["file"]] -= 1
+            if file_entries[entry["file"]] == 0:
+                total_size -= file_sizes[entry["file"]]
+                path = os.path.join(self.cache_dir, entry["file"])
+                if os.path.exists(path):
+                    os.remove(path)
+            logging.info(f"evicted cached agent {entry['name']} of {entry['host']}")
+
+    # removes the file of an entry that was dropped from the index, unless other entries have the same content
+    def remove_unused_file(self, index, entry):
+        if all(other["file"] != entry["file"] for other in index.values()):
+            path = os.path.join(self.cache_dir, entry["file"])
+            if os.path.exists(path):
+                os.remove(path)
+
+    def clear(self):
+        with self.lock:
+            index = self.load_index()
+            for entry in index.values():
+                path = os.path.join(self.cache_dir, entry["file"])
+                if os.path.exists(path):
+                    os.remove(path)
+            self.save_index({})
+
+    def load_index(self):
+        path = os.path.join(self.cache_dir, index_filename)
+        if not os.path.isfile(path):
+            return {}
+        try:
+            with open(path) as index_file:
+                return json.load(index_file)
+        except (OSError, ValueError):
+            logging.warning(f"ignoring unreadable agent cache index {path}")
+            return {}
+
+    def save_index(self, index):
+        path = os.path.join(self.cache_dir, index_filename)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as index_file:
+            json.dump(index, index_file, indent=1)
+        os.replace(temp_path, path)
+
+
+def cache_key(host, name):
+    return f"{host}|{name}"
@@ -0,0 +1,433 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# pure python agent packaging - adds asoc-config.json to Secagent.war, and to the war inside IASTAgent.zip, without
+# extracting anything to disk or running the jdk "jar" tool:
+#     package_agent_zip("IASTAgent.temp.zip", "IASTAgent.zip", asoc_config_json(agent_key))
+# and the same for every agent type (see agent_layouts), e.g. for the DotNet nupkg:
+#     package_agent("DotNet", "base.nupkg", "agent.nupkg", asoc_config_json(agent_key), previous="old.nupkg")
+# entries that do not change are copied with their compressed bytes as is (no decompress / compress), only the
+# replaced or added entries are compressed. the nested war is rewritten in memory.
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import re
+import struct
+import time
+import zipfile
+import zlib
+
+from .IastUtils import IastException, asoc_config_filename, user_config_filename, war_name
+
+local_header_struct = struct.Struct("<IHHHHHIIIHH")
+central_header_struct = struct.Struct("<IHHHHHHIIIHHHHHII")
+end_of_central_directory_struct = struct.Struct("<IHHHHIIH")
+local_header_signature = 0x04034b50
+central_header_signature = 0x02014b50
+end_of_central_directory_signature = 0x06054b50
+
+zip64_extra_id = 0x0001
+zip64_limit = 0xFFFFFFFF
+zip64_count_limit = 0xFFFF
+# general purpose flags: sizes are in a data descriptor after the data / file name is utf-8
+data_descriptor_flag = 0x08
+utf8_flag = 0x800
+copy_chunk_size = 1024 * 1024
+default_file_mode = 0o644
+
+
+# where the configuration is in the agent package of an agent type
+#     extension: file extension of the package
+#     nested_archive: name of the archive inside the package that holds the configuration, None if it is in the
+#                     package itself
+#     config_path: path of asoc-config.json in the package (or in the nested archive)
+#     custom_config: configuration entries that users may change - names, or directory prefixes ending with "/" -
+#                    carried over from a previous package of the agent
+class AgentLayout:
+    def __init__(self, extension, nested_archive, config_path, custom_config=()):
+        self.extension = extension
+        self.nested_archive = nested_archive
+        self.config_path = config_path
+        self.custom_config = custom_config
+
+    # True if the entry name is custom configuration
+    def is_custom_config(self, name):
+        return any(name == config or (config.endswith("/") and name.startswith(config) and name != config)
+                   for config in self.custom_config)
+
+
+agent_layouts = {
+    # IASTAgent.zip with Secagent.war, asoc-config.json in the war
+    "Java": AgentLayout(".zip", war_name, asoc_config_filename, (user_config_filename,)),
+    # nuget package, same layout as AppscanDotNetIASTAgentUpdate.ps1
+    "DotNet": AgentLayout(".nupkg", None, "iastConfig/" + asoc_config_filename, ("content/",)),
+    "NodeJS": AgentLayout(".zip", None, asoc_config_filename),
+}
+
+
+def get_agent_layout(agent_type):
+    if agent_type not in agent_layouts:
+        raise IastException(f"unknown agent type {agent_type}, expected one of {', '.join(agent_layouts)}")
+    return agent_layouts[agent_type]
+
+
+# writes a zip file entry by entry. copy_entry copies an entry of another zip file without recompressing it,
+# write_entry adds new content. close() writes the central directory, the file object itself is not closed
+class RawZipWriter:
+    def __init__(self, file, comment=b""):
+        self.file = file
+        self.comment = comment
+        self.central_headers = []
+
+    def copy_entry(self, source_file, info):
+        check_zip64(info.compress_size, info.file_size)
+        source_file.seek(info.header_offset)
+        header = source_file.read(local_header_struct.size)
+        if len(header) != local_header_struct.size or \
+                local_header_struct.unpack(header)[0] != local_header_signature:
+            raise IastException(f"bad zip file: no local header for {info.filename}")
+        (_, extract_version, flags, compress_type, dos_time, dos_date, _, _, _, name_length,
+         extra_length) = local_header_struct.unpack(header)
+        name = source_file.read(name_length)
+        extra = strip_zip64_extra(source_file.read(extra_length))
+        # sizes and crc are taken from the central directory and written in the local header
+        flags &= ~data_descriptor_flag
+        offset = self.write_local_header(name, extra, extract_version, flags, compress_type, dos_time, dos_date,
+                                         info.CRC, info.compress_size, info.file_size)
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = source_file.read(min(copy_chunk_size, remaining))
+            if not chunk:
+                raise IastException(f"bad zip file: truncated data for {info.filename}")
+            self.file.write(chunk)
+            remaining -= len(chunk)
+        self.add_central_header(name, strip_zip64_extra(info.extra), info.comment, info.create_version,
+                                info.create_system, extract_version, flags, compress_type, dos_time, dos_date,
+                                info.CRC, info.compress_size, info.file_size, info.internal_attr,
+                                info.external_attr, offset)
+
+    def write_entry(self, name, data, compress_type=zipfile.ZIP_DEFLATED, date_time=None,
+                    external_attr=default_file_mode << 16):
+        if compress_type == zipfile.ZIP_DEFLATED:
+            compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            compressed = compressor.compress(data) + compressor.flush()
+            extract_version = 20
+        elif compress_type == zipfile.ZIP_STORED:
+            compressed = data
+            extract_version = 10
+        else:
+            raise IastException(f"unsupported compression type {compress_type} for {name}")
+        check_zip64(len(compressed), len(data))
+        try:
+            encoded_name = name.encode("ascii")
+            flags = 0
+        except UnicodeEncodeError:
+            encoded_name = name.encode("utf-8")
+            flags = utf8_flag
+        dos_time, dos_date = dos_date_time(date_time if date_time is not None else time.localtime()[:6])
+        crc = zlib.crc32(data)
+        offset = self.write_local_header(encoded_name, b"", extract_version, flags, compress_type, dos_time, dos_date,
+                                         crc, len(compressed), len(data))
+        self.file.write(compressed)
+        self.add_central_header(encoded_name, b"", b"", 20, 3, extract_version, flags, compress_type, dos_time,
+                                dos_date, crc, len(compressed), len(data), 0, external_attr, offset)
+
+    def write_local_header(self, name, extra, extract_version, flags, compress_type, dos_time, dos_date, crc,
+                           compress_size, file_size):
+        offset = self.file.tell()
+        check_zip64(offset)
+        self.file.write(local_header_struct.pack(local_header_signature, extract_version, flags, compress_type,
+                                                 dos_time, dos_date, crc, compress_size, file_size, len(name),
+                                                 len(extra)))
+        self.file.write(name)
+        self.file.write(extra)
+        return offset
+
+    def add_central_header(self, name, extra, comment, create_version, create_system, extract_version, flags,
+                           compress_type, dos_time, dos_date, crc, compress_size, file_size, internal_attr,
+                           external_attr, offset):
+        header = central_header_struct.pack(central_header_signature, create_version | create_system << 8,
+                                            extract_version, flags, compress_type, dos_time, dos_date, crc,
+                                            compress_size, file_size, len(name), len(extra), len(comment), 0,
+                                            internal_attr, external_attr, offset)
+        self.central_headers.append(header + name + extra + comment)
+
+    def close(self):
+        start = self.file.tell()
+        for header in self.central_headers:
+            self.file.write(header)
+        size = self.file.tell() - start
+        check_zip64(start, size)
+        if len(self.central_headers) >= zip64_count_limit:
+            raise IastException("zip files with more than 65534 entries are not supported")
+        self.file.write(end_of_central_directory_struct.pack(end_of_central_directory_signature, 0, 0,
+                                                             len(self.central_headers), len(self.central_headers),
+                                                             size, start, len(self.comment)))
+        self.file.write(self.comment)
+
+
+def check_zip64(*values):
+    if any(value >= zip64_limit for value in values):
+        raise IastException("zip64 archives are not supported")
+
+
+# removes the zip64 extra field, the writer only writes 32 bit sizes and offsets
+def strip_zip64_extra(extra):
+    stripped = b""
+    position = 0
+    while position + 4 <= len(extra):
+        header_id, length = struct.unpack("<HH", extra[position:position + 4])
+        if header_id != zip64_extra_id:
+            stripped += extra[position:position + 4 + length]
+        position += 4 + length
+    return stripped
+
+
+def dos_date_time(date_time):
+    year, month, day, hour, minute, second = date_time
+    return hour << 11 | minute << 5 | second // 2, max(year - 1980, 0) << 9 | month << 5 | day
+
+
+# copies a zip file from source to destination while replacing or adding entries.
+#     source: path or binary file object (seekable)
+#     destination: path or binary file object. a path is written to a temporary file first and renamed when complete,
+#                  so it may be the same as source
+#     entries: {name: bytes} - entries to replace with new content, or to add if missing
+#     transforms: {name: function(bytes) -> bytes} - entries to replace with a function of their content
+#     copies: {name: (binary file object, ZipInfo)} - entries of another zip file, copied as is in place of the entry
+#             with the same name, or added if missing
+def rewrite_zip(source, destination, entries=None, transforms=None, copies=None):
+    entries = dict(entries) if entries is not None else {}
+    transforms = dict(transforms) if transforms is not None else {}
+    copies = dict(copies) if copies is not None else {}
+    if is_path(destination):
+        temp_path = f"{os.fspath(destination)}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as destination_file:
+                rewrite_zip(source, destination_file, entries, transforms, copies)
+            os.replace(temp_path, destination)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return
+    if is_path(source):
+        with open(source, "rb") as source_file:
+            return rewrite_zip(source_file, destination, entries, transforms, copies)
+
+    try:
+        with zipfile.ZipFile(source) as source_zip:
+            missing = [name for name in transforms if name not in source_zip.NameToInfo]
+            if missing:
+                raise IastException(f"{', '.join(missing)} not found in zip file")
+            writer = RawZipWriter(destination, comment=source_zip.comment)
+            written = set()
+            for info in source_zip.infolist():
+                name = info.filename
+                if name in entries or name in transforms or name in copies:
+                    if name in written:
+                        continue
+                    if name in entries or name in transforms:
+                        content = entries[name] if name in entries else transforms[name](source_zip.read(info))
+                        writer.write_entry(name, content, info.compress_type, external_attr=info.external_attr)
+                    else:
+                        writer.copy_entry(*copies[name])
+                    written.add(name)
+                else:
+                    writer.copy_entry(source, info)
+            for name, content in entries.items():
+                if name not in written:
+                    writer.write_entry(name, content)
+            for name, copy in copies.items():
+                if name not in written and name not in entries:
+                    writer.copy_entry(*copy)
+            writer.close()
+    except zipfile.BadZipFile as e:
+        raise IastException(f"bad zip file: {str(e)}")
+
+
+# returns the content of asoc-config.json for an agent key
+def asoc_config_json(agent_key, host=None):
+    config = {'accessToken': agent_key}
+    if host is not None:
+        config['host'] = host
+    return json.dumps(config).encode("utf-8")
+
+
+# returns war_content (bytes) with asoc-config.json replaced or added, and the extra {name: bytes} entries
+def add_config_to_war_bytes(war_content, config, extra_entries=None):
+    entries = dict(extra_entries) if extra_entries is not None else {}
+    entries[asoc_config_filename] = config
+    destination = io.BytesIO()
+    rewrite_zip(io.BytesIO(war_content), destination, entries=entries)
+    return destination.getvalue()
+
+
+# adds asoc-config.json (config bytes, see asoc_config_json) to a war file, in place if destination is None
+def add_config_to_war(path_to_war, config, destination=None):
+    rewrite_zip(path_to_war, destination if destination is not None else path_to_war,
+                entries={asoc_config_filename: config})
+
+
+# copies the agent zip downloaded from ASoC (IASTAgent.zip) to destination, with asoc-config.json (and the extra
+# {name: bytes} entries) added to the war inside it. all the other entries of the zip are copied as is
+def package_agent_zip(source_zip, destination_zip, config, nested_war_name=war_name, extra_war_entries=None):
+    with open_binary(source_zip) as source_file:
+        try:
+            with zipfile.ZipFile(source_file) as agent_zip:
+                war_entries = find_entries(agent_zip.namelist(), nested_war_name)
+        except zipfile.BadZipFile as e:
+            raise IastException(f"bad zip file: {str(e)}")
+        if not war_entries:
+            raise IastException(f"{nested_war_name} not found in agent zip file")
+        transforms = {name: lambda war_content: add_config_to_war_bytes(war_content, config, extra_war_entries)
+                      for name in war_entries}
+        rewrite_zip(source_file, destination_zip, transforms=transforms)
+
+
+# copies the agent package of any agent type (see agent_layouts) downloaded from ASoC to destination, with its
+# asoc-config.json replaced by config. previous is an older package of the same agent (path or binary file object):
+# its custom configuration entries (layout.custom_config, e.g. content/ of the DotNet nupkg) are copied over the ones
+# of the new package, without recompressing them
+def package_agent(agent_type, source, destination, config, previous=None):
+    layout = get_agent_layout(agent_type)
+    with open_binary(source) as source_file, \
+            open_binary(previous) if previous is not None else contextlib.nullcontext() as previous_file:
+        try:
+            if layout.nested_archive is not None:
+                extra_entries = {}
+                if previous_file is not None:
+                    extra_entries = read_nested_custom_config(previous_file, layout)
+                package_agent_zip(source_file, destination, config, layout.nested_archive, extra_entries)
+                return
+            with zipfile.ZipFile(source_file) as agent_zip:
+                config_path = find_config_path(agent_zip.namelist(), layout)
+            copies = {}
+            if previous_file is not None:
+                with zipfile.ZipFile(previous_file) as previous_zip:
+                    copies = {info.filename: (previous_file, info) for info in previous_zip.infolist()
+                              if layout.is_custom_config(info.filename) and not info.is_dir()}
+            rewrite_zip(source_file, destination, entries={config_path: config}, copies=copies)
+        except zipfile.BadZipFile as e:
+            raise IastException(f"bad {agent_type} agent package: {str(e)}")
+
+
+# name of the packaged agent: IASTAgent.zip for Java, <id>.<version>.nupkg from the .nuspec of a nuget package,
+# IASTAgent-<agent type>.zip for the others
+def agent_package_name(agent_type, package):
+    layout = get_agent_layout(agent_type)
+    if layout.extension != ".nupkg":
+        return default_package_name(agent_type, layout)
+    with open_binary(package) as package_file:
+        try:
+            with zipfile.ZipFile(package_file) as package_zip:
+                nuspecs = [name for name in package_zip.namelist() if "/" not in name and name.endswith(".nuspec")]
+                nuspec = package_zip.read(nuspecs[0]).decode("utf-8") if nuspecs else ""
+        except zipfile.BadZipFile as e:
+            raise IastException(f"bad {agent_type} agent package: {str(e)}")
+    package_id = re.search(r"<id>\s*([^<\s]+)\s*</id>", nuspec)
+    version = re.search(r"<version>\s*([^<\s]+)\s*</version>", nuspec)
+    if package_id is None or version is None:
+        return default_package_name(agent_type, layout)
+    return f"{package_id.group(1)}.{version.group(1)}{layout.extension}"
+
+
+def default_package_name(agent_type, layout):
+    return ("IASTAgent" if agent_type == "Java" else f"IASTAgent-{agent_type}") + layout.extension
+
+
+# the entries named name, at the root or in a directory
+def find_entries(names, name):
+    return [entry for entry in names if entry == name or entry.endswith("/" + name)]
+
+
+# the path of asoc-config.json in a package: layout.config_path, or else the only asoc-config.json of the package
+def find_config_path(names, layout):
+    if layout.config_path in names:
+        return layout.config_path
+    found = find_entries(names, asoc_config_filename)
+    return found[0] if len(found) == 1 else layout.config_path
+
+
+# {name: bytes} of the custom configuration in the nested archive of a package
+def read_nested_custom_config(package_file, layout):
+    with zipfile.ZipFile(package_file) as package_zip:
+        with open_nested_archive(package_zip, layout) as nested_zip:
+            return {info.filename: nested_zip.read(info) for info in nested_zip.infolist()
+                    if layout.is_custom_config(info.filename) and not info.is_dir()}
+
+
+# the content of asoc-config.json in an agent package of any agent type (e.g. to carry it over to a new build)
+def read_agent_config(agent_type, package):
+    layout = get_agent_layout(agent_type)
+    with open_binary(package) as package_file:
+        try:
+            with zipfile.ZipFile(package_file) as package_zip:
+                if layout.nested_archive is None:
+                    return read_config_entry(package_zip, layout, agent_type)
+                with open_nested_archive(package_zip, layout) as nested_zip:
+                    return read_config_entry(nested_zip, layout, agent_type)
+        except zipfile.BadZipFile as e:
+            raise IastException(f"bad {agent_type} agent package: {str(e)}")
+
+
+# digest of the agent build of a package: the names, crc and sizes of its entries, without asoc-config.json and the
+# custom configuration. packages of the same build have the same id whatever their configuration. only the zip
+# directories are read - and the nested archive for Java, which holds the configuration
+def agent_build_id(agent_type, package):
+    layout = get_agent_layout(agent_type)
+    digest = hashlib.sha256()
+    with open_binary(package) as package_file:
+        try:
+            with zipfile.ZipFile(package_file) as package_zip:
+                names = package_zip.namelist()
+                nested = find_entries(names, layout.nested_archive) if layout.nested_archive is not None else []
+                skip = set(nested) if nested else {find_config_path(names, layout)}
+                update_build_digest(digest, package_zip, layout, skip)
+                for name in nested:
+                    with zipfile.ZipFile(io.BytesIO(package_zip.read(name))) as nested_zip:
+                        update_build_digest(digest, nested_zip, layout,
+                                            {find_config_path(nested_zip.namelist(), layout)}, name + "!/")
+        except zipfile.BadZipFile as e:
+            raise IastException(f"bad {agent_type} agent package: {str(e)}")
+    return digest.hexdigest()
+
+
+def update_build_digest(digest, package_zip, layout, skip, prefix=""):
+    for info in sorted(package_zip.infolist(), key=lambda info: info.filename):
+        if info.filename in skip or layout.is_custom_config(info.filename) or info.is_dir():
+            continue
+        digest.update(f"{prefix}{info.filename}\0{info.CRC}\0{info.file_size}\n".encode("utf-8"))
+
+
+# the nested archive of a package (e.g. Secagent.war), read in memory
+def open_nested_archive(package_zip, layout):
+    nested = find_entries(package_zip.namelist(), layout.nested_archive)
+    if not nested:
+        raise IastException(f"{layout.nested_archive} not found in agent package")
+    return zipfile.ZipFile(io.BytesIO(package_zip.read(nested[0])))
+
+
+def read_config_entry(package_zip, layout, agent_type):
+    config_path = find_config_path(package_zip.namelist(), layout)
+    if config_path not in package_zip.NameToInfo:
+        raise IastException(f"{config_path} not found in {agent_type} agent package")
+    return package_zip.read(config_path)
+
+
+def is_path(value):
+    return isinstance(value, (str, bytes)) or hasattr(value, "__fspath__")
+
+
+# opens a path for reading, or uses an open binary file object as is
+def open_binary(source):
+    return open(source, "rb") if is_path(source) else contextlib.nullcontext(source)
+
@@ -0,0 +1,146 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# upgrade of an installed (packaged) IAST agent to the build ASoC currently serves, keeping its configuration:
+#     upgrade = upgrade_agent("DotNet", "agents/com.HCL.AppScan.IAST.agent.1.0.0.nupkg", host=host,
+#                             agent_cache="~/.asoc_automation_iast/agents")
+#     if upgrade.upgraded:
+#         print(f"upgraded to {upgrade.destination}")
+# the latest agent is downloaded with the agent key of the installed agent (or with an api token), through the
+# AgentCache if given - then checking an agent that is up to date costs one conditional request. the builds are
+# compared by their zip directories (see AgentPackaging.agent_build_id). the upgraded package is written from the
+# entries of the new agent, copied as is, with the asoc-config.json and the custom configuration (user-config.json,
+# DotNet content/) of the installed agent - nothing is extracted to disk (see AgentPackaging.package_agent).
+
+import json
+import logging
+import os
+
+from .AgentCache import AgentCache
+from .AgentPackaging import agent_build_id, agent_package_name, default_package_name, get_agent_layout, \
+    package_agent, read_agent_config
+from .AsocUtils import download_agent
+from .IastUtils import IastException, asoc_config_filename
+from .Provisioning import get_base_agent
+
+
+# result of check_for_upgrade / upgrade_agent
+#     installed: path of the installed agent package, latest: path of the agent downloaded from ASoC
+#     installed_build, latest_build: build ids, see AgentPackaging.agent_build_id
+#     destination: path of the upgraded agent package, None if it was not upgraded
+class AgentUpgrade:
+    def __init__(self, agent_type, installed, latest, installed_build, latest_build, cached):
+        self.agent_type = agent_type
+        self.installed = installed
+        self.latest = latest
+        self.installed_build = installed_build
+        self.latest_build = latest_build
+        self.cached = cached
+        self.destination = None
+        self.upgraded = False
+
+    # True if ASoC serves another build than the installed one
+    @property
+    def available(self):
+        return self.installed_build != self.latest_build
+
+    # deletes the downloaded agent, unless it is in the agent cache
+    def discard_download(self):
+        if not self.cached and self.latest is not None and os.path.exists(self.latest):
+            os.remove(self.latest)
+
+    def __repr__(self):
+        return f"AgentUpgrade({self.agent_type}, {self.installed}, available={self.available}, " \
+               f"upgraded={self.upgraded})"
+
+
+# the installed agent package of agent_type in a directory: IASTAgent.zip / IASTAgent-<type>.zip, or the most
+# recently modified nupkg for DotNet (there is one per version). None if there is none
+def find_installed_agent(agent_type, directory="."):
+    layout = get_agent_layout(agent_type)
+    if layout.extension != ".nupkg":
+        path = os.path.join(directory, default_package_name(agent_type, layout))
+        return path if os.path.isfile(path) else None
+    packages = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(layout.extension)]
+    packages = [path for path in packages if os.path.isfile(path)]
+    return max(packages, key=os.path.getmtime) if packages else None
+
+
+# the agent key (accessToken of asoc-config.json) of an agent package
+def read_agent_key(agent_type, package):
+    try:
+        agent_key = json.loads(read_agent_config(agent_type, package)).get("accessToken")
+    except (ValueError, AttributeError):
+        agent_key = None
+    if not agent_key:
+        raise IastException(f"no agent key in the {asoc_config_filename} of {package}")
+    return agent_key
+
+
+# downloads the agent ASoC serves (with an agent cache - only if it changed since the last check) and compares its
+# build with the installed agent.
+#     token: api token (or AsocTokenProvider) to download the agent with, None to download it with the agent key of
+#            the installed agent
+#     download_dir: directory of the downloaded agent without agent cache, default: the directory of the installed
+#                   agent
+def check_for_upgrade(agent_type, installed, host=None, token=None, agent_cache=None, session=None,
+                      download_dir=None):
+    layout = get_agent_layout(agent_type)
+    if not os.path.isfile(installed):
+        raise IastException(f"agent package {installed} not found")
+    if download_dir is None:
+        download_dir = os.path.dirname(os.path.abspath(installed))
+    if agent_cache is not None and not isinstance(agent_cache, AgentCache):
+        agent_cache = AgentCache(agent_cache)
+    installed_build = agent_build_id(agent_type, installed)
+    if token is None:
+        latest = get_base_agent(read_agent_key(agent_type, installed), download_dir, host, agent_cache, session,
+                                agent_type=agent_type)
+    elif agent_cache is not None:
+        latest = agent_cache.get_agent(token, agent_type, host, session=session)
+    else:
+        latest = os.path.join(download_dir, f"base-{agent_type}-IASTAgent{layout.extension}")
+        download_agent(token, agent_type, host, session=session, destination=latest)
+    upgrade = AgentUpgrade(agent_type, installed, latest, installed_build, None, cached=agent_cache is not None)
+    try:
+        upgrade.latest_build = agent_build_id(agent_type, latest)
+    except IastException:
+        upgrade.discard_download()
+        raise
+    return upgrade
+
+
+# upgrades an installed agent package if ASoC serves another build (or always, with force=True). the upgraded agent
+# is written to destination - by default the package name of the new build (see AgentPackaging.agent_package_name)
+# next to the installed agent. the installed agent is replaced if the name is the same (Java, NodeJS), and kept if
+# not (the nupkg of the previous DotNet version). see check_for_upgrade for the other arguments. returns the
+# AgentUpgrade, with upgraded False if the agent was up to date
+def upgrade_agent(agent_type, installed, destination=None, host=None, token=None, agent_cache=None, session=None,
+                  force=False):
+    upgrade = check_for_upgrade(agent_type, installed, host, token, agent_cache, session)
+    try:
+        if not upgrade.available and not force:
+            logging.info(f"{installed} is up to date")
+            return upgrade
+        if destination is None:
+            destination = os.path.join(os.path.dirname(installed), agent_package_name(agent_type, upgrade.latest))
+        # written next to the destination and renamed once the installed agent is closed, since it may be replaced
+        temp_path = f"{destination}.{os.getpid()}.upgrade.tmp"
+        try:
+            package_agent(agent_type, upgrade.latest, temp_path, read_agent_config(agent_type, installed),
+                          previous=installed)
+            os.replace(temp_path, destination)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        upgrade.destination = destination
+        upgrade.upgraded = True
+        return upgrade
+    finally:
+        upgrade.discard_download()
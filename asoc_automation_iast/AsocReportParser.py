@@ -0,0 +1,134 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# incremental parser for ASoC xml security reports (create_report with ReportFileType Xml).
+# the report is parsed while it is read, each issue is turned into a compact ReportIssue and its xml elements are
+# discarded, so memory stays bounded regardless of report size:
+#     for issue in iter_asoc_report_issues(report_id, token, host):
+#         print(issue.severity, issue.issue_type, issue.location)
+
+import xml.etree.ElementTree as ElementTree
+
+from .AsocUtils import iter_report_chunks, default_report_chunk_size
+from .IastUtils import IastException
+
+issue_group_tag = "issue-group"
+issue_type_group_tag = "issue-type-group"
+
+# child paths to read every ReportIssue field from, the first one found in the issue element wins
+issue_field_paths = {
+    "issue_type": ("issue-type/ref", "issue-type"),
+    "severity": ("severity", "severity-id"),
+    "location": ("location", "url/name", "url/ref", "url", "entity/name"),
+    "api": ("api", "call-trace/api"),
+    "source_file": ("source-file", "source"),
+    "status": ("status",),
+}
+
+
+class ReportIssue:
+    __slots__ = ("id", "issue_type", "issue_type_name", "severity", "location", "api", "source_file", "status")
+
+    def __init__(self, id=None, issue_type=None, issue_type_name=None, severity=None, location=None, api=None,
+                 source_file=None, status=None):
+        self.id = id
+        self.issue_type = issue_type
+        self.issue_type_name = issue_type_name
+        self.severity = severity
+        self.location = location
+        self.api = api
+        self.source_file = source_file
+        self.status = status
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        return f"ReportIssue({', '.join(f'{field}={getattr(self, field)!r}' for field in self.__slots__)})"
+
+
+def element_text(element, paths):
+    for path in paths:
+        child = element.find(path)
+        if child is not None and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def create_report_issue(element, issue_type_names):
+    issue = ReportIssue(id=element.get("id"))
+    for field, paths in issue_field_paths.items():
+        setattr(issue, field, element_text(element, paths))
+    if issue.issue_type is not None:
+        issue.issue_type_name = issue_type_names.get(issue.issue_type)
+    return issue
+
+
+# yields raw byte chunks from a path, a binary file-like object or an iterable of bytes
+def iter_source_chunks(source, chunk_size):
+    if isinstance(source, (str, bytes)) or hasattr(source, "__fspath__"):
+        with open(source, "rb") as report_file:
+            yield from iter_source_chunks(report_file, chunk_size)
+    elif hasattr(source, "read"):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        yield from source
+
+
+# parses a report incrementally and yields a ReportIssue for every issue in its issue-group.
+# source is a file path, a binary file-like object, or an iterable of bytes chunks (e.g. iter_report_chunks).
+# the names of issue types (issue-type-group, which precedes the issues) are kept to fill issue_type_name.
+# the children of every top level section (url-group, entity-group, ...) are dropped as soon as they are parsed
+def iter_report_issues(source, chunk_size=default_report_chunk_size):
+    parser = ElementTree.XMLPullParser(events=("start", "end"))
+    issue_type_names = {}
+    path = []
+    try:
+        for chunk in iter_source_chunks(source, chunk_size):
+            parser.feed(chunk)
+            yield from handle_events(parser, path, issue_type_names)
+        parser.close()
+        yield from handle_events(parser, path, issue_type_names)
+    except ElementTree.ParseError as e:
+        raise IastException(f"failed to parse report: {str(e)}")
+
+
+def handle_events(parser, path, issue_type_names):
+    for event, element in parser.read_events():
+        if event == "start":
+            path.append(element)
+            continue
+        path.pop()
+        depth = len(path)
+        if depth == 2 and path[1].tag == issue_group_tag:
+            if element.tag == "item":
+                yield create_report_issue(element, issue_type_names)
+            path[1].remove(element)
+        elif depth == 2 and path[1].tag == issue_type_group_tag:
+            name = element_text(element, ("name",))
+            if element.get("id") is not None and name is not None:
+                issue_type_names[element.get("id")] = name
+            path[1].remove(element)
+        elif depth == 2:
+            # an entry of a section that is not used (url-group, entity-group, fix-recommendation-group, ...)
+            element.clear()
+            path[1].remove(element)
+        elif depth == 1:
+            # end of a top level section (layout, url-group, ...) - nothing else is needed from it
+            element.clear()
+            path[0].remove(element)
+
+
+# downloads and parses an ASoC report in one pass - see iter_report_issues
+def iter_asoc_report_issues(report_id, token, host=None, chunk_size=default_report_chunk_size, session=None):
+    yield from iter_report_issues(iter_report_chunks(report_id, token, host, chunk_size=chunk_size, session=session))
@@ -14,7 +14,8 @@ from typing import Any
 import requests
 
 from .IastUtils import IastException
-from .RequestApi import post_request, get_request, delete_request, download_request, put_request
+from .ODataPaging import iter_items, get_all_items, default_page_size
+from .RequestApi import post_request, get_request, delete_request, download_request, put_request, bearer_auth
 
 
 #####################################################
@@ -24,12 +25,13 @@ from .RequestApi import post_request, get_request, delete_request, download_requ
 # request URL : POST https://cloud.appscan.com/api/V4/Issues/Scan/<scan_id>
 #     headers: "Authorization=Bearer <token>, Accept=application/json"
 #     params: "$select=AsmHash,IssueTypeId,Id,Path,ScanName,ApplicationId,Api,SourceFile, $count": "true"
-def get_issues_for_scan(scan_id, token, host) -> Any:
+def get_issues_for_scan(scan_id, token, host, session=None) -> Any:
     url = host + "/Issues/Scan/" + scan_id
-    headers = {"Authorization": "Bearer " + token, "Accept": "application/json"}
+    headers = {"Accept": "application/json"}
     params = {"$select": "AsmHash,IssueTypeId,Id,Path,ScanName,ApplicationId,Api,SourceFile", "$count": "true"}
     try:
-        response = get_request(url, headers=headers, stream=False, params=params, timeout=30)
+        response = get_request(url, headers=headers, stream=False, params=params, timeout=30,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         return json_response
     except requests.exceptions.Timeout:
@@ -42,28 +44,70 @@ def get_issues_for_scan(scan_id, token, host) -> Any:
         raise IastException(e)
 
 
+# yields all the issues of a scan, page by page - see ODataPaging.iter_pages
+# request URL : GET https://cloud.appscan.com/api/V4/Issues/Scan/<scan_id>
+#     params: "$select=AsmHash,IssueTypeId,Id,Path,ScanName,ApplicationId,Api,SourceFile, $skip, $top"
+def iter_issues_for_scan(scan_id, token, host, page_size=default_page_size, prefetch=False, session=None):
+    url = host + "/Issues/Scan/" + scan_id
+    headers = {"Accept": "application/json"}
+    params = {"$select": "AsmHash,IssueTypeId,Id,Path,ScanName,ApplicationId,Api,SourceFile"}
+    yield from iter_items(url, params=params, headers=headers, token=token, page_size=page_size, prefetch=prefetch,
+                          session=session)
+
+
+# fetches all the issues of a scan with <workers> parallel page requests - see ODataPaging.get_all_items
+# returns the same {"Count": ..., "Items": [...]} json as get_issues_for_scan, with all the pages merged in order
+def get_all_issues_for_scan(scan_id, token, host, page_size=default_page_size, workers=8, session=None):
+    url = host + "/Issues/Scan/" + scan_id
+    headers = {"Accept": "application/json"}
+    params = {"$select": "AsmHash,IssueTypeId,Id,Path,ScanName,ApplicationId,Api,SourceFile"}
+    return get_all_items(url, params=params, headers=headers, token=token, page_size=page_size, workers=workers,
+                         session=session)
+
+
 # request URL : POST https://cloud.appscan.com/api/V4/Issues/ScanExecution/<execution_id>
 #     headers: "Authorization=Bearer <token>, Accept=application/json"
 #     params: "$select=AsmHash,IssueTypeId,Id,Path,Api, $count": "true"
-def get_issues_for_execution(execution_id, token, host):
+def get_issues_for_execution(execution_id, token, host, session=None):
     url = host + "/Issues/ScanExecution/" + execution_id
-    headers = {"Authorization": "Bearer " + token, "Accept": "application/json"}
+    headers = {"Accept": "application/json"}
     params = {"$select": "AsmHash,IssueTypeId,Id,Path,Api", "$count": "true"}
     try:
-        response = get_request(url, headers=headers, stream=False, params=params, timeout=30)
+        response = get_request(url, headers=headers, stream=False, params=params, timeout=30,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         return json_response
     except requests.exceptions.HTTPError as e:
         raise IastException(e)
 
 
+# yields all the issues of a scan execution, page by page - see ODataPaging.iter_pages
+# request URL : GET https://cloud.appscan.com/api/V4/Issues/ScanExecution/<execution_id>
+#     params: "$select=AsmHash,IssueTypeId,Id,Path,Api, $skip, $top"
+def iter_issues_for_execution(execution_id, token, host, page_size=default_page_size, prefetch=False, session=None):
+    url = host + "/Issues/ScanExecution/" + execution_id
+    headers = {"Accept": "application/json"}
+    params = {"$select": "AsmHash,IssueTypeId,Id,Path,Api"}
+    yield from iter_items(url, params=params, headers=headers, token=token, page_size=page_size, prefetch=prefetch,
+                          session=session)
+
+
+# fetches all the issues of a scan execution with <workers> parallel page requests - see ODataPaging.get_all_items
+def get_all_issues_for_execution(execution_id, token, host, page_size=default_page_size, workers=8, session=None):
+    url = host + "/Issues/ScanExecution/" + execution_id
+    headers = {"Accept": "application/json"}
+    params = {"$select": "AsmHash,IssueTypeId,Id,Path,Api"}
+    return get_all_items(url, params=params, headers=headers, token=token, page_size=page_size, workers=workers,
+                         session=session)
+
+
 # request URL : POST https://cloud.appscan.com/api/V4/Issues/<issue_id>
 #     headers: "Authorization=Bearer <token>, Accept=application/json"
-def get_issue(issue_id, token, host):
+def get_issue(issue_id, token, host, session=None):
     url = host + "/Issues/" + issue_id
-    headers = {"Authorization": "Bearer " + token, "Accept": "application/json"}
+    headers = {"Accept": "application/json"}
     try:
-        response = get_request(url, headers=headers, stream=False, timeout=30)
+        response = get_request(url, headers=headers, stream=False, timeout=30, auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         return json_response
     except requests.exceptions.HTTPError as e:
@@ -72,11 +116,12 @@ def get_issue(issue_id, token, host):
 
 # request URL : POST https://cloud.appscan.com//api/v4/Issues/{issueId}/Details
 #     headers: "Authorization=Bearer <token>, Accept=text/xml"
-def get_issue_details_from_asoc(issue_id, token, host):
+def get_issue_details_from_asoc(issue_id, token, host, session=None):
     url = host + "/Issues/" + issue_id + "/Details"
-    headers = {"Authorization": "Bearer " + token, "Accept": "text/xml"}
+    headers = {"Accept": "text/xml"}
     try:
-        response = get_request(url, headers=headers, stream=False, timeout=60, retries=20)
+        response = get_request(url, headers=headers, stream=False, timeout=60, retries=20,
+                               auth=bearer_auth(token), session=session)
         return response.content.decode("utf-8")
     except requests.exceptions.HTTPError as e:
         raise IastException(e)
@@ -85,13 +130,25 @@ def get_issue_details_from_asoc(issue_id, token, host):
 # request URL : POST https://cloud.appscan.com/api/V4/Apps
 #     headers: "Authorization=Bearer <token>, Accept=application/json"
 #     params:  "$filter=Name ne 'IAST-testing' & $orderby=TotalIssues & $select=Name,Id & $count: true"
-def get_apps(token, host):
+def get_apps(token, host, session=None):
     url = host + "/Apps"
-    headers = {"Authorization": "Bearer " + token, "Accept": "application/json"}
+    headers = {"Accept": "application/json"}
     params = {"$filter": "Name ne 'IAST-testing'", "$orderby": "TotalIssues", "$select": "Name,Id", "$count": "true"}
     try:
-        response = get_request(url, headers=headers, stream=False, params=params, timeout=30)
+        response = get_request(url, headers=headers, stream=False, params=params, timeout=30,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         return json_response
     except requests.exceptions.HTTPError as e:
         raise IastException(e)
+
+
+# yields all the apps (except IAST-testing), page by page - see ODataPaging.iter_pages
+# request URL : GET https://cloud.appscan.com/api/V4/Apps
+#     params:  "$filter=Name ne 'IAST-testing' & $orderby=TotalIssues & $select=Name,Id & $skip & $top"
+def iter_apps(token, host, page_size=default_page_size, prefetch=False, session=None):
+    url = host + "/Apps"
+    headers = {"Accept": "application/json"}
+    params = {"$filter": "Name ne 'IAST-testing'", "$orderby": "TotalIssues", "$select": "Name,Id"}
+    yield from iter_items(url, params=params, headers=headers, token=token, page_size=page_size, prefetch=prefetch,
+                          session=session)
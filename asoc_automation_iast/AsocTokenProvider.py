@@ -0,0 +1,150 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
+from requests.auth import AuthBase
+
+from .AsocUtils import get_api_key_login_with_expiry, get_host
+
+# token lifetime to assume when ASoC does not send "Expire" with the token
+default_token_lifetime = 60 * 60
+# refresh the token this many seconds before it expires
+default_refresh_margin = 5 * 60
+
+
+# Bearer token source for all AsocUtils / AsocReportUtils functions - pass it wherever a token is expected.
+# logs in with the API key on first use, caches the token until shortly before it expires, and logs in again once
+# if ASoC answers 401 (e.g. the token was revoked). with cache_dir the token is also kept in a file only readable by
+# the current user, keyed by host + key id, so separate processes with the same key reuse one login.
+#     refresh_margin: seconds before expiration in which the token is proactively refreshed
+#     session: AsocSession used for the login requests
+class AsocTokenProvider(AuthBase):
+    def __init__(self, key_id, key_secret, host=None, cache_dir=None, refresh_margin=default_refresh_margin,
+                 retries=0, session=None):
+        self.key_id = key_id
+        self.key_secret = key_secret
+        self.host = get_host(host)
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir is not None else None
+        self.refresh_margin = refresh_margin
+        self.retries = retries
+        self.session = session
+        self.token = None
+        self.expires_at = 0
+        self.login_count = 0
+        self.lock = threading.Lock()
+
+    # returns a valid token, logging in only if there is no cached token or it is about to expire
+    def get_token(self):
+        with self.lock:
+            if self.token is None:
+                self.load_from_cache()
+            if self.token is None or time.time() >= self.expires_at - self.refresh_margin:
+                self.login()
+            return self.token
+
+    # drops the cached token. if token is given, only drops it if it is still the current one - so threads that got
+    # a 401 with the same old token trigger a single new login
+    def invalidate(self, token=None):
+        with self.lock:
+            if token is None or token == self.token:
+                self.token = None
+                self.expires_at = 0
+                self.remove_from_cache()
+
+    def login(self):
+        token, expire = get_api_key_login_with_expiry(self.key_id, self.key_secret, self.host, retries=self.retries,
+                                                      session=self.session)
+        self.token = token
+        self.expires_at = parse_expire(expire)
+        self.login_count += 1
+        self.save_to_cache()
+
+    ###################################
+    # requests authentication hooks
+    ###################################
+    def __call__(self, request):
+        request.headers["Authorization"] = "Bearer " + self.get_token()
+        request.register_hook("response", self.handle_401)
+        return request
+
+    # resend the request once with a fresh token if the token was rejected
+    def handle_401(self, response, **kwargs):
+        if response.status_code != 401:
+            return response
+        rejected = response.request.headers.get("Authorization", "")[len("Bearer "):]
+        self.invalidate(rejected)
+        response.content
+        response.close()
+        retry = response.request.copy()
+        retry.headers["Authorization"] = "Bearer " + self.get_token()
+        retry.hooks["response"] = [hook for hook in retry.hooks["response"] if hook != self.handle_401]
+        new_response = response.connection.send(retry, **kwargs)
+        new_response.history.append(response)
+        new_response.request = retry
+        return new_response
+
+    ###################################
+    # file cache
+    ###################################
+    def cache_file(self):
+        if self.cache_dir is None:
+            return None
+        key = hashlib.sha256(f"{self.host}|{self.key_id}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def load_from_cache(self):
+        path = self.cache_file()
+        if path is None or not os.path.isfile(path):
+            return
+        try:
+            with open(path) as cache_file:
+                cached = json.load(cache_file)
+            self.token = cached["token"]
+            self.expires_at = cached["expires_at"]
+        except (OSError, ValueError, KeyError):
+            self.token = None
+            self.expires_at = 0
+
+    def save_to_cache(self):
+        path = self.cache_file()
+        if path is None:
+            return
+        os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        file_descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(file_descriptor, "w") as cache_file:
+            json.dump({"token": self.token, "expires_at": self.expires_at}, cache_file)
+        os.replace(temp_path, path)
+
+    def remove_from_cache(self):
+        path = self.cache_file()
+        if path is not None and os.path.isfile(path):
+            os.remove(path)
+
+
+# converts ASoC's "Expire" value (ISO 8601 UTC date, e.g. 2024-03-21T12:33:40.1234567Z) to epoch seconds
+def parse_expire(expire):
+    if expire:
+        try:
+            # fromisoformat of older pythons only accepts up to 6 digits of fractions of a second, and no "Z"
+            expire = re.sub(r"(\.\d{6})\d+", r"\1", expire.replace("Z", "+00:00"))
+            expire_time = datetime.fromisoformat(expire)
+            if expire_time.tzinfo is None:
+                expire_time = expire_time.replace(tzinfo=timezone.utc)
+            return expire_time.timestamp()
+        except (TypeError, ValueError):
+            pass
+    return time.time() + default_token_lifetime
+
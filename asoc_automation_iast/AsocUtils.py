@@ -8,16 +8,21 @@
 # and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
 #######################################################################################################################
 
+import codecs
+import hashlib
 import inspect
 import json
 import logging
+import os
 import time
 from urllib.parse import urlparse
 
 import requests
 
 from .IastUtils import IastException
-from .RequestApi import post_request, get_request, delete_request, download_request, put_request
+from .MetadataCache import cached_lookup, invalidate_metadata
+from .ODataPaging import iter_items, default_page_size
+from .RequestApi import post_request, get_request, delete_request, download_request, put_request, bearer_auth
 
 HOST = "https://cloud.appscan.com/"
 ASOC_HOST = "api/v4"
@@ -25,6 +30,19 @@ IAST_HOST = "IAST/"
 
 zip_filename = 'IASTAgent.zip'
 
+# read size of streamed report downloads, and number of times an interrupted report download is resumed
+default_report_chunk_size = 1024 * 1024
+default_report_resume_retries = 3
+
+# report readiness polling: first wait, growth factor and max wait between polls, and overall deadline (seconds)
+default_poll_initial_interval = 0.5
+default_poll_backoff_factor = 1.5
+default_poll_max_interval = 15
+default_poll_deadline = 30 * 60
+# max report ids in a single "Id in (...)" status query
+report_status_batch_size = 50
+report_failed_statuses = ("failed", "abort", "aborted")
+
 ####################################################################
 # ASOC - IAST API https://cloud.appscan.com/IAST/swagger/ui/
 ####################################################################
@@ -42,12 +60,13 @@ def get_host(host):
 # start new execution directly from ASoC IAST interface
 # request URL : POST https://cloud.appscan.com/IAST/api/StartNewExecution
 #     headers: "Authorization=Bearer <accessToken>"
-def start_new_execution(agent_key: str, host=None, retries=0) -> str:
+def start_new_execution(agent_key: str, host=None, retries=0, session=None) -> str:
     url = url_join(get_host(host), IAST_HOST, "api/StartNewExecution")
-    headers = {"Authorization": "Bearer " + agent_key}
+    headers = {}
     json_response = None
     try:
-        response = post_request(url, headers=headers, timeout=30, retries=retries)
+        response = post_request(url, headers=headers, timeout=30, retries=retries,
+                                auth=bearer_auth(agent_key), session=session)
         json_response = json.loads(response.text)
         logging.info("Started new execution with id: " + json_response["ExecutionId"])
         return json_response["ExecutionId"]
@@ -61,11 +80,12 @@ def start_new_execution(agent_key: str, host=None, retries=0) -> str:
 # stop current execution directly from ASoC IAST interface
 # request URL : POST https://cloud.appscan.com/IAST/api/StopExecution
 #     headers: "Authorization=Bearer <accessToken>"
-def stop_execution(agent_key: str, host=None, retries=0) -> None:
+def stop_execution(agent_key: str, host=None, retries=0, session=None, timeout=60) -> None:
     url = url_join(get_host(host), IAST_HOST, "/api/StopExecution")
-    headers = {"Authorization": "Bearer " + agent_key}
+    headers = {}
     try:
-        post_request(url, headers=headers, timeout=60, retries=retries)
+        post_request(url, headers=headers, timeout=timeout, retries=retries, auth=bearer_auth(agent_key),
+                     session=session)
     except IastException as e:
         raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
 
@@ -73,11 +93,16 @@ def stop_execution(agent_key: str, host=None, retries=0) -> None:
 # Downloads zip file with IAST agent war inside - no asoc-config.json - need to set manually token
 # request URL : GET https://cloud.appscan.com/IAST/api/DownloadVersion
 #     headers: "Authorization=Bearer <accessToken>"
-def download_agent_iast_api(agent_key: str, host=None, retries=0) -> None:
+# destination: file to write (default IASTAgent.temp.zip), headers: extra headers, e.g. If-None-Match.
+# sha256: expected hex digest of the agent, see RequestApi.download_request
+# returns the response, whose content was already written to destination
+def download_agent_iast_api(agent_key: str, host=None, retries=0, session=None, destination=None,
+                            headers=None, sha256=None) -> requests.Response:
     url = url_join(get_host(host), IAST_HOST, "/api/DownloadVersion")
-    headers = {"Authorization": "Bearer " + agent_key}
+    headers = dict(headers) if headers is not None else {}
     try:
-        download_request(url, headers=headers, timeout=30, retries=retries)
+        return download_request(url, headers=headers, timeout=30, retries=retries, auth=bearer_auth(agent_key),
+                                session=session, destination=destination, sha256=sha256)
     except IastException as e:
         raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
 
@@ -86,12 +111,13 @@ def download_agent_iast_api(agent_key: str, host=None, retries=0) -> None:
 # note it will disable previous token for this scan
 # request URL : GET https://cloud.appscan.com/api/V4/Tools/IastAgentWithKey
 #     headers: "Authorization=Bearer <accessToken>"
-def download_agent_with_key(token: str, scan_id: str, host=None) -> None:
+def download_agent_with_key(token: str, scan_id: str, host=None, session=None, destination=None) -> requests.Response:
     url = url_join(get_host(host), ASOC_HOST, "/Tools/IastAgentWithKey")
-    headers = {"Accept": "text/plain", "Authorization": "Bearer " + token}
+    headers = {"Accept": "text/plain"}
     params = {'scanId': scan_id}
     try:
-        download_request(url, headers=headers, timeout=30, params=params)
+        return download_request(url, headers=headers, timeout=30, params=params, auth=bearer_auth(token),
+                                session=session, destination=destination)
     except IastException as e:
         raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
 
@@ -100,12 +126,18 @@ def download_agent_with_key(token: str, scan_id: str, host=None) -> None:
 # note it will disable previous token for this scan
 # request URL : GET https://cloud.appscan.com/api/V4/Tools/IastAgent
 #     headers: "Authorization=Bearer <accessToken>"
-def download_agent(token: str, agent_type: str, host=None) -> None:
+# destination: file to write (default IASTAgent.temp.zip), headers: extra headers, e.g. If-None-Match.
+# sha256: expected hex digest of the agent, see RequestApi.download_request
+# returns the response, whose content was already written to destination
+def download_agent(token: str, agent_type: str, host=None, session=None, destination=None,
+                   headers=None, sha256=None) -> requests.Response:
     url = url_join(get_host(host), ASOC_HOST, "Tools/IastAgent")
-    headers = {"Accept": "text/plain", "Authorization": "Bearer " + token}
+    headers = dict(headers) if headers is not None else {}
+    headers["Accept"] = "text/plain"
     params = {'type': agent_type}
     try:
-        download_request(url, headers=headers, timeout=30, params=params)
+        return download_request(url, headers=headers, timeout=30, params=params, auth=bearer_auth(token),
+                                session=session, destination=destination, sha256=sha256)
     except IastException as e:
         raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
 
@@ -117,7 +149,13 @@ def download_agent(token: str, agent_type: str, host=None) -> None:
 # Authenticate using the API Key ID / Secret.Return a Bearer Token used for all other REST APIs
 # request URL : POST https://cloud.appscan.com/api/V4/Account/ApiKeyLogin
 #    json: { "KeyId" : "aaa" , "KeySecret" : "bbb" }
-def get_api_key_login(key_id, key_secret, host=None, retries=0):
+def get_api_key_login(key_id, key_secret, host=None, retries=0, session=None):
+    token, expire = get_api_key_login_with_expiry(key_id, key_secret, host, retries, session)
+    return token
+
+
+# same as get_api_key_login, also returns the token expiration time as sent by ASoC ("Expire", None if missing)
+def get_api_key_login_with_expiry(key_id, key_secret, host=None, retries=0, session=None):
     api_key = {
         "KeyId": key_id,
         "KeySecret": key_secret
@@ -126,27 +164,29 @@ def get_api_key_login(key_id, key_secret, host=None, retries=0):
     headers = {"Accept": "application/json"}
     json_response = None
     try:
-        response = post_request(url, headers=headers, json_body=api_key, retries=retries, timeout=30)
+        response = post_request(url, headers=headers, json_body=api_key, retries=retries, timeout=30, session=session)
         json_response = json.loads(response.text)
         token = json_response["Token"]
         logging.info("token: " + token)
-        return token
+        return token, json_response.get("Expire")
     except IastException as e:
-        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+        raise IastException(f"get_api_key_login failed: {str(e)}")
     except KeyError as e:
-        raise IastException(inspect.currentframe().f_code.co_name + "failed:" + "KeyError:" + str(e) +
+        raise IastException("get_api_key_login failed:" + "KeyError:" + str(e) +
                             " not in response: " + str(json_response))
 
 
 # request URL : GET https://cloud.appscan.com/api/V4/AssetGroups
 #     params: "$filter=IsDefault eq true, $select=Id, $count: true"
 #     headers: "Authorization=Bearer <token>"
-def get_default_asset_group(token, host=None):
+@cached_lookup("AssetGroups")
+def get_default_asset_group(token, host=None, session=None):
     url = url_join(get_host(host), ASOC_HOST, "/AssetGroups")
     params = {"$filter": "IsDefault eq true", "$select": "Id", "$count": "true"}
-    headers = {"Accept": "application/json", "Authorization": "Bearer " + token}
+    headers = {"Accept": "application/json"}
     try:
-        response = get_request(url, params=params, headers=headers, timeout=30)
+        response = get_request(url, params=params, headers=headers, timeout=30,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         if json_response["Count"] == 0:
             raise IastException("Error - No default asset group found.")
@@ -164,16 +204,18 @@ def get_default_asset_group(token, host=None):
 #####################################################
 # request URL : POST https://cloud.appscan.com/api/V4/Apps
 #     headers: "Authorization=Bearer <token>"
-def create_app(token, app_name, asset_group, host=None, retries=0):
+def create_app(token, app_name, asset_group, host=None, retries=0, session=None):
     app_model = {
         "Name": app_name,
         "AssetGroupId": asset_group
     }
     url = url_join(get_host(host), ASOC_HOST, "/Apps")
-    headers = {"Accept": "application/json", "Content-Type": "application/json", "Authorization": "Bearer " + token}
+    headers = {"Accept": "application/json", "Content-Type": "application/json"}
     json_response = None
     try:
-        response = post_request(url, headers=headers, json_body=app_model, retries=retries, timeout=30)
+        response = post_request(url, headers=headers, json_body=app_model, retries=retries, timeout=30,
+                                auth=bearer_auth(token), session=session)
+        invalidate_metadata("Apps", host)
         json_response = json.loads(response.text)
         app_id = json_response["Id"]
         return app_id
@@ -187,13 +229,17 @@ def create_app(token, app_name, asset_group, host=None, retries=0):
 # request URL : GET https://cloud.appscan.com/api/V4/Apps
 #     headers: "Authorization=Bearer <token>"
 #     params: "$filter: Id eq <appId>"
-def get_app_name_by_id(app_id, token, host=None):
+@cached_lookup("Apps")
+def get_app_name_by_id(app_id, token, host=None, session=None):
     url = url_join(get_host(host), ASOC_HOST, "/Apps")
-    headers = {"Accept": "application/json", "Authorization": "Bearer " + token}
+    headers = {"Accept": "application/json"}
     params = {"$filter": f"Id eq {app_id}"}
     try:
-        response = get_request(url, params=params, headers=headers, timeout=30)
+        response = get_request(url, params=params, headers=headers, timeout=30,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
+        if len(json_response["Items"]) == 0:
+            return None
         app_name = json_response["Items"][0]["Name"]
         return app_name
     except IastException as e:
@@ -209,12 +255,14 @@ def get_app_name_by_id(app_id, token, host=None):
 # request URL : GET https://cloud.appscan.com/api/V4/Apps
 #     headers: "Authorization=Bearer <token>"
 #     params: "$filter=Name eq <appName>, $select=Id, , $count: true"
-def get_app_id_by_name(app_name, token, host=None):
+@cached_lookup("Apps")
+def get_app_id_by_name(app_name, token, host=None, session=None):
     url = url_join(get_host(host), ASOC_HOST, "/Apps")
-    headers = {"Accept": "application/json", "Authorization": "Bearer " + token}
+    headers = {"Accept": "application/json"}
     params = {"$filter": f"Name eq '{app_name}'", "$select": "Id", "$count": "true"}
     try:
-        response = get_request(url, params=params, headers=headers, timeout=30)
+        response = get_request(url, params=params, headers=headers, timeout=30,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         if json_response["Count"] == 0:
             return None
@@ -230,12 +278,15 @@ def get_app_id_by_name(app_name, token, host=None):
 # request URL : DELETE https://cloud.appscan.com/api/V4/Apps/<app_id>
 #     headers: "Authorization=Bearer <token>"
 #     params: "id=<appId>"
-def delete_app(app_id, token, host=None, retries=0):
+def delete_app(app_id, token, host=None, retries=0, session=None):
     print(f"deleting app with id {app_id}")
     url = url_join(get_host(host), ASOC_HOST, "Apps", app_id)
-    headers = {"Accept": "text/plain", "Authorization": "Bearer " + token}
+    headers = {"Accept": "text/plain"}
     try:
-        delete_request(url, headers=headers, retries=retries, timeout=60)
+        delete_request(url, headers=headers, retries=retries, timeout=60, auth=bearer_auth(token), session=session)
+        # the app's scans are deleted with it
+        invalidate_metadata("Apps", host)
+        invalidate_metadata("Scans", host)
     except IastException as e:
         raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
 
@@ -243,13 +294,15 @@ def delete_app(app_id, token, host=None, retries=0):
 # request URL : POST https://cloud.appscan.com/api/V4/Apps
 #     headers: "Authorization=Bearer <token>, Accept=application/json"
 #     params:  "$filter=Id eq {app_id},select=Name,Id,LastUpdated"
-def get_app_by_id(token, host, app_id):
+@cached_lookup("Apps")
+def get_app_by_id(token, host, app_id, session=None):
     url = url_join(host + ASOC_HOST + "/Apps")
-    headers = {"Authorization": "Bearer " + token, "Accept": "application/json"}
+    headers = {"Accept": "application/json"}
     params = {f"$filter": f"Id eq {app_id}", "$select": "Name,Id,LastUpdated",
               "$count": "true"}
     try:
-        response = get_request(url, headers=headers, stream=False, params=params, timeout=30)
+        response = get_request(url, headers=headers, stream=False, params=params, timeout=30,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         return json_response
     except requests.exceptions.HTTPError as e:
@@ -270,7 +323,7 @@ def get_app_by_id(token, host, app_id):
 #         "AgentType": "Java" - one of: Java, DotNet, NodeJS
 #     }
 def create_scan(app_id, token, scan_name, host=None, retries=0, is_personal=False, agent_type='Java',
-                config_file_id=None, stop_scan=10, enable_email_notification=False):
+                config_file_id=None, stop_scan=10, enable_email_notification=False, session=None):
     scan_model = {
         "ConnLostStopTimer": stop_scan,  # Timeout in days to stop scan after agent connection lost
         "ScanName": scan_name,
@@ -283,10 +336,12 @@ def create_scan(app_id, token, scan_name, host=None, retries=0, is_personal=Fals
     if config_file_id != None:
         scan_model.update({"ConfigFileId": config_file_id})
     url = url_join(get_host(host), ASOC_HOST, "/Scans/Iast")
-    headers = {"Accept": "application/json", "Content-Type": "application/json", "Authorization": "Bearer " + token}
+    headers = {"Accept": "application/json", "Content-Type": "application/json"}
     json_response = None
     try:
-        response = post_request(url, headers=headers, json_body=scan_model, retries=retries, timeout=60)
+        response = post_request(url, headers=headers, json_body=scan_model, retries=retries, timeout=60,
+                                auth=bearer_auth(token), session=session)
+        invalidate_metadata("Scans", host)
         json_response = json.loads(response.text)
         agent_key = json_response["Agentkey"]
         scan_id = json_response["Id"]
@@ -303,12 +358,14 @@ def create_scan(app_id, token, scan_name, host=None, retries=0, is_personal=Fals
 # request URL : GET https://cloud.appscan.com/api/V4/Scans
 #     headers: "Authorization=Bearer <token>"
 #     params: "$filter: Id eq <scanId>"
-def get_scan_info_by_id(scan_id, token, host=None):
+@cached_lookup("Scans")
+def get_scan_info_by_id(scan_id, token, host=None, session=None):
     url = url_join(get_host(host), ASOC_HOST,  "/Scans")
-    headers = {"Accept": "application/json", "Authorization": "Bearer " + token}
+    headers = {"Accept": "application/json"}
     params = {"$filter": f"Id eq {scan_id}"}
     try:
-        response = get_request(url, params=params, headers=headers, timeout=30)
+        response = get_request(url, params=params, headers=headers, timeout=30,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         scan_name = json_response["Name"]
         app_name = json_response["AppName"]
@@ -326,12 +383,14 @@ def get_scan_info_by_id(scan_id, token, host=None):
 # request URL : GET https://cloud.appscan.com/api/V4/Scans
 #     headers: "Authorization=Bearer <token>"
 #     params: "$filter: Id eq <scanName>, $count: true"
-def get_scan_info_by_name(scan_name, token, host=None):
+@cached_lookup("Scans")
+def get_scan_info_by_name(scan_name, token, host=None, session=None):
     url = url_join(get_host(host), ASOC_HOST, "Scans")
-    headers = {"Accept": "application/json", "Authorization": "Bearer " + token}
+    headers = {"Accept": "application/json"}
     params = {"$filter": f"Name eq '{scan_name}'", "$count": "true"}
     try:
-        response = get_request(url, params=params, headers=headers, timeout=30)
+        response = get_request(url, params=params, headers=headers, timeout=30,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         if json_response["Count"] == 0:
             return None, None, None
@@ -349,12 +408,13 @@ def get_scan_info_by_name(scan_name, token, host=None):
 # request URL : GET https://cloud.appscan.com/api/V4/Scans
 #     headers: "Authorization=Bearer <token>"
 #     params: "$select=<Id>, $count: true"
-def get_scans(token, host=None):
+def get_scans(token, host=None, session=None):
     url = url_join(get_host(host), ASOC_HOST, "/Scans")
-    headers = {"Accept": "application/json", "Authorization": "Bearer " + token}
+    headers = {"Accept": "application/json"}
     params = {"$select": "Id", "$count": "true"}
     try:
-        response = get_request(url, params=params, headers=headers, timeout=30)
+        response = get_request(url, params=params, headers=headers, timeout=30,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         return json_response
     except IastException as e:
@@ -369,12 +429,13 @@ def get_scans(token, host=None):
 # request URL : GET https://https://cloud.appscan.com/api/v4/Apps/<app_id>/Scans
 #     headers: "Authorization=Bearer <token>"
 #     params: "$select=<Id>, $count: true"
-def get_scans_for_app(token, app_id, host=None):
+def get_scans_for_app(token, app_id, host=None, session=None):
     url = url_join(get_host(host), ASOC_HOST, "Apps", app_id, "Scans")
-    headers = {"Accept": "application/json", "Authorization": "Bearer " + token}
+    headers = {"Accept": "application/json"}
     params = {"$select": "Id", "$count": "true"}
     try:
-        response = get_request(url, params=params, headers=headers, timeout=30)
+        response = get_request(url, params=params, headers=headers, timeout=30,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         return json_response
     except IastException as e:
@@ -386,16 +447,44 @@ def get_scans_for_app(token, app_id, host=None):
         raise IastException("KeyError:" + str(e) + " not in response: " + str(json_response))
 
 
+# yields the ids of all scans, page by page - see ODataPaging.iter_pages
+# request URL : GET https://cloud.appscan.com/api/V4/Scans
+#     params: "$select=<Id>, $skip, $top"
+def iter_scans(token, host=None, page_size=default_page_size, prefetch=False, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "/Scans")
+    params = {"$select": "Id"}
+    try:
+        yield from iter_items(url, params=params, token=token, page_size=page_size, prefetch=prefetch,
+                              session=session)
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+
+
+# yields the ids of all scans of an app, page by page - see ODataPaging.iter_pages
+# request URL : GET https://https://cloud.appscan.com/api/v4/Apps/<app_id>/Scans
+#     params: "$select=<Id>, $skip, $top"
+def iter_scans_for_app(token, app_id, host=None, page_size=default_page_size, prefetch=False, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "Apps", app_id, "Scans")
+    params = {"$select": "Id"}
+    try:
+        yield from iter_items(url, params=params, token=token, page_size=page_size, prefetch=prefetch,
+                              session=session)
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+
+
 # request URL : DELETE https://cloud.appscan.com/api/V4/Scans/<scan_id>
 #     headers: "Authorization=Bearer <token>"
 #     params: "scanId=<scanId>, deleteIssues=True"
-def delete_scan(scan_id, token, host=None, retries=0):
+def delete_scan(scan_id, token, host=None, retries=0, session=None):
     if scan_id is not None:
         url = url_join(get_host(host), ASOC_HOST, "Scans", scan_id)
-        headers = {"Accept": "text/plain", "Authorization": "Bearer " + token}
+        headers = {"Accept": "text/plain"}
         params = {"deleteIssues": True}
         try:
-            delete_request(url, headers=headers, params=params, retries=retries, timeout=60)
+            delete_request(url, headers=headers, params=params, retries=retries, timeout=60,
+                           auth=bearer_auth(token), session=session)
+            invalidate_metadata("Scans", host)
         except IastException as e:
             raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
 
@@ -403,11 +492,11 @@ def delete_scan(scan_id, token, host=None, retries=0):
 # request URL : POST https://cloud.appscan.com/api/V4/Scans/NewIASTKey/<scan_id>
 #     headers: "Authorization=Bearer <token>"
 #     params: "scanId=<scanId>"
-def get_new_iast_key_for_scan(scan_id, token, host=None):
+def get_new_iast_key_for_scan(scan_id, token, host=None, session=None):
     url = url_join(get_host(host), ASOC_HOST, "/Scans/NewIASTKey/", scan_id)
-    headers = {"Accept": "application/json", "Authorization": "Bearer " + token}
+    headers = {"Accept": "application/json"}
     try:
-        response = post_request(url, headers=headers, timeout=30)
+        response = post_request(url, headers=headers, timeout=30, auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         key = json_response["Key"]
         return key
@@ -423,13 +512,14 @@ def get_new_iast_key_for_scan(scan_id, token, host=None):
 # request URL : POST https://cloud.appscan.com/api/v4/FileUpload
 #     headers: "Authorization=Bearer <token>"
 #     params: "uploadedFile=<filePath>"
-def upload_file(token, file_to_upload, host=None, timeout=60, retries=2):
+def upload_file(token, file_to_upload, host=None, timeout=60, retries=2, session=None):
     url = url_join(get_host(host), ASOC_HOST, "/FileUpload")
-    headers = {"Authorization": "Bearer " + token, "Accept": "text/plain"}
+    headers = {"Accept": "text/plain"}
     json_response = ""
     try:
         with open(file_to_upload, "rb") as file:
-            response = post_request(url, headers=headers, files={"uploadedFile": file}, timeout=timeout, retries=retries)
+            response = post_request(url, headers=headers, files={"uploadedFile": file}, timeout=timeout,
+                                    retries=retries, auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         file_id = json_response["FileId"]
         return file_id
@@ -443,14 +533,15 @@ def upload_file(token, file_to_upload, host=None, timeout=60, retries=2):
 # request URL : PUT https://cloud.appscan.com/api/v4/Scans/UpdateIastScan/{scanId}
 #     headers: "Authorization=Bearer <token>"
 #     params: "scanId=<scanId>, scanData=<scanData>"
-def update_iast_scan(scan_id, token, file_id, host=None, retries=0):
+def update_iast_scan(scan_id, token, file_id, host=None, retries=0, session=None):
     scan_model = {
         "ConfigFileId": file_id
     }
     url = url_join(get_host(host), ASOC_HOST, "Scans", "UpdateIastScan", scan_id)
-    headers = {"Accept": "application/json", "Content-Type": "application/json", "Authorization": "Bearer " + token}
+    headers = {"Accept": "application/json", "Content-Type": "application/json"}
     try:
-        put_request(url, headers=headers, params={"scanId": scan_id}, json_body=scan_model, retries=retries, timeout=30)
+        put_request(url, headers=headers, params={"scanId": scan_id}, json_body=scan_model, retries=retries, timeout=30,
+                    auth=bearer_auth(token), session=session)
     except IastException as e:
         raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
 
@@ -475,13 +566,13 @@ def update_iast_scan(scan_id, token, file_id, host=None, retries=0):
 #         "IsTrialReport": True,
 #         "ReportFileType": Xml
 #     }
-def create_report(scan_id, token, host=None, scope="Scan"):
+def create_report(scan_id, token, host=None, scope="Scan", session=None):
     # url
     # scope is one of: Application/Scan/ScanExecution (ScanExecution not supported)
     url = url_join(get_host(host), ASOC_HOST, "/Reports/Security/", scope, scan_id)
 
     # headers
-    headers = {"Authorization": "Bearer " + token, "Content-Type": "application/json", "Accept": "text/plain"}
+    headers = {"Content-Type": "application/json", "Accept": "text/plain"}
 
     # body
     report_type = "Xml"  # one of: Xml/Html/Pdf - xml is quick, html slower, pdf VERY slow
@@ -500,7 +591,8 @@ def create_report(scan_id, token, host=None, scope="Scan"):
     body = {"Configuration": configuration}
     json_response = None
     try:
-        response = post_request(url, json_body=body, headers=headers, timeout=30)
+        response = post_request(url, json_body=body, headers=headers, timeout=30,
+                                auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
         print(json_response)
         logging.info("report id: " + json_response["Id"])
@@ -516,55 +608,224 @@ def create_report(scan_id, token, host=None, scope="Scan"):
 # request URL : GET https://cloud.appscan.com/api/V4/Reports
 #     headers: "Authorization=Bearer <token>"
 #     params: "$filter: Id eq <reportId>"
-def get_report_status(report_id, token, host=None):
+def get_report_status(report_id, token, host=None, session=None):
     url = url_join(get_host(host), ASOC_HOST, "/Reports")
-    headers = {"Authorization": "Bearer " + token, "Accept": "application/json"}
+    headers = {"Accept": "application/json"}
     params = {"$filter": f"Id eq {report_id}"}
     json_response = None
     try:
-        response = get_request(url, headers=headers, params=params, timeout=60)
+        response = get_request(url, headers=headers, params=params, timeout=60,
+                               auth=bearer_auth(token), session=session)
         json_response = json.loads(response.text)
-        print(json_response)
+        logging.debug(json_response)
         report_status = json_response["Items"][0]["Status"]
         logging.info("report status: " + report_status)
-        if report_status == 'failed':
+        if is_report_failed(report_status):
             raise IastException("Report creation failed!")
         return report_status
-    except requests.exceptions.HTTPError as e:
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
+                            " not in response: " + str(json_response))
+
+
+# report status values are not consistently capitalized by the server
+def is_report_ready(report_status):
+    return report_status is not None and report_status.lower() == "ready"
+
+
+def is_report_failed(report_status):
+    return report_status is not None and report_status.lower() in report_failed_statuses
+
+
+# returns the status of many reports with one request per report_status_batch_size reports - {report_id: status}.
+# reports the server does not return are missing from the result
+# request URL : GET https://cloud.appscan.com/api/V4/Reports
+#     headers: "Authorization=Bearer <token>"
+#     params: "$filter: Id in (<reportId>, <reportId>, ...), $select=Id,Status"
+def get_reports_status(report_ids, token, host=None, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "/Reports")
+    headers = {"Accept": "application/json"}
+    report_ids = list(report_ids)
+    statuses = {}
+    json_response = None
+    try:
+        for start in range(0, len(report_ids), report_status_batch_size):
+            batch = report_ids[start:start + report_status_batch_size]
+            params = {"$filter": f"Id in ({', '.join(batch)})", "$select": "Id,Status"}
+            response = get_request(url, headers=headers, params=params, timeout=60,
+                                   auth=bearer_auth(token), session=session)
+            json_response = json.loads(response.text)
+            for item in json_response["Items"]:
+                statuses[item["Id"]] = item["Status"]
+        return statuses
+    except IastException as e:
         raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
     except KeyError as e:
         raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
                             " not in response: " + str(json_response))
 
 
-# polls asoc until report is ready
-def wait_for_report_ready(report_id, token, max_retries=100, host=None):
-    counter = max_retries
-    while counter > 0:
-        report_status = get_report_status(report_id=report_id, token=token, host=host)
-        if report_status == 'Ready':
+# sleep intervals for polling: start fast, grow by backoff_factor up to max_interval
+def poll_intervals(initial_interval=default_poll_initial_interval, max_interval=default_poll_max_interval,
+                   backoff_factor=default_poll_backoff_factor):
+    interval = initial_interval
+    while True:
+        yield interval
+        interval = min(max_interval, interval * backoff_factor)
+
+
+# polls many reports together, one request per poll for all the pending reports, and yields (report_id, status)
+# for every report as soon as it is Ready or Failed. raises IastException if the deadline (seconds) passes first.
+#     progress: optional callback(report_id, status, elapsed_seconds), called for every report on every poll
+def iter_ready_reports(report_ids, token, host=None, deadline=default_poll_deadline,
+                       initial_interval=default_poll_initial_interval, max_interval=default_poll_max_interval,
+                       backoff_factor=default_poll_backoff_factor, progress=None, session=None):
+    pending = list(dict.fromkeys(report_ids))
+    started = time.monotonic()
+    intervals = poll_intervals(initial_interval, max_interval, backoff_factor)
+    while pending:
+        statuses = get_reports_status(pending, token, host, session=session)
+        elapsed = time.monotonic() - started
+        still_pending = []
+        for report_id in pending:
+            report_status = statuses.get(report_id)
+            if progress is not None:
+                progress(report_id, report_status, elapsed)
+            if is_report_ready(report_status) or is_report_failed(report_status):
+                yield report_id, report_status
+            else:
+                still_pending.append(report_id)
+        pending = still_pending
+        if not pending:
             return
-        if report_status == 'Failed':
-            raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "asoc report generation failed")
-        time.sleep(2)
-        counter -= 1
-    raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "Timed out waiting for report ready")
+        interval = next(intervals)
+        if deadline is not None and time.monotonic() - started + interval > deadline:
+            raise IastException(f"iter_ready_reports failed: Timed out waiting for reports ready: {pending}")
+        time.sleep(interval)
+
+
+# polls many reports until all are Ready or Failed - returns {report_id: status}. see iter_ready_reports
+def wait_for_reports_ready(report_ids, token, host=None, deadline=default_poll_deadline,
+                           initial_interval=default_poll_initial_interval, max_interval=default_poll_max_interval,
+                           backoff_factor=default_poll_backoff_factor, progress=None, session=None):
+    return dict(iter_ready_reports(report_ids, token, host, deadline=deadline, initial_interval=initial_interval,
+                                   max_interval=max_interval, backoff_factor=backoff_factor, progress=progress,
+                                   session=session))
+
+
+# polls asoc until a report is ready, with adaptive intervals (see poll_intervals). raises IastException if the report
+# failed or the deadline (seconds) passed
+def poll_report_ready(report_id, token, host=None, deadline=default_poll_deadline,
+                      initial_interval=default_poll_initial_interval, max_interval=default_poll_max_interval,
+                      backoff_factor=default_poll_backoff_factor, progress=None, session=None):
+    try:
+        for ready_id, report_status in iter_ready_reports([report_id], token, host, deadline, initial_interval,
+                                                          max_interval, backoff_factor, progress, session):
+            if is_report_failed(report_status):
+                raise IastException("asoc report generation failed")
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
 
 
-# returns the status of report preparation
+# polls asoc until report is ready - for up to about max_retries * 2 seconds
+def wait_for_report_ready(report_id, token, max_retries=100, host=None, session=None):
+    try:
+        poll_report_ready(report_id, token, host, deadline=max_retries * 2, session=session)
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+
+
+# returns the report content as text
 # request URL : GET https://cloud.appscan.com/api/V4/Reports/<report_id>/Download
 #     headers: "Authorization=Bearer <token>"
 #     params: "id=<reportId>"
-def download_report(report_id, token, host=None):
+def download_report(report_id, token, host=None, session=None, chunk_size=default_report_chunk_size):
+    try:
+        return "".join(iter_report_text(report_id, token, host, chunk_size=chunk_size, session=session))
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+
+
+# starts a streamed report download and returns the response - the body is read by the caller, e.g. with
+# response.iter_content() or response.raw. close the response when done
+def open_report_stream(report_id, token, host=None, session=None, headers=None):
     url = url_join(get_host(host), ASOC_HOST, "/Reports/", report_id, "/Download")
-    headers = {"Authorization": "Bearer " + token, "Accept": "text/plain"}
+    headers = dict(headers) if headers is not None else {}
+    headers["Accept"] = "text/plain"
+    return get_request(url, headers=headers, stream=True, timeout=30, auth=bearer_auth(token), session=session)
+
+
+# yields the report bytes in chunks of up to chunk_size, without holding the whole report in memory.
+# if the connection breaks, the download continues from the last byte received with a Range request, up to
+# resume_retries times
+def iter_report_chunks(report_id, token, host=None, chunk_size=default_report_chunk_size, session=None,
+                       resume_retries=default_report_resume_retries):
+    offset = 0
+    attempt = 0
+    while True:
+        headers = {"Range": f"bytes={offset}-"} if offset > 0 else None
+        response = open_report_stream(report_id, token, host, session=session, headers=headers)
+        try:
+            # a server that ignores the range sends the whole report again - skip what was already yielded
+            skip = offset if response.status_code != 206 else 0
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                if skip > 0:
+                    skipped = min(skip, len(chunk))
+                    chunk = chunk[skipped:]
+                    skip -= skipped
+                if chunk:
+                    offset += len(chunk)
+                    yield chunk
+            return
+        except (requests.exceptions.ChunkedEncodingError, requests.exceptions.ConnectionError) as e:
+            if attempt >= resume_retries:
+                raise IastException(f"report {report_id} download interrupted: {str(e)}")
+            attempt += 1
+            logging.warning(f"report {report_id} download interrupted after {offset} bytes, resuming: {str(e)}")
+        except (requests.exceptions.RequestException, OSError) as e:
+            raise IastException(f"report {report_id} download interrupted: {str(e)}")
+        finally:
+            response.close()
+
+
+# yields the report as text chunks. the incremental decoder keeps multi-byte characters that are split between
+# two chunks whole
+def iter_report_text(report_id, token, host=None, chunk_size=default_report_chunk_size, encoding="utf-8",
+                     session=None):
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in iter_report_chunks(report_id, token, host, chunk_size=chunk_size, session=session):
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+# streams the report to destination - a file path, or a binary file-like object (anything with write(bytes)).
+# a path is written to <destination>.part and renamed when complete; an interrupted download is resumed from the
+# .part file, also by a later call (for the same report, see RequestApi.download_request). sha256: expected hex digest
+# of the report, raises IastException on mismatch. returns the number of bytes written
+def download_report_to_file(report_id, token, destination, host=None, chunk_size=default_report_chunk_size,
+                            session=None, sha256=None):
+    size = 0
     try:
-        response = get_request(url, headers=headers, stream=False, timeout=30)
-        report = ""
-        for chunk in response.iter_content(chunk_size=1024 * 1024):
-            if chunk:
-                #  report.append(chunk)
-                report += chunk.decode("utf-8")
-        return report
-    except requests.exceptions.HTTPError as e:
+        if hasattr(destination, "write"):
+            digest = hashlib.sha256()
+            for chunk in iter_report_chunks(report_id, token, host, chunk_size=chunk_size, session=session):
+                destination.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+            if sha256 is not None and digest.hexdigest() != sha256.lower():
+                raise IastException(f"report {report_id} sha256 mismatch")
+        else:
+            url = url_join(get_host(host), ASOC_HOST, "/Reports/", report_id, "/Download")
+            download_request(url, headers={"Accept": "text/plain"}, timeout=30,
+                             retries=default_report_resume_retries, auth=bearer_auth(token), session=session,
+                             destination=destination, sha256=sha256, chunk_size=chunk_size)
+            size = os.path.getsize(destination)
+        return size
+    except IastException as e:
         raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
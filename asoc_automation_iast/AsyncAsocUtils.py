@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# asyncio counterparts of the AsocUtils and AsocReportUtils functions.
+# every function has the same arguments as its blocking version plus session=AsyncAsocSession, builds the same url
+# and raises IastException on the same errors. many calls can run concurrently on one session, e.g:
+#     async with AsyncAsocSession(token=token, max_concurrency=20) as session:
+#         results = await asyncio.gather(*[get_issues_for_scan(scan_id, None, host, session=session)
+#                                           for scan_id in scan_ids])
+
+import asyncio
+import inspect
+import json
+import logging
+
+from .AsocUtils import url_join, get_host, ASOC_HOST, IAST_HOST, is_report_ready, is_report_failed, \
+    poll_intervals, default_poll_deadline, default_poll_initial_interval, default_poll_max_interval, \
+    default_poll_backoff_factor
+from .AsyncRequestApi import get_request, post_request, delete_request
+from .IastUtils import IastException
+from .ODataPaging import get_next_page_link, default_page_size
+
+####################################################################
+# ASOC - IAST API https://cloud.appscan.com/IAST/swagger/ui/
+####################################################################
+
+
+# request URL : POST https://cloud.appscan.com/IAST/api/StartNewExecution
+#     headers: "Authorization=Bearer <accessToken>"
+async def start_new_execution(agent_key: str, host=None, retries=0, session=None) -> str:
+    url = url_join(get_host(host), IAST_HOST, "api/StartNewExecution")
+    json_response = None
+    try:
+        response = await post_request(url, timeout=30, retries=retries, token=agent_key, session=session)
+        json_response = json.loads(response.text)
+        logging.info("Started new execution with id: " + json_response["ExecutionId"])
+        return json_response["ExecutionId"]
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
+                            " not in response: " + str(json_response))
+
+
+# request URL : POST https://cloud.appscan.com/IAST/api/StopExecution
+#     headers: "Authorization=Bearer <accessToken>"
+async def stop_execution(agent_key: str, host=None, retries=0, session=None) -> None:
+    url = url_join(get_host(host), IAST_HOST, "/api/StopExecution")
+    try:
+        await post_request(url, timeout=60, retries=retries, token=agent_key, session=session)
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+
+
+#####################################################
+# ASOC - API https://cloud.appscan.com/swagger/ui/
+#####################################################
+
+# request URL : POST https://cloud.appscan.com/api/V4/Account/ApiKeyLogin
+#    json: { "KeyId" : "aaa" , "KeySecret" : "bbb" }
+async def get_api_key_login(key_id, key_secret, host=None, retries=0, session=None):
+    api_key = {
+        "KeyId": key_id,
+        "KeySecret": key_secret
+    }
+    url = url_join(get_host(host), ASOC_HOST, "/Account/ApiKeyLogin")
+    headers = {"Accept": "application/json"}
+    json_response = None
+    try:
+        response = await post_request(url, headers=headers, json_body=api_key, retries=retries, timeout=30,
+                                      session=session)
+        json_response = json.loads(response.text)
+        return json_response["Token"]
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
+                            " not in response: " + str(json_response))
+
+
+# request URL : GET https://cloud.appscan.com/api/V4/AssetGroups
+#     params: "$filter=IsDefault eq true, $select=Id, $count: true"
+async def get_default_asset_group(token, host=None, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "/AssetGroups")
+    params = {"$filter": "IsDefault eq true", "$select": "Id", "$count": "true"}
+    headers = {"Accept": "application/json"}
+    json_response = None
+    try:
+        response = await get_request(url, params=params, headers=headers, timeout=30, token=token, session=session)
+        json_response = json.loads(response.text)
+        if json_response["Count"] == 0:
+            raise IastException("Error - No default asset group found.")
+        return json_response["Items"][0]["Id"]
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
+                            " not in response: " + str(json_response))
+
+
+#####################################################
+# ASOC - Apps API
+#####################################################
+# request URL : POST https://cloud.appscan.com/api/V4/Apps
+async def create_app(token, app_name, asset_group, host=None, retries=0, session=None):
+    app_model = {
+        "Name": app_name,
+        "AssetGroupId": asset_group
+    }
+    url = url_join(get_host(host), ASOC_HOST, "/Apps")
+    headers = {"Accept": "application/json", "Content-Type": "application/json"}
+    json_response = None
+    try:
+        response = await post_request(url, headers=headers, json_body=app_model, retries=retries, timeout=30,
+                                      token=token, session=session)
+        json_response = json.loads(response.text)
+        return json_response["Id"]
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
+                            " not in response: " + str(json_response))
+
+
+# request URL : GET https://cloud.appscan.com/api/V4/Apps
+#     params: "$filter: Id eq <appId>"
+async def get_app_name_by_id(app_id, token, host=None, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "/Apps")
+    headers = {"Accept": "application/json"}
+    params = {"$filter": f"Id eq {app_id}"}
+    json_response = None
+    try:
+        response = await get_request(url, params=params, headers=headers, timeout=30, token=token, session=session)
+        json_response = json.loads(response.text)
+        if len(json_response["Items"]) == 0:
+            return None
+        return json_response["Items"][0]["Name"]
+    except IastException as e:
+        if 'Client Error: 400' in str(e):
+            return None
+        else:
+            raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
+                            " not in response: " + str(json_response))
+
+
+# request URL : GET https://cloud.appscan.com/api/V4/Apps
+#     params: "$filter=Name eq <appName>, $select=Id, , $count: true"
+async def get_app_id_by_name(app_name, token, host=None, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "/Apps")
+    headers = {"Accept": "application/json"}
+    params = {"$filter": f"Name eq '{app_name}'", "$select": "Id", "$count": "true"}
+    json_response = None
+    try:
+        response = await get_request(url, params=params, headers=headers, timeout=30, token=token, session=session)
+        json_response = json.loads(response.text)
+        if json_response["Count"] == 0:
+            return None
+        return json_response["Items"][0]["Id"]
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
+                            " not in response: " + str(json_response))
+
+
+# request URL : DELETE https://cloud.appscan.com/api/V4/Apps/<app_id>
+async def delete_app(app_id, token, host=None, retries=0, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "Apps", app_id)
+    headers = {"Accept": "text/plain"}
+    try:
+        await delete_request(url, headers=headers, retries=retries, timeout=60, token=token, session=session)
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+
+
+#####################################################
+# ASOC - scan API
+#####################################################
+# request URL : POST https://cloud.appscan.com/api/V4/Scans/Iast
+async def create_scan(app_id, token, scan_name, host=None, retries=0, is_personal=False, agent_type='Java',
+                      config_file_id=None, stop_scan=10, enable_email_notification=False, session=None):
+    scan_model = {
+        "ConnLostStopTimer": stop_scan,
+        "ScanName": scan_name,
+        "EnableMailNotification": enable_email_notification,
+        "Locale": "en-US",
+        "AppId": app_id,
+        "Personal": is_personal,
+        "AgentType": agent_type,
+    }
+    if config_file_id is not None:
+        scan_model.update({"ConfigFileId": config_file_id})
+    url = url_join(get_host(host), ASOC_HOST, "/Scans/Iast")
+    headers = {"Accept": "application/json", "Content-Type": "application/json"}
+    json_response = None
+    try:
+        response = await post_request(url, headers=headers, json_body=scan_model, retries=retries, timeout=60,
+                                      token=token, session=session)
+        json_response = json.loads(response.text)
+        return json_response["Agentkey"], json_response["Id"]
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
+                            " not in response: " + str(json_response))
+
+
+# request URL : GET https://cloud.appscan.com/api/V4/Scans
+#     params: "$filter: Id eq <scanId>"
+async def get_scan_info_by_id(scan_id, token, host=None, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "/Scans")
+    headers = {"Accept": "application/json"}
+    params = {"$filter": f"Id eq {scan_id}"}
+    json_response = None
+    try:
+        response = await get_request(url, params=params, headers=headers, timeout=30, token=token, session=session)
+        json_response = json.loads(response.text)
+        return json_response["Name"], json_response["AppName"], json_response["AppId"]
+    except IastException as e:
+        if 'Client Error: 400' in str(e):
+            return None
+        else:
+            raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException("KeyError:" + str(e) + " not in response: " + str(json_response))
+
+
+# request URL : GET https://cloud.appscan.com/api/V4/Scans
+#     params: "$filter: Id eq <scanName>, $count: true"
+async def get_scan_info_by_name(scan_name, token, host=None, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "Scans")
+    headers = {"Accept": "application/json"}
+    params = {"$filter": f"Name eq '{scan_name}'", "$count": "true"}
+    json_response = None
+    try:
+        response = await get_request(url, params=params, headers=headers, timeout=30, token=token, session=session)
+        json_response = json.loads(response.text)
+        if json_response["Count"] == 0:
+            return None, None, None
+        item = json_response["Items"][0]
+        return item["Id"], item["AppName"], item["AppId"]
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
+                            " not in response: " + str(json_response))
+
+
+# request URL : GET https://cloud.appscan.com/api/V4/Scans
+#     params: "$select=<Id>, $count: true"
+async def get_scans(token, host=None, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "/Scans")
+    headers = {"Accept": "application/json"}
+    params = {"$select": "Id", "$count": "true"}
+    try:
+        response = await get_request(url, params=params, headers=headers, timeout=30, token=token, session=session)
+        return json.loads(response.text)
+    except IastException as e:
+        if 'Client Error: 400' in str(e):
+            return None
+        else:
+            raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+
+
+# request URL : GET https://https://cloud.appscan.com/api/v4/Apps/<app_id>/Scans
+#     params: "$select=<Id>, $count: true"
+async def get_scans_for_app(token, app_id, host=None, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "Apps", app_id, "Scans")
+    headers = {"Accept": "application/json"}
+    params = {"$select": "Id", "$count": "true"}
+    try:
+        response = await get_request(url, params=params, headers=headers, timeout=30, token=token, session=session)
+        return json.loads(response.text)
+    except IastException as e:
+        if 'Client Error: 400' in str(e):
+            return None
+        else:
+            raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+
+
+# request URL : DELETE https://cloud.appscan.com/api/V4/Scans/<scan_id>
+#     params: "scanId=<scanId>, deleteIssues=True"
+async def delete_scan(scan_id, token, host=None, retries=0, session=None):
+    if scan_id is not None:
+        url = url_join(get_host(host), ASOC_HOST, "Scans", scan_id)
+        headers = {"Accept": "text/plain"}
+        params = {"deleteIssues": "true"}
+        try:
+            await delete_request(url, headers=headers, params=params, retries=retries, timeout=60, token=token,
+                                 session=session)
+        except IastException as e:
+            raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+
+
+# request URL : POST https://cloud.appscan.com/api/V4/Scans/NewIASTKey/<scan_id>
+async def get_new_iast_key_for_scan(scan_id, token, host=None, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "/Scans/NewIASTKey/", scan_id)
+    headers = {"Accept": "application/json"}
+    json_response = None
+    try:
+        response = await post_request(url, headers=headers, timeout=30, token=token, session=session)
+        json_response = json.loads(response.text)
+        return json_response["Key"]
+    except IastException as e:
+        if 'Client Error: 400' in str(e):
+            return None
+        else:
+            raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException("KeyError:" + str(e) + " not in response: " + str(json_response))
+
+
+#####################################################
+# ASOC - report API https://cloud.appscan.com/swagger/ui/
+#####################################################
+
+# request URL : POST https://cloud.appscan.com/api/V4/Reports/Security/<scope>/<id>
+# scope is one of: Application/Scan
+async def create_report(scan_id, token, host=None, scope="Scan", session=None):
+    url = url_join(get_host(host), ASOC_HOST, "/Reports/Security/", scope, scan_id)
+    headers = {"Content-Type": "application/json", "Accept": "text/plain"}
+    configuration = {
+        "Summary": True,
+        "Details": True,
+        "Discussion": False,
+        "Overview": False,
+        "TableOfContent": True,
+        "Advisories": False,
+        "FixRecommendation": False,
+        "History": True,
+        "IsTrialReport": True,
+        "ReportFileType": "Xml"
+    }
+    body = {"Configuration": configuration}
+    json_response = None
+    try:
+        response = await post_request(url, json_body=body, headers=headers, timeout=30, token=token, session=session)
+        json_response = json.loads(response.text)
+        logging.info("report id: " + json_response["Id"])
+        return json_response["Id"]
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
+                            " not in response: " + str(json_response))
+
+
+# request URL : GET https://cloud.appscan.com/api/V4/Reports
+#     params: "$filter: Id eq <reportId>"
+async def get_report_status(report_id, token, host=None, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "/Reports")
+    headers = {"Accept": "application/json"}
+    params = {"$filter": f"Id eq {report_id}"}
+    json_response = None
+    try:
+        response = await get_request(url, headers=headers, params=params, timeout=60, token=token, session=session)
+        json_response = json.loads(response.text)
+        report_status = json_response["Items"][0]["Status"]
+        logging.info("report status: " + report_status)
+        if is_report_failed(report_status):
+            raise IastException("Report creation failed!")
+        return report_status
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+    except KeyError as e:
+        raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "KeyError:" + str(e) +
+                            " not in response: " + str(json_response))
+
+
+# polls asoc until report is ready with adaptive intervals, without blocking the event loop.
+# see AsocUtils.poll_report_ready
+async def poll_report_ready(report_id, token, host=None, deadline=default_poll_deadline,
+                            initial_interval=default_poll_initial_interval, max_interval=default_poll_max_interval,
+                            backoff_factor=default_poll_backoff_factor, progress=None, session=None):
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for interval in poll_intervals(initial_interval, max_interval, backoff_factor):
+        report_status = await get_report_status(report_id=report_id, token=token, host=host, session=session)
+        if progress is not None:
+            progress(report_id, report_status, loop.time() - started)
+        if is_report_ready(report_status):
+            return
+        if is_report_failed(report_status):
+            raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "asoc report generation failed")
+        if deadline is not None and loop.time() - started + interval > deadline:
+            break
+        await asyncio.sleep(interval)
+    raise IastException(inspect.currentframe().f_code.co_name + " failed:" + "Timed out waiting for report ready")
+
+
+# polls asoc until report is ready - for up to about max_retries * 2 seconds
+async def wait_for_report_ready(report_id, token, max_retries=100, host=None, session=None):
+    try:
+        await poll_report_ready(report_id, token, host, deadline=max_retries * 2, session=session)
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+
+
+# request URL : GET https://cloud.appscan.com/api/V4/Reports/<report_id>/Download
+async def download_report(report_id, token, host=None, session=None):
+    url = url_join(get_host(host), ASOC_HOST, "/Reports/", report_id, "/Download")
+    headers = {"Accept": "text/plain"}
+    try:
+        response = await get_request(url, headers=headers, timeout=30, token=token, session=session)
+        return response.content.decode("utf-8")
+    except IastException as e:
+        raise IastException(f"{inspect.currentframe().f_code.co_name} failed: {str(e)}")
+
+
+#####################################################
+# Report API - host is the api url, e.g. https://cloud.appscan.com/api/v4
+#####################################################
+
+# request URL : GET https://cloud.appscan.com/api/V4/Issues/Scan/<scan_id>
+async def get_issues_for_scan(scan_id, token, host, session=None):
+    url = host + "/Issues/Scan/" + scan_id
+    headers = {"Accept": "application/json"}
+    params = {"$select": "AsmHash,IssueTypeId,Id,Path,ScanName,ApplicationId,Api,SourceFile", "$count": "true"}
+    response = await get_request(url, headers=headers, params=params, timeout=30, token=token, session=session)
+    return json.loads(response.text)
+
+
+# yields all the issues of a scan, page by page - see iter_items
+async def iter_issues_for_scan(scan_id, token, host, page_size=default_page_size, prefetch=False, session=None):
+    url = host + "/Issues/Scan/" + scan_id
+    params = {"$select": "AsmHash,IssueTypeId,Id,Path,ScanName,ApplicationId,Api,SourceFile"}
+    async for issue in iter_items(url, params, token=token, page_size=page_size, prefetch=prefetch, session=session):
+        yield issue
+
+
+# request URL : GET https://cloud.appscan.com/api/V4/Issues/ScanExecution/<execution_id>
+async def get_issues_for_execution(execution_id, token, host, session=None):
+    url = host + "/Issues/ScanExecution/" + execution_id
+    headers = {"Accept": "application/json"}
+    params = {"$select": "AsmHash,IssueTypeId,Id,Path,Api", "$count": "true"}
+    response = await get_request(url, headers=headers, params=params, timeout=30, token=token, session=session)
+    return json.loads(response.text)
+
+
+# yields all the issues of a scan execution, page by page - see iter_items
+async def iter_issues_for_execution(execution_id, token, host, page_size=default_page_size, prefetch=False,
+                                    session=None):
+    url = host + "/Issues/ScanExecution/" + execution_id
+    params = {"$select": "AsmHash,IssueTypeId,Id,Path,Api"}
+    async for issue in iter_items(url, params, token=token, page_size=page_size, prefetch=prefetch, session=session):
+        yield issue
+
+
+# request URL : GET https://cloud.appscan.com/api/V4/Issues/<issue_id>
+async def get_issue(issue_id, token, host, session=None):
+    url = host + "/Issues/" + issue_id
+    headers = {"Accept": "application/json"}
+    response = await get_request(url, headers=headers, timeout=30, token=token, session=session)
+    return json.loads(response.text)
+
+
+# request URL : GET https://cloud.appscan.com//api/v4/Issues/{issueId}/Details
+async def get_issue_details_from_asoc(issue_id, token, host, session=None):
+    url = host + "/Issues/" + issue_id + "/Details"
+    headers = {"Accept": "text/xml"}
+    response = await get_request(url, headers=headers, timeout=60, retries=20, token=token, session=session)
+    return response.content.decode("utf-8")
+
+
+# request URL : GET https://cloud.appscan.com/api/V4/Apps
+#     params:  "$filter=Name ne 'IAST-testing' & $orderby=TotalIssues & $select=Name,Id & $count: true"
+async def get_apps(token, host, session=None):
+    url = host + "/Apps"
+    headers = {"Accept": "application/json"}
+    params = {"$filter": "Name ne 'IAST-testing'", "$orderby": "TotalIssues", "$select": "Name,Id", "$count": "true"}
+    response = await get_request(url, headers=headers, params=params, timeout=30, token=token, session=session)
+    return json.loads(response.text)
+
+
+# yields the items of all pages of an OData list, one request at a time - same paging as ODataPaging.iter_pages.
+#     prefetch: request the next page in a task while the caller processes the current one
+async def iter_items(url, params=None, headers=None, token=None, page_size=default_page_size, prefetch=False,
+                     timeout=30, retries=0, session=None):
+    params = dict(params) if params is not None else {}
+    headers = headers if headers is not None else {"Accept": "application/json"}
+
+    async def fetch(skip, link, with_count):
+        if link is not None:
+            response = await get_request(link, headers=headers, timeout=timeout, retries=retries, token=token,
+                                         session=session)
+        else:
+            page_params = dict(params)
+            page_params.update({"$skip": skip, "$top": page_size})
+            if with_count:
+                page_params["$count"] = "true"
+            response = await get_request(url, params=page_params, headers=headers, timeout=timeout, retries=retries,
+                                         token=token, session=session)
+        return json.loads(response.text)
+
+    next_page = None
+    try:
+        skip = 0
+        page = await fetch(skip, None, True)
+        total = page.get("Count")
+        while True:
+            items = page.get("Items") or []
+            skip += len(items)
+            link = get_next_page_link(page)
+            if link is not None:
+                has_more = len(items) > 0
+            elif total is not None:
+                has_more = len(items) > 0 and skip < total
+            else:
+                has_more = len(items) >= page_size
+            if has_more and prefetch:
+                next_page = asyncio.ensure_future(fetch(skip, link, False))
+            for item in items:
+                yield item
+            if not has_more:
+                return
+            if next_page is not None:
+                page = await next_page
+                next_page = None
+            else:
+                page = await fetch(skip, link, False)
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
+
+# fetches the issues of many scans concurrently - returns {scan_id: issues json}
+# concurrency is bounded by the session's max_concurrency
+async def get_issues_for_scans(scan_ids, token, host, session):
+    results = await asyncio.gather(*[get_issues_for_scan(scan_id, token, host, session=session)
+                                     for scan_id in scan_ids])
+    return dict(zip(scan_ids, results))
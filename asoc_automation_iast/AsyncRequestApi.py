@@ -0,0 +1,154 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+import asyncio
+import time
+
+try:
+    import httpx
+except ImportError:  # async support is optional: pip install asoc_automation_iast[async]
+    httpx = None
+
+from .AsocTokenProvider import AsocTokenProvider
+from .IastUtils import IastException
+from .RequestApi import print_url, get_retry_policy
+from .RequestMetrics import start_request, finish_request
+
+# max number of requests a single AsyncAsocSession keeps in flight, the rest wait for a free slot
+default_max_concurrency = 50
+
+
+# asyncio counterpart of RequestApi.AsocSession, based on httpx.AsyncClient.
+# all requests sent through the session share one connection pool and are limited to max_concurrency in flight,
+# so a single event loop can schedule thousands of calls without opening thousands of connections.
+#     token: default bearer token or AsocTokenProvider, used when a function is called with token=None
+#     headers: default headers sent with every request
+#     pool_size: max open connections (defaults to max_concurrency)
+class AsyncAsocSession:
+    def __init__(self, token=None, headers=None, max_concurrency=default_max_concurrency, pool_size=None,
+                 verify=False):
+        if httpx is None:
+            raise IastException("async api requires the httpx package: pip install httpx")
+        pool_size = pool_size if pool_size is not None else max_concurrency
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self.client = httpx.AsyncClient(verify=verify, headers=headers, limits=limits)
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.token = token
+
+    async def request(self, method, url, **kwargs):
+        async with self.semaphore:
+            return await self.client.request(method, url, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+
+# same text as requests.Response.raise_for_status, so callers can check errors the same way for both apis
+def http_error_message(response):
+    kind = "Client Error" if response.status_code < 500 else "Server Error"
+    error = f"{response.status_code} {kind}: {response.reason_phrase} for url: {response.url}"
+    try:
+        return error + " : " + response.content.decode('utf-8')
+    except UnicodeDecodeError:
+        return error
+
+
+# sends a request on the given session (or on a one-time session if None) and raises IastException on failure,
+# with the same RetryPolicy and error semantics as RequestApi
+async def send_request(method, url, params=None, headers=None, json_body=None, data=None, files=None, timeout=30,
+                       retries=0, token=None, session=None, retry_policy=None):
+    if session is None:
+        async with AsyncAsocSession() as session:
+            return await send_request(method, url, params, headers, json_body, data, files, timeout, retries, token,
+                                      session, retry_policy)
+    retry_policy = get_retry_policy(retries, retry_policy)
+    headers = dict(headers) if headers is not None else {}
+    token = token if token is not None else session.token
+    provider = token if isinstance(token, AsocTokenProvider) else None
+    if provider is not None:
+        # the provider may have to log in, which is a blocking call
+        token = await asyncio.to_thread(provider.get_token)
+    if token is not None:
+        headers["Authorization"] = "Bearer " + token
+    if params is None:
+        params = {}
+    print_url(url, params, method, json_body)
+    started = time.monotonic()
+    attempt = 0
+    event = start_request(method, url)
+    while True:
+        error = None
+        retryable = True
+        response = None
+        try:
+            response = await session.request(method, url, params=params, headers=headers, json=json_body, data=data,
+                                             files=files, timeout=timeout, follow_redirects=True)
+            if response.status_code == 401 and provider is not None:
+                # token was rejected - log in again once and resend
+                provider.invalidate(token)
+                token = await asyncio.to_thread(provider.get_token)
+                headers["Authorization"] = "Bearer " + token
+                provider = None
+                continue
+            if not response.is_error:
+                finish_request(event, response, attempt)
+                return response
+            error = http_error_message(response)
+            retryable = retry_policy.is_retryable_status(response.status_code)
+        except httpx.TimeoutException:
+            error = f"request to {url} timed out."
+        except httpx.UnsupportedProtocol as e:
+            error = f"request to {url} failed with connection error: {str(e)}"
+            retryable = False
+        except httpx.TransportError as e:
+            error = f"request to {url} failed with connection error: {str(e)}"
+        except httpx.TooManyRedirects:
+            error = "Too many redirects!"
+            retryable = False
+        delay = None
+        if retryable:
+            retry_after = response.headers.get("Retry-After") if response is not None else None
+            delay = retry_policy.next_delay(attempt, started, retry_after)
+        if delay is None:
+            finish_request(event, response, attempt, error=error)
+            raise IastException(error)
+        print(f"{error}. Retrying request in {delay:.1f} seconds.")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def get_request(url, params=None, headers=None, timeout=30, retries=0, token=None, session=None,
+                      retry_policy=None):
+    return await send_request('GET', url, params=params, headers=headers, timeout=timeout, retries=retries,
+                              token=token, session=session, retry_policy=retry_policy)
+
+
+async def post_request(url, params=None, headers=None, json_body=None, data=None, files=None, timeout=30, retries=0,
+                       token=None, session=None, retry_policy=None):
+    return await send_request('POST', url, params=params, headers=headers, json_body=json_body, data=data,
+                              files=files, timeout=timeout, retries=retries, token=token, session=session,
+                              retry_policy=retry_policy)
+
+
+async def put_request(url, params=None, headers=None, json_body=None, data=None, files=None, timeout=30, retries=0,
+                      token=None, session=None, retry_policy=None):
+    return await send_request('PUT', url, params=params, headers=headers, json_body=json_body, data=data,
+                              files=files, timeout=timeout, retries=retries, token=token, session=session,
+                              retry_policy=retry_policy)
+
+
+async def delete_request(url, params=None, headers=None, timeout=30, retries=0, token=None, session=None,
+                         retry_policy=None):
+    await send_request('DELETE', url, params=params, headers=headers, timeout=timeout, retries=retries, token=token,
+                       session=session, retry_policy=retry_policy)
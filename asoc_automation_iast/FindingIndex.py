@@ -0,0 +1,157 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# index of the findings (AsmHash) already seen for an application, to tell which findings of new scans / executions
+# are new, which were found before, and which are not found anymore:
+#     index = FindingIndex.load("app.findings")
+#     comparison = index.compare(chain(iter_issues_for_execution(execution_1, token, host),
+#                                      iter_issues_for_execution(execution_2, token, host)))
+#     print(comparison.new, comparison.fixed)
+#     index.update(comparison)
+#     index.save("app.findings")
+# the same finding has the same AsmHash in every scan and execution. the index is a set of the AsmHash strings, so
+# compare() groups the issues once and compares them with set operations - linear in the number of issues + indexed
+# findings. on disk it is the sorted AsmHash list, gzip compressed.
+
+import gzip
+import logging
+import os
+import threading
+
+from .IastUtils import IastException
+
+index_magic = "ASMH"
+index_version = 2
+
+
+# result of FindingIndex.compare
+#     new: {AsmHash: [issues]} findings that are not in the index
+#     recurring: {AsmHash: [issues]} findings that are in the index
+#     fixed: sorted list of the AsmHash of the indexed findings that none of the issues has
+#     skipped: number of issues without AsmHash
+class FindingComparison:
+    def __init__(self, new, recurring, fixed, skipped):
+        self.new = new
+        self.recurring = recurring
+        self.fixed = fixed
+        self.skipped = skipped
+
+    # the issues of a fixed finding among the given issues (e.g. the issues of the previous scans)
+    def fixed_issues(self, issues):
+        fixed = set(self.fixed)
+        return [issue for issue in issues if issue.get("AsmHash") in fixed]
+
+    def __repr__(self):
+        return f"FindingComparison(new={len(self.new)}, recurring={len(self.recurring)}, fixed={len(self.fixed)}, " \
+               f"skipped={self.skipped})"
+
+
+class FindingIndex:
+    #     asm_hashes: iterable of the AsmHash of the indexed findings
+    def __init__(self, asm_hashes=()):
+        self.asm_hashes = set(asm_hashes)
+        self.lock = threading.Lock()
+
+    # index of the findings of the given issues
+    @classmethod
+    def from_issues(cls, issues):
+        index = cls()
+        index.add(issues)
+        return index
+
+    # loads an index saved with save(), an empty index if the file does not exist
+    @classmethod
+    def load(cls, path):
+        path = os.path.expanduser(path)
+        if not os.path.isfile(path):
+            return cls()
+        try:
+            with gzip.open(path, "rt", encoding="utf-8", newline="\n") as index_file:
+                header = index_file.readline()
+                if header != f"{index_magic} {index_version}\n":
+                    raise IastException(f"{path} is not a finding index of version {index_version}")
+                return cls(line.rstrip("\n") for line in index_file)
+        except (OSError, EOFError, UnicodeDecodeError) as e:
+            raise IastException(f"failed to read finding index {path}: {str(e)}")
+
+    # writes the index (a header line + one AsmHash per line, sorted, gzip compressed) to path, replacing it
+    # atomically
+    def save(self, path):
+        path = os.path.expanduser(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self.lock:
+            asm_hashes = sorted(self.asm_hashes)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(temp_path, "wt", compresslevel=6, encoding="utf-8", newline="\n") as index_file:
+            index_file.write(f"{index_magic} {index_version}\n")
+            index_file.writelines(f"{asm_hash}\n" for asm_hash in asm_hashes)
+        os.replace(temp_path, path)
+
+    def __len__(self):
+        return len(self.asm_hashes)
+
+    def __contains__(self, asm_hash):
+        return asm_hash in self.asm_hashes
+
+    # compares the issues (an iterable of issue json dicts, read once - e.g. the issues of several scans and
+    # executions chained) with the indexed findings. returns a FindingComparison, the index is not changed
+    def compare(self, issues):
+        found, skipped = group_by_asm_hash(issues)
+        with self.lock:
+            fixed = sorted(self.asm_hashes.difference(found))
+            recurring_hashes = self.asm_hashes.intersection(found)
+        new = {}
+        recurring = {}
+        for asm_hash, finding_issues in found.items():
+            (recurring if asm_hash in recurring_hashes else new)[asm_hash] = finding_issues
+        return FindingComparison(new, recurring, fixed, skipped)
+
+    # adds the findings of the issues to the index. returns the number of findings that were not indexed
+    def add(self, issues):
+        return self.add_asm_hashes(issue["AsmHash"] for issue in issues if issue.get("AsmHash"))
+
+    # adds the new findings of a comparison, and with remove_fixed=True removes its fixed findings, so that the index
+    # holds the findings of the compared issues only. returns the number of findings in the index
+    def update(self, comparison, remove_fixed=False):
+        self.add_asm_hashes(comparison.new)
+        if remove_fixed and comparison.fixed:
+            with self.lock:
+                self.asm_hashes.difference_update(comparison.fixed)
+        return len(self.asm_hashes)
+
+    def add_asm_hashes(self, asm_hashes):
+        with self.lock:
+            count = len(self.asm_hashes)
+            self.asm_hashes.update(asm_hashes)
+            return len(self.asm_hashes) - count
+
+    def clear(self):
+        with self.lock:
+            self.asm_hashes = set()
+
+
+# {AsmHash: [issues]} of the issues, and the number of issues without AsmHash
+def group_by_asm_hash(issues):
+    found = {}
+    skipped = 0
+    for issue in issues:
+        asm_hash = issue.get("AsmHash")
+        if not asm_hash:
+            skipped += 1
+            continue
+        finding_issues = found.get(asm_hash)
+        if finding_issues is None:
+            found[asm_hash] = [issue]
+        else:
+            finding_issues.append(issue)
+    if skipped:
+        logging.warning(f"{skipped} issues without AsmHash were skipped")
+    return found, skipped
+
@@ -0,0 +1,240 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# an IAST execution that lives as long as a with block - started on enter, stopped on exit, even if the tests fail:
+#     with IastExecution(agent_key, host, session=session) as execution:
+#         run_tests()
+#     for issue in execution.iter_issues(token, host + "/api/v4"):
+#         print(issue["IssueTypeId"], issue["Path"])
+# or with asyncio:
+#     async with AsyncIastExecution(agent_key, host, session=async_session) as execution:
+#         await run_tests()
+#     async for issue in execution.iter_issues(token, host + "/api/v4"):
+#         ...
+# running executions are also stopped when the process gets SIGTERM / SIGINT / SIGHUP (unless the signal is ignored,
+# e.g. SIGHUP under nohup), and at interpreter exit, so a killed test run does not leave its execution running. test
+# shards that run in parallel each use their own scan (agent key) and execution.
+
+import atexit
+import logging
+import os
+import signal
+import threading
+
+from . import AsyncAsocUtils
+from .AsocUtils import start_new_execution, stop_execution
+from .AsocReportUtils import iter_issues_for_execution
+from .IastUtils import IastException
+from .ODataPaging import default_page_size
+
+default_stop_retries = 3
+# the signal handler sends a single stop request with a short timeout, the process is about to end
+signal_stop_timeout = 5
+stop_signals = tuple(getattr(signal, name) for name in ("SIGTERM", "SIGINT", "SIGHUP") if hasattr(signal, name))
+
+# running executions, stopped by the signal handlers and at exit. the locks are reentrant, since a signal handler
+# runs in the main thread, possibly while it holds them
+running_executions = set()
+running_lock = threading.RLock()
+# signal: handler that was installed before ours
+previous_handlers = {}
+exit_handler_registered = False
+
+
+# state shared by IastExecution and AsyncIastExecution
+class ExecutionState:
+    def __init__(self, agent_key, host, retries, stop_retries, stop_on_signals):
+        self.agent_key = agent_key
+        self.host = host
+        self.retries = retries
+        self.stop_retries = stop_retries
+        self.stop_on_signals = stop_on_signals
+        self.execution_id = None
+        self.stopped = False
+        self.lock = threading.RLock()
+
+    @property
+    def running(self):
+        return self.execution_id is not None and not self.stopped
+
+    def started(self, execution_id):
+        self.execution_id = execution_id
+        self.stopped = False
+        with running_lock:
+            running_executions.add(self)
+        if self.stop_on_signals:
+            install_stop_handlers()
+
+    # True for the first caller only, who has to stop the execution
+    def claim_stop(self):
+        with self.lock:
+            if not self.running:
+                return False
+            self.stopped = True
+        with running_lock:
+            running_executions.discard(self)
+        return True
+
+    # undoes claim_stop when the stop request failed, so that the exit and signal handlers try again
+    def release_stop(self):
+        with self.lock:
+            self.stopped = False
+        with running_lock:
+            running_executions.add(self)
+
+    # blocking stop, for the signal and exit handlers. retries: default stop_retries
+    def stop_now(self, retries=None, timeout=60):
+        if self.claim_stop():
+            try:
+                stop_execution(self.agent_key, self.host, retries=self.stop_retries if retries is None else retries,
+                               timeout=timeout)
+            except BaseException:
+                self.release_stop()
+                raise
+            logging.info(f"stopped execution {self.execution_id}")
+
+    def check_started(self):
+        if self.execution_id is None:
+            raise IastException("the execution was not started")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.execution_id}, running={self.running})"
+
+
+class IastExecution(ExecutionState):
+    #     agent_key: IAST agent key of the scan (see AsocUtils.get_new_iast_key_for_scan)
+    #     retries: retries of the start request, stop_retries: retries of the stop request
+    #     stop_on_signals: stop the execution when the process gets SIGTERM / SIGINT / SIGHUP (handlers can only be
+    #                      installed from the main thread) and at interpreter exit
+    def __init__(self, agent_key, host=None, retries=0, stop_retries=default_stop_retries, stop_on_signals=True,
+                 session=None):
+        super().__init__(agent_key, host, retries, stop_retries, stop_on_signals)
+        self.session = session
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.stop()
+        except IastException as e:
+            if exc_type is None:
+                raise
+            # keep the error of the with block
+            logging.error(f"failed stopping execution {self.execution_id}: {str(e)}")
+
+    # starts a new execution and returns its id
+    def start(self):
+        if self.running:
+            raise IastException(f"execution {self.execution_id} is already running")
+        self.started(start_new_execution(self.agent_key, self.host, retries=self.retries, session=self.session))
+        return self.execution_id
+
+    # stops the execution, if it is running
+    def stop(self):
+        if self.claim_stop():
+            try:
+                stop_execution(self.agent_key, self.host, retries=self.stop_retries, session=self.session)
+            except BaseException:
+                self.release_stop()
+                raise
+
+    # yields the issues of the execution page by page, see AsocReportUtils.iter_issues_for_execution.
+    # host is the api url (e.g. https://cloud.appscan.com/api/v4)
+    def iter_issues(self, token, host, page_size=default_page_size, prefetch=True, session=None):
+        self.check_started()
+        yield from iter_issues_for_execution(self.execution_id, token, host, page_size=page_size, prefetch=prefetch,
+                                             session=session if session is not None else self.session)
+
+
+# asyncio counterpart of IastExecution, with an AsyncAsocSession. the signal and exit handlers stop it with a blocking
+# request, since the event loop may not run anymore
+class AsyncIastExecution(ExecutionState):
+    def __init__(self, agent_key, host=None, retries=0, stop_retries=default_stop_retries, stop_on_signals=True,
+                 session=None):
+        super().__init__(agent_key, host, retries, stop_retries, stop_on_signals)
+        self.session = session
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        try:
+            await self.stop()
+        except IastException as e:
+            if exc_type is None:
+                raise
+            logging.error(f"failed stopping execution {self.execution_id}: {str(e)}")
+
+    async def start(self):
+        if self.running:
+            raise IastException(f"execution {self.execution_id} is already running")
+        self.started(await AsyncAsocUtils.start_new_execution(self.agent_key, self.host, retries=self.retries,
+                                                              session=self.session))
+        return self.execution_id
+
+    async def stop(self):
+        if self.claim_stop():
+            try:
+                await AsyncAsocUtils.stop_execution(self.agent_key, self.host, retries=self.stop_retries,
+                                                    session=self.session)
+            except BaseException:
+                self.release_stop()
+                raise
+
+    # async generator of the issues of the execution, see AsyncAsocUtils.iter_issues_for_execution
+    async def iter_issues(self, token, host, page_size=default_page_size, prefetch=True, session=None):
+        self.check_started()
+        async for issue in AsyncAsocUtils.iter_issues_for_execution(
+                self.execution_id, token, host, page_size=page_size, prefetch=prefetch,
+                session=session if session is not None else self.session):
+            yield issue
+
+
+# stops all the running executions with blocking requests (see ExecutionState.stop_now for retries and timeout).
+# returns the number of executions stopped
+def stop_running_executions(retries=None, timeout=60):
+    with running_lock:
+        executions = list(running_executions)
+    stopped = 0
+    for execution in executions:
+        try:
+            execution.stop_now(retries, timeout)
+            stopped += 1
+        except IastException as e:
+            logging.error(f"failed stopping execution {execution.execution_id}: {str(e)}")
+    return stopped
+
+
+def install_stop_handlers():
+    global exit_handler_registered
+    with running_lock:
+        if not exit_handler_registered:
+            atexit.register(stop_running_executions)
+            exit_handler_registered = True
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for signal_number in stop_signals:
+            # an ignored signal (e.g. SIGHUP under nohup) does not end the process, so it is left ignored
+            if signal_number not in previous_handlers and signal.getsignal(signal_number) != signal.SIG_IGN:
+                previous_handlers[signal_number] = signal.signal(signal_number, stop_on_signal)
+
+
+# signal handler: stops the running executions, then does what the previous handler would have done
+def stop_on_signal(signal_number, frame):
+    logging.warning(f"got signal {signal_number}, stopping the running executions")
+    stop_running_executions(retries=0, timeout=signal_stop_timeout)
+    previous = previous_handlers.get(signal_number, signal.SIG_DFL)
+    if callable(previous):
+        previous(signal_number, frame)
+    elif previous == signal.SIG_DFL:
+        signal.signal(signal_number, signal.SIG_DFL)
+        os.kill(os.getpid(), signal_number)
@@ -8,7 +8,6 @@
 #######################################################################################################################
 import json
 import os
-import subprocess
 import sys
 
 asoc_config_filename = "asoc-config.json"
@@ -31,12 +30,15 @@ def read_existing_user_config(path_to_existing_file):
     return json.loads(path_to_existing_file)
 
 
+# adds the asoc-config.json file of the current directory to the war, without the jdk "jar" tool
 def add_user_config_to_war(path_to_war):
-    command = f"jar -uvf \"{path_to_war}\" \"{asoc_config_filename}\""
-    result = subprocess.run(command, stderr=subprocess.PIPE, shell=True)
-    if result.returncode != 0:
-        print(f'Error - command [{command}] failed')
-        print(result.stderr)
+    from .AgentPackaging import add_config_to_war
+    try:
+        with open(asoc_config_filename, 'rb') as asoc_config_file:
+            add_config_to_war(path_to_war, asoc_config_file.read())
+    except (IastException, OSError) as e:
+        print(f'Error - adding {asoc_config_filename} to {path_to_war} failed')
+        print(str(e))
         sys.exit(1)
     print(f"Copied {asoc_config_filename} to {war_name}")
 
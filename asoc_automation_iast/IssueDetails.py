@@ -0,0 +1,190 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# bulk fetch of issue details (the xml of get_issue_details_from_asoc) for many issues:
+#     fetcher = IssueDetailsFetcher(token, host + "/api/v4", cache_dir="~/.asoc_automation_iast/details")
+#     result = fetcher.fetch_details(get_all_issues_for_scan(scan_id, token, host + "/api/v4")["Items"])
+#     print(result.details[issue_id])
+# the issues are fetched by a bounded pool of workers, with at most <rate> requests per second for all of them
+# (retries included), and 429 / 503 answers are retried after their Retry-After. details do not change for an issue
+# id + AsmHash, so they are kept gzip compressed in cache_dir and fetched only once.
+
+import gzip
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .IastUtils import IastException
+from .RequestApi import RetryPolicy, send_with_retries, bearer_auth
+
+default_issue_details_cache_dir = os.path.join(os.path.expanduser("~"), ".asoc_automation_iast", "details")
+default_details_workers = 8
+default_details_rate = 10.0
+default_details_retries = 5
+
+
+# token bucket shared by threads: acquire() waits until a request may be sent.
+#     rate: requests per second, None for no limit
+#     burst: requests that may be sent at once after an idle time
+class RateLimiter:
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate or 1.0)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate is None:
+            return
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+# gzip compressed issue details on disk, keyed by issue id + AsmHash
+class IssueDetailsCache:
+    def __init__(self, cache_dir=default_issue_details_cache_dir):
+        self.cache_dir = os.path.expanduser(cache_dir)
+
+    def path(self, issue_id, asm_hash=None):
+        digest = hashlib.sha256(f"{issue_id}|{asm_hash or ''}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + ".xml.gz")
+
+    # returns the cached details, None if they are not cached (or the file is corrupt)
+    def get(self, issue_id, asm_hash=None):
+        path = self.path(issue_id, asm_hash)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with gzip.open(path, "rb") as details_file:
+                return details_file.read().decode("utf-8")
+        except (OSError, EOFError, UnicodeDecodeError):
+            logging.warning(f"removing corrupt cached issue details {path}")
+            os.remove(path)
+            return None
+
+    def put(self, issue_id, asm_hash, details):
+        path = self.path(issue_id, asm_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(temp_path, "wb") as details_file:
+            details_file.write(details.encode("utf-8"))
+        os.replace(temp_path, path)
+
+
+class IssueDetailsResult:
+    def __init__(self, details, errors, cached, fetched, elapsed):
+        self.details = details
+        self.errors = errors
+        self.cached = cached
+        self.fetched = fetched
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return f"IssueDetailsResult(details={len(self.details)}, errors={len(self.errors)}, cached={self.cached}, " \
+               f"fetched={self.fetched}, elapsed={self.elapsed:.1f}s)"
+
+
+class IssueDetailsFetcher:
+    #     host: api url, as for the AsocReportUtils functions (e.g. https://cloud.appscan.com/api/v4)
+    #     cache_dir: directory of the details cache, None to always fetch
+    #     workers: max requests in flight
+    #     rate: max requests per second of all workers (None for no limit), burst: see RateLimiter
+    #     retries: retries of every request, after the server's Retry-After or an exponential backoff
+    def __init__(self, token, host, cache_dir=default_issue_details_cache_dir, workers=default_details_workers,
+                 rate=default_details_rate, burst=None, retries=default_details_retries, timeout=60, session=None):
+        self.token = token
+        self.host = host
+        self.cache = IssueDetailsCache(cache_dir) if cache_dir is not None else None
+        self.workers = workers
+        self.rate_limiter = RateLimiter(rate, burst)
+        self.retry_policy = RetryPolicy(max_retries=retries)
+        self.timeout = timeout
+        self.session = session
+
+    # fetches the xml details of one issue, without the cache
+    def get_details(self, issue_id):
+        url = self.host + "/Issues/" + issue_id + "/Details"
+        logging.debug(f"GET {url}")
+        response = send_with_retries("GET", url, self.retry_policy, self.session,
+                                     prepare=lambda kwargs: self.rate_limiter.acquire(),
+                                     headers={"Accept": "text/xml"}, auth=bearer_auth(self.token),
+                                     timeout=self.timeout, stream=False)
+        return response.content.decode("utf-8")
+
+    # yields (issue_id, details, error, cached) for every issue as soon as it is fetched, cached issues first. issues
+    # are issue json dicts (with Id and AsmHash, e.g. from get_all_issues_for_scan) or issue ids. error is None, or
+    # the error text with details None
+    def iter_details(self, issues):
+        keys = {}
+        for issue in issues:
+            issue_id, asm_hash = (issue["Id"], issue.get("AsmHash")) if isinstance(issue, dict) else (issue, None)
+            keys[issue_id] = asm_hash
+        missing = []
+        for issue_id, asm_hash in keys.items():
+            details = self.cache.get(issue_id, asm_hash) if self.cache is not None else None
+            if details is not None:
+                yield issue_id, details, None, True
+            else:
+                missing.append(issue_id)
+        if not missing:
+            return
+
+        def fetch(issue_id):
+            details = self.get_details(issue_id)
+            if self.cache is not None:
+                self.cache.put(issue_id, keys[issue_id], details)
+            return details
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(fetch, issue_id): issue_id for issue_id in missing}
+            try:
+                for future in as_completed(futures):
+                    # an unexpected error of one issue (e.g. a UnicodeDecodeError) is reported like the others,
+                    # the rest are still fetched
+                    try:
+                        details, error = future.result(), None
+                    except (IastException, OSError) as e:
+                        details, error = None, str(e)
+                    except Exception as e:
+                        details, error = None, f"{type(e).__name__}: {str(e)}"
+                    yield futures[future], details, error, False
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    # fetches the details of all the issues, see iter_details. returns an IssueDetailsResult with details
+    # {issue_id: xml} and errors {issue_id: error text}
+    def fetch_details(self, issues, progress=None):
+        started = time.monotonic()
+        details = {}
+        errors = {}
+        cached = 0
+        for issue_id, issue_details, error, from_cache in self.iter_details(issues):
+            cached += from_cache
+            if error is not None:
+                errors[issue_id] = error
+                logging.error(f"failed fetching details of issue {issue_id}: {error}")
+            else:
+                details[issue_id] = issue_details
+            if progress is not None:
+                progress(issue_id, len(details) + len(errors))
+        return IssueDetailsResult(details, errors, cached, len(details) + len(errors) - cached,
+                                  time.monotonic() - started)
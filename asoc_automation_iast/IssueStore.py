@@ -0,0 +1,196 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# local SQLite store of issues, to slice and count them without fetching them again from ASoC:
+#     with IssueStore("issues.db") as store:
+#         store.ingest_scan(scan_id, token, host + "/api/v4")
+#         print(store.count_by("IssueTypeId", scan_id=scan_id))
+#         print(store.find_duplicates())
+# the issues of every scan / execution are written in one transaction, page by page while they are fetched, so a
+# scan is either stored completely or not changed. the $select fields of the AsocReportUtils issue functions are
+# columns, indexed for the filters and group by counts, and the whole issue json is kept as well.
+
+import json
+import sqlite3
+import threading
+
+from .AsocReportUtils import iter_issues_for_scan, iter_issues_for_execution
+from .IastUtils import IastException
+from .ODataPaging import default_page_size
+
+# issue fields stored in their own indexed columns
+indexed_fields = ("IssueTypeId", "Path", "Api", "SourceFile", "AsmHash")
+# other issue fields stored in columns
+column_fields = ("Id", "ScanName", "ApplicationId", "Status", "Severity")
+insert_batch_size = 1000
+issue_scopes = ("Scan", "ScanExecution")
+
+schema = [
+    "CREATE TABLE IF NOT EXISTS issues (scope TEXT NOT NULL, owner_id TEXT NOT NULL, "
+    + ", ".join(f"{field} TEXT" for field in column_fields + indexed_fields)
+    + ", data TEXT NOT NULL, PRIMARY KEY (scope, owner_id, Id))",
+] + [f"CREATE INDEX IF NOT EXISTS issues_{field} ON issues ({field}, scope, owner_id)" for field in indexed_fields]
+
+
+class IssueStore:
+    #     path: database file, ":memory:" for a store that lives as long as the object
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        for statement in schema:
+            self.connection.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    # fetches all the issues of a scan page by page and stores them in place of the scan's previous issues.
+    # host is the api url, as for the AsocReportUtils functions. returns the number of issues
+    def ingest_scan(self, scan_id, token, host, page_size=default_page_size, session=None):
+        issues = iter_issues_for_scan(scan_id, token, host, page_size=page_size, prefetch=True, session=session)
+        return self.add_issues("Scan", scan_id, issues)
+
+    def ingest_execution(self, execution_id, token, host, page_size=default_page_size, session=None):
+        issues = iter_issues_for_execution(execution_id, token, host, page_size=page_size, prefetch=True,
+                                           session=session)
+        return self.add_issues("ScanExecution", execution_id, issues)
+
+    # stores issues (an iterable of issue json dicts, read once) of a scan or execution in one transaction, with
+    # batched inserts. replace=True deletes the previous issues of the owner first. returns the number of issues
+    def add_issues(self, scope, owner_id, issues, replace=True):
+        check_scope(scope)
+        fields = column_fields + indexed_fields
+        statement = f"INSERT OR REPLACE INTO issues (scope, owner_id, {', '.join(fields)}, data) " \
+                    f"VALUES (?, ?, {', '.join('?' for _ in fields)}, ?)"
+        count = 0
+        with self.lock:
+            cursor = self.connection.cursor()
+            cursor.execute("BEGIN")
+            try:
+                if replace:
+                    cursor.execute("DELETE FROM issues WHERE scope = ? AND owner_id = ?", (scope, owner_id))
+                batch = []
+                for issue in issues:
+                    batch.append((scope, owner_id) + tuple(column_value(issue.get(field)) for field in fields) +
+                                 (json.dumps(issue),))
+                    if len(batch) >= insert_batch_size:
+                        cursor.executemany(statement, batch)
+                        count += len(batch)
+                        batch = []
+                if batch:
+                    cursor.executemany(statement, batch)
+                    count += len(batch)
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+        return count
+
+    def remove_owner(self, scope, owner_id):
+        with self.lock:
+            self.connection.execute("DELETE FROM issues WHERE scope = ? AND owner_id = ?", (scope, owner_id))
+
+    # [(scope, owner_id, number of issues)] of the stored scans and executions
+    def owners(self):
+        return self.execute("SELECT scope, owner_id, COUNT(*) FROM issues GROUP BY scope, owner_id "
+                            "ORDER BY scope, owner_id")
+
+    # returns the issue dicts that match all the given field values, e.g. find(IssueTypeId="SqlInjection",
+    # scan_id=scan_id). scan_id / execution_id limit the search to one scan / execution
+    def find(self, scan_id=None, execution_id=None, limit=None, **values):
+        where, parameters = self.where(scan_id, execution_id, values)
+        sql = f"SELECT data FROM issues{where}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        return [json.loads(row[0]) for row in self.execute(sql, parameters)]
+
+    # [(value, number of issues)] of an indexed field, most issues first
+    def count_by(self, field, scan_id=None, execution_id=None, **values):
+        check_field(field)
+        where, parameters = self.where(scan_id, execution_id, values)
+        return self.execute(f"SELECT {field}, COUNT(*) AS issues FROM issues{where} GROUP BY {field} "
+                            f"ORDER BY issues DESC, {field}", parameters)
+
+    # findings (AsmHash) that are in more than one scan / execution: [(AsmHash, number of scans and executions,
+    # [(scope, owner_id), ...])], most widespread first
+    def find_duplicates(self, min_owners=2, scope=None):
+        where = ""
+        parameters = []
+        if scope is not None:
+            check_scope(scope)
+            where = " AND scope = ?"
+            parameters.append(scope)
+        # one pass over the AsmHash index, which holds scope and owner_id as well
+        rows = self.execute(f"SELECT AsmHash, scope, owner_id FROM issues WHERE AsmHash IS NOT NULL{where} "
+                            f"GROUP BY AsmHash, scope, owner_id", parameters)
+        owners = {}
+        for asm_hash, owner_scope, owner_id in rows:
+            owners.setdefault(asm_hash, []).append((owner_scope, owner_id))
+        duplicates = [(asm_hash, len(found_in), found_in) for asm_hash, found_in in owners.items()
+                      if len(found_in) >= min_owners]
+        return sorted(duplicates, key=lambda duplicate: (-duplicate[1], duplicate[0]))
+
+    # the distinct findings (AsmHash) of the given scans / executions, with the number of issues of each
+    def unique_findings(self, scan_ids=(), execution_ids=()):
+        owners = [("Scan", scan_id) for scan_id in scan_ids] + [("ScanExecution", execution_id)
+                                                                 for execution_id in execution_ids]
+        if not owners:
+            return self.execute("SELECT AsmHash, COUNT(*) FROM issues WHERE AsmHash IS NOT NULL GROUP BY AsmHash "
+                                "ORDER BY AsmHash")
+        condition = " OR ".join("(scope = ? AND owner_id = ?)" for _ in owners)
+        parameters = [value for owner in owners for value in owner]
+        return self.execute(f"SELECT AsmHash, COUNT(*) FROM issues WHERE AsmHash IS NOT NULL AND ({condition}) "
+                            f"GROUP BY AsmHash ORDER BY AsmHash", parameters)
+
+    def where(self, scan_id, execution_id, values):
+        conditions = []
+        parameters = []
+        if scan_id is not None:
+            conditions.append("scope = 'Scan' AND owner_id = ?")
+            parameters.append(scan_id)
+        if execution_id is not None:
+            conditions.append("scope = 'ScanExecution' AND owner_id = ?")
+            parameters.append(execution_id)
+        for field, value in values.items():
+            check_field(field)
+            conditions.append(f"{field} = ?")
+            parameters.append(column_value(value))
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), parameters
+
+    def execute(self, sql, parameters=()):
+        with self.lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+
+def check_scope(scope):
+    if scope not in issue_scopes:
+        raise IastException(f"unknown issue scope {scope}, expected one of {', '.join(issue_scopes)}")
+
+
+def check_field(field):
+    if field not in indexed_fields + column_fields:
+        raise IastException(f"unknown issue field {field}, expected one of "
+                            f"{', '.join(indexed_fields + column_fields)}")
+
+
+def column_value(value):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value)
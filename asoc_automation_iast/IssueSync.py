@@ -0,0 +1,230 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# incremental sync of the issues of a scan or a scan execution: returns only what changed since the last sync.
+#     issue_sync = IssueSync(token, host + "/api/v4", "~/.asoc_automation_iast/issues")
+#     result = issue_sync.sync_scan(scan_id)
+#     print(result.added, result.changed, result.removed)
+# the issues of every scan / execution are kept in a local snapshot file. a sync fetches only the issues updated
+# since the newest LastUpdated of the snapshot ($filter=LastUpdated ge ...), then asks the server for the number of
+# issues - the ids of all issues (and nothing else) are fetched only when that number shows that issues were removed.
+# the first sync, and a sync against a server that does not support the filter, fetch all the issues.
+
+import calendar
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from .IastUtils import IastException
+from .ODataPaging import get_page, get_all_items, default_page_size
+from .RequestApi import HttpStatusException
+
+default_issue_sync_dir = os.path.join(os.path.expanduser("~"), ".asoc_automation_iast", "issues")
+last_updated_field = "LastUpdated"
+snapshot_version = 1
+unsafe_filename_pattern = re.compile(r"[^\w.-]")
+
+# url path and $select of the issues of every scope
+issue_scopes = {
+    "Scan": ("/Issues/Scan/", "AsmHash,IssueTypeId,Id,Path,ScanName,ApplicationId,Api,SourceFile,Status,Severity,"
+                              + last_updated_field),
+    "ScanExecution": ("/Issues/ScanExecution/", "AsmHash,IssueTypeId,Id,Path,Api,Status,Severity,"
+                                                + last_updated_field),
+}
+
+
+# what changed since the previous sync. added and changed hold the issues as returned by the server, removed holds
+# the issues of the previous snapshot. an issue that was removed and added again with a new Id but the same AsmHash
+# is reported as changed.
+#     full: all the issues were fetched (first sync, or no server side filter)
+#     fetched: number of issues downloaded by this sync (not counting the ids fetched to find removed issues)
+class IssueSyncResult:
+    def __init__(self, scope, owner_id, added, removed, changed, total, full, fetched, elapsed):
+        self.scope = scope
+        self.owner_id = owner_id
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.total = total
+        self.full = full
+        self.fetched = fetched
+        self.elapsed = elapsed
+
+    @property
+    def has_changes(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"IssueSyncResult({self.scope} {self.owner_id}: added={len(self.added)}, " \
+               f"removed={len(self.removed)}, changed={len(self.changed)}, total={self.total}, full={self.full}, " \
+               f"fetched={self.fetched})"
+
+
+class IssueSync:
+    #     host: api url, as for the AsocReportUtils functions (e.g. https://cloud.appscan.com/api/v4)
+    #     sync_dir: directory of the snapshot files
+    #     overlap: seconds before the newest LastUpdated of the snapshot that are fetched again, for issues updated
+    #              at the same time as the previous sync
+    #     workers: parallel page requests of a full fetch, see ODataPaging.get_all_items
+    def __init__(self, token, host, sync_dir=default_issue_sync_dir, page_size=default_page_size, workers=8,
+                 overlap=60, session=None):
+        self.token = token
+        self.host = host
+        self.sync_dir = os.path.expanduser(sync_dir)
+        self.page_size = page_size
+        self.workers = workers
+        self.overlap = overlap
+        self.session = session
+        self.lock = threading.Lock()
+        self.owner_locks = {}
+
+    def sync_scan(self, scan_id):
+        return self.sync("Scan", scan_id)
+
+    def sync_execution(self, execution_id):
+        return self.sync("ScanExecution", execution_id)
+
+    # syncs the issues of a scan (scope Scan) or an execution (scope ScanExecution) and saves the new snapshot.
+    # returns an IssueSyncResult
+    def sync(self, scope, owner_id):
+        if scope not in issue_scopes:
+            raise IastException(f"unknown issue scope {scope}, expected one of {', '.join(issue_scopes)}")
+        with self.owner_lock(scope, owner_id):
+            started = time.monotonic()
+            path, select = issue_scopes[scope]
+            url = self.host + path + owner_id
+            snapshot = self.load_snapshot(scope, owner_id)
+            previous = snapshot["issues"] if snapshot is not None else {}
+            since = newest_update(previous.values())
+
+            updated = None
+            if snapshot is not None and since is not None:
+                try:
+                    updated = self.fetch(url, select,
+                                         f"{last_updated_field} ge {shift_timestamp(since, -self.overlap)}")
+                except IastException as e:
+                    if not isinstance(e, HttpStatusException) or e.status_code != 400:
+                        raise
+                    logging.warning(f"{last_updated_field} filter not supported for {scope} {owner_id}, fetching all "
+                                    f"the issues: {str(e)}")
+            full = updated is None
+            if full:
+                updated = self.fetch(url, select)
+
+            issues = dict(previous)
+            added = []
+            changed = []
+            for issue in updated:
+                old = issues.get(issue["Id"])
+                if old is None:
+                    added.append(issue)
+                elif old != issue:
+                    changed.append(issue)
+                issues[issue["Id"]] = issue
+
+            if full:
+                current_ids = {issue["Id"] for issue in updated}
+            else:
+                # server count = previous + added - removed, so the ids are only needed when something was removed
+                count_page = get_page(url, {"$select": "Id", "$count": "true"}, None, self.token, 0, 1,
+                                      session=self.session)
+                total = count_page.get("Count")
+                if total is not None and total == len(issues):
+                    current_ids = issues.keys()
+                else:
+                    current_ids = {issue["Id"] for issue in self.fetch(url, "Id")}
+            removed = [issue for issue_id, issue in issues.items() if issue_id not in current_ids]
+            for issue in removed:
+                del issues[issue["Id"]]
+            # only the previous issues count as removed, not the ones added and removed between two syncs
+            removed = [issue for issue in removed if issue["Id"] in previous]
+            added, removed, changed = match_by_asm_hash(added, removed, changed)
+
+            if snapshot is None or issues != previous:
+                self.save_snapshot(scope, owner_id, issues)
+            return IssueSyncResult(scope, owner_id, added, removed, changed, len(issues), full, len(updated),
+                                   time.monotonic() - started)
+
+    # fetches all the issues of url with the given $select and optional $filter
+    def fetch(self, url, select, odata_filter=None):
+        params = {"$select": select}
+        if odata_filter is not None:
+            params["$filter"] = odata_filter
+        return get_all_items(url, params=params, token=self.token, page_size=self.page_size, workers=self.workers,
+                             session=self.session)["Items"]
+
+    def owner_lock(self, scope, owner_id):
+        with self.lock:
+            return self.owner_locks.setdefault((scope, owner_id), threading.Lock())
+
+    def snapshot_path(self, scope, owner_id):
+        return os.path.join(self.sync_dir, f"{scope}_{unsafe_filename_pattern.sub('_', owner_id)}.json")
+
+    # returns {"scope", "id", "synced", "issues": {Id: issue}} or None if there is no (readable) snapshot
+    def load_snapshot(self, scope, owner_id):
+        path = self.snapshot_path(scope, owner_id)
+        if not os.path.isfile(path):
+            return None
+        try:
+            with open(path) as snapshot_file:
+                snapshot = json.load(snapshot_file)
+        except (OSError, ValueError):
+            logging.warning(f"ignoring unreadable issue snapshot {path}")
+            return None
+        if snapshot.get("version") != snapshot_version:
+            return None
+        return snapshot
+
+    def save_snapshot(self, scope, owner_id, issues):
+        os.makedirs(self.sync_dir, exist_ok=True)
+        path = self.snapshot_path(scope, owner_id)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        snapshot = {"version": snapshot_version, "scope": scope, "id": owner_id, "synced": time.time(),
+                    "issues": issues}
+        with open(temp_path, "w") as snapshot_file:
+            # json.dumps uses the c encoder, json.dump to a file does not
+            snapshot_file.write(json.dumps(snapshot, separators=(",", ":")))
+        os.replace(temp_path, path)
+
+    # deletes the snapshot, the next sync fetches all the issues
+    def reset(self, scope, owner_id):
+        path = self.snapshot_path(scope, owner_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# newest LastUpdated of the issues, None if they have none
+def newest_update(issues):
+    updates = [issue[last_updated_field] for issue in issues if issue.get(last_updated_field)]
+    return max(updates) if updates else None
+
+
+# adds seconds to an ISO 8601 timestamp (2026-01-01T10:00:00.123Z) and returns it in the same format
+def shift_timestamp(timestamp, seconds):
+    match = re.match(r"^(\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})(\.\d+)?(Z|[+-]\d{2}:?\d{2})?$", timestamp)
+    if match is None:
+        return timestamp
+    base = time.strptime(match.group(1), "%Y-%m-%dT%H:%M:%S")
+    shifted = time.gmtime(calendar.timegm(base) + seconds)
+    return time.strftime("%Y-%m-%dT%H:%M:%S", shifted) + (match.group(2) or "") + (match.group(3) or "")
+
+
+# an issue removed and added with the same AsmHash is the same finding with a new Id: reported as changed
+def match_by_asm_hash(added, removed, changed):
+    removed_hashes = {issue.get("AsmHash") for issue in removed if issue.get("AsmHash")}
+    recreated = [issue for issue in added if issue.get("AsmHash") in removed_hashes]
+    if not recreated:
+        return added, removed, changed
+    recreated_hashes = {issue["AsmHash"] for issue in recreated}
+    added = [issue for issue in added if issue.get("AsmHash") not in recreated_hashes]
+    removed = [issue for issue in removed if issue.get("AsmHash") not in recreated_hashes]
+    return added, removed, changed + recreated
@@ -0,0 +1,146 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# opt-in in-memory cache for app / scan / asset group lookups (get_app_id_by_name, get_scan_info_by_id, ...).
+# disabled by default - enable_metadata_cache() turns it on for all the decorated AsocUtils lookups.
+# create_app, delete_app, create_scan and delete_scan invalidate the cached entries they may change.
+
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+default_cache_size = 1024
+default_cache_ttl = 5 * 60
+
+# the cache used by the decorated lookups, None when caching is disabled
+metadata_cache = None
+
+
+# bounded key/value cache with a time to live per entry and least recently used eviction
+class MetadataCache:
+    def __init__(self, max_size=default_cache_size, ttl=default_cache_ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    # returns (True, value) for a live entry, (False, None) otherwise
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if time.monotonic() < expires_at:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self.entries[key]
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    # drops all entries of the given namespace ("Apps", "Scans", ...) of a host (None: the default host), or of all
+    # hosts with all_hosts=True
+    def invalidate(self, namespace, host=None, all_hosts=False):
+        host = normalize_host(host)
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == namespace and (all_hosts or key[1] == host)]:
+                del self.entries[key]
+                self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / lookups if lookups else 0.0,
+                    "evictions": self.evictions, "invalidations": self.invalidations, "size": len(self.entries)}
+
+
+def enable_metadata_cache(max_size=default_cache_size, ttl=default_cache_ttl):
+    global metadata_cache
+    metadata_cache = MetadataCache(max_size=max_size, ttl=ttl)
+    return metadata_cache
+
+
+def disable_metadata_cache():
+    global metadata_cache
+    metadata_cache = None
+
+
+def get_metadata_cache():
+    return metadata_cache
+
+
+# called after an api call that changes the cached data of a namespace
+def invalidate_metadata(namespace, host=None):
+    if metadata_cache is not None:
+        metadata_cache.invalidate(namespace, host)
+
+
+# the host of the cache keys: the netloc of the ASoC url, so that host=None and the default host url (or the same host
+# with another path, e.g. .../api/v4) share their entries
+def normalize_host(host):
+    # imported here, AsocUtils imports this module
+    from .AsocUtils import get_host
+    return urlparse(get_host(host)).netloc
+
+
+# entries are kept per tenant: the api key id of a token provider, or the token itself
+def cache_identity(token, session=None):
+    if token is None and session is not None:
+        token = session.session.auth
+    if hasattr(token, "key_id"):
+        return token.key_id
+    if hasattr(token, "token"):
+        return token.token
+    return token
+
+
+# decorator for lookup functions with token / host / session arguments. results are cached by namespace, host,
+# tenant, function name and the other arguments while metadata caching is enabled; errors are never cached
+def cached_lookup(namespace):
+    def decorator(function):
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            cache = metadata_cache
+            if cache is None:
+                return function(*args, **kwargs)
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            arguments = dict(arguments.arguments)
+            identity = cache_identity(arguments.pop("token", None), arguments.pop("session", None))
+            host = normalize_host(arguments.pop("host", None))
+            key = (namespace, host, identity, function.__name__, tuple(sorted(arguments.items())))
+            found, value = cache.get(key)
+            if found:
+                return value
+            value = function(*args, **kwargs)
+            cache.put(key, value)
+            return value
+        return wrapper
+    return decorator
@@ -0,0 +1,143 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# paging over ASoC OData list endpoints (Apps, Scans, Issues...).
+# ASoC returns a single page per request - {"Items": [...], "Count": <total>, "NextPageLink": <url>} - so list
+# functions that send one request silently return only the first page for big tenants.
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from .RequestApi import get_request, bearer_auth
+
+default_page_size = 500
+
+# names of the continuation link in the response json, if the server sends one
+next_page_link_keys = ("NextPageLink", "@odata.nextLink")
+
+
+# fetches one page. link is a continuation url from the previous page, used instead of url + $skip/$top
+def get_page(url, params, headers, token, skip, top, link=None, timeout=30, retries=0, session=None):
+    if link is not None:
+        response = get_request(link, headers=headers, timeout=timeout, retries=retries, auth=bearer_auth(token),
+                               session=session)
+    else:
+        page_params = dict(params)
+        page_params.update({"$skip": skip, "$top": top})
+        response = get_request(url, params=page_params, headers=headers, timeout=timeout, retries=retries,
+                               auth=bearer_auth(token), session=session)
+    return json.loads(response.text)
+
+
+def get_next_page_link(page):
+    for key in next_page_link_keys:
+        if page.get(key):
+            return page[key]
+    return None
+
+
+# yields the pages of an OData list, one request at a time, until the server has no more items.
+# pages are requested with $skip/$top, or with the server's continuation link when it sends one.
+#     page_size: $top of every request
+#     prefetch: request the next page in a background thread while the caller processes the current one
+# only the current page (and the prefetched one) are held in memory
+def iter_pages(url, params=None, headers=None, token=None, page_size=default_page_size, prefetch=False, timeout=30,
+               retries=0, session=None):
+    params = dict(params) if params is not None else {}
+    headers = headers if headers is not None else {"Accept": "application/json"}
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+
+    def fetch(skip, link, with_count):
+        page_params = dict(params)
+        if with_count:
+            page_params["$count"] = "true"
+        else:
+            page_params.pop("$count", None)
+        return get_page(url, page_params, headers, token, skip, page_size, link=link, timeout=timeout,
+                        retries=retries, session=session)
+
+    try:
+        skip = 0
+        total = None
+        page = fetch(skip, None, True)
+        while True:
+            items = page.get("Items") or []
+            if total is None:
+                total = page.get("Count")
+            skip += len(items)
+            link = get_next_page_link(page)
+            if link is not None:
+                has_more = len(items) > 0
+            elif total is not None:
+                has_more = len(items) > 0 and skip < total
+            else:
+                has_more = len(items) >= page_size
+            next_page = None
+            if has_more and executor is not None:
+                next_page = executor.submit(fetch, skip, link, False)
+            yield page
+            if not has_more:
+                return
+            page = next_page.result() if next_page is not None else fetch(skip, link, False)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# yields the items of all pages of an OData list, see iter_pages
+def iter_items(url, params=None, headers=None, token=None, page_size=default_page_size, prefetch=False, timeout=30,
+               retries=0, session=None):
+    for page in iter_pages(url, params=params, headers=headers, token=token, page_size=page_size, prefetch=prefetch,
+                           timeout=timeout, retries=retries, session=session):
+        yield from page.get("Items") or []
+
+
+# fetches all items of an OData list with parallel requests.
+# the first page is requested with $count=true; once the total is known, the remaining $skip windows are fetched by
+# <workers> threads and merged in order. returns {"Count": <total>, "Items": [...]}
+# if the server caps the page size below page_size, the windows follow the size of the first page.
+def get_all_items(url, params=None, headers=None, token=None, page_size=default_page_size, workers=8, timeout=30,
+                  retries=0, session=None):
+    params = dict(params) if params is not None else {}
+    headers = headers if headers is not None else {"Accept": "application/json"}
+    first_params = dict(params)
+    first_params["$count"] = "true"
+    first_page = get_page(url, first_params, headers, token, 0, page_size, timeout=timeout, retries=retries,
+                          session=session)
+    items = list(first_page.get("Items") or [])
+    total = first_page.get("Count")
+    if total is None or len(items) == 0 or len(items) >= total:
+        # no count - fall back to serial paging from where the first page ended
+        if total is None and len(items) >= page_size:
+            items.extend(iter_remaining_items(url, params, headers, token, len(items), page_size, timeout, retries,
+                                              session))
+        return {"Count": total if total is not None else len(items), "Items": items}
+
+    params.pop("$count", None)
+    window = len(items)
+    skips = range(window, total, window)
+
+    def fetch(skip):
+        page = get_page(url, params, headers, token, skip, window, timeout=timeout, retries=retries, session=session)
+        return page.get("Items") or []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for page_items in executor.map(fetch, skips):
+            items.extend(page_items)
+    return {"Count": total, "Items": items}
+
+
+def iter_remaining_items(url, params, headers, token, skip, page_size, timeout, retries, session):
+    while True:
+        page_items = get_page(url, params, headers, token, skip, page_size, timeout=timeout, retries=retries,
+                              session=session).get("Items") or []
+        yield from page_items
+        if len(page_items) < page_size:
+            return
+        skip += len(page_items)
@@ -0,0 +1,413 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# IAST agent provisioning: resolve (or create) the app and scan of an agent, and package the agent zip with its key.
+# used by ConfigureIastAgent.py for a single agent and by ConfigureIastAgentBatch.py for a manifest of agents:
+#     items = read_manifest("agents.csv")
+#     provision_agents(items, token, "agents", host, workers=8)
+#     print(format_provisioning_summary(items))
+
+import csv
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from .AgentCache import AgentCache
+from .AgentPackaging import package_agent, asoc_config_json, get_agent_layout
+from .AsocUtils import get_scan_info_by_id, get_scan_info_by_name, get_app_name_by_id, get_app_id_by_name, \
+    get_default_asset_group, create_app, create_scan, delete_app, delete_scan, get_new_iast_key_for_scan, \
+    download_agent_iast_api
+from .IastUtils import IastException
+
+default_provisioning_workers = 8
+default_lookup_workers = 8
+manifest_fields = ("app_id", "app_name", "scan_id", "scan_name", "asset_group", "output", "agent_type")
+default_agent_type = "Java"
+
+
+# one agent to provision. app_id / app_name / scan_id / scan_name / asset_group / agent_type have the same meaning as
+# the ConfigureIastAgent.py options. after provisioning they hold the resolved values, with agent_key, the created
+# flags, error (None on success) and timings (seconds per stage)
+class ProvisioningItem:
+    def __init__(self, app_id=None, app_name=None, scan_id=None, scan_name=None, asset_group=None, output=None,
+                 agent_type=None):
+        self.app_id = app_id or None
+        self.app_name = app_name or None
+        self.scan_id = scan_id or None
+        self.scan_name = scan_name or None
+        self.asset_group = asset_group or None
+        self.output = output or None
+        self.agent_type = agent_type or default_agent_type
+        self.agent_key = None
+        self.app_created = False
+        self.scan_created = False
+        self.error = None
+        self.timings = {}
+
+    @property
+    def succeeded(self):
+        return self.error is None and self.agent_key is not None
+
+    @property
+    def label(self):
+        return self.scan_name or self.scan_id or self.app_name or self.app_id or "<generated>"
+
+    def __repr__(self):
+        return f"ProvisioningItem(app_id={self.app_id!r}, app_name={self.app_name!r}, scan_id={self.scan_id!r}, " \
+               f"scan_name={self.scan_name!r}, error={self.error!r})"
+
+
+# resolves and creates apps and scans for provisioning items. safe to use from several threads: the default asset
+# group is fetched once, and items that create the same new app wait for each other, so the app is created once.
+# the lookups of an item that do not depend on each other are sent at the same time on lookup_workers threads, see
+# resolve. close() (or a with block) waits for the lookups still running
+class Provisioner:
+    def __init__(self, token, host=None, session=None, lookup_workers=default_lookup_workers):
+        self.token = token
+        self.host = host
+        self.session = session
+        self.lock = threading.Lock()
+        self.default_asset_group = None
+        self.app_locks = {}
+        # apps created by this provisioner by name, for items waiting on the app lock
+        self.created_apps = {}
+        # app id: items with a scan in an app created by this provisioner - the app is deleted with the last of them
+        self.app_users = {}
+        self.executor = ThreadPoolExecutor(max_workers=lookup_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+    def submit(self, function, *args, **kwargs):
+        return self.executor.submit(function, *args, **kwargs)
+
+    # starts fetching the default asset group if it is not fetched yet, and returns its future
+    def prefetch_default_asset_group(self):
+        with self.lock:
+            if self.default_asset_group is None:
+                self.default_asset_group = self.submit(get_default_asset_group, self.token, self.host,
+                                                       session=self.session)
+            return self.default_asset_group
+
+    def get_default_asset_group(self):
+        future = self.prefetch_default_asset_group()
+        try:
+            return future.result()
+        except IastException:
+            # errors are not kept, the next item fetches it again
+            with self.lock:
+                if self.default_asset_group is future:
+                    self.default_asset_group = None
+            raise
+
+    def app_lock(self, app_name):
+        with self.lock:
+            return self.app_locks.setdefault(app_name, threading.Lock())
+
+    # figures out which app and scan the item refers to, creates the missing ones and gets the agent key.
+    # raises IastException if the given values do not match each other. what was created before an error is marked
+    # in app_created / scan_created, see cleanup.
+    # all the lookups that may be needed are sent at once, before any result is checked: the scan, the app (unless
+    # the scan id is given - the scan holds its app) and the default asset group when an app may be created. nothing
+    # is created or changed before the checks passed, a lookup that turns out not to be needed is only a wasted request
+    def resolve(self, item, current_time=None):
+        started = time.monotonic()
+        get_agent_layout(item.agent_type)
+        current_time = current_time if current_time is not None else datetime.now().time().strftime('%H-%M-%S')
+        token, host, session = self.token, self.host, self.session
+
+        scan_lookup = None
+        app_lookup = None
+        if item.scan_id is not None:
+            scan_lookup = self.submit(get_scan_info_by_id, item.scan_id, token, host, session=session)
+        else:
+            if item.scan_name is not None:
+                scan_lookup = self.submit(get_scan_info_by_name, item.scan_name, token, host, session=session)
+            if item.app_id is not None:
+                app_lookup = self.submit(get_app_name_by_id, item.app_id, token, host, session=session)
+            else:
+                if item.app_name is not None:
+                    app_lookup = self.submit(get_app_id_by_name, item.app_name, token, host, session=session)
+                if item.asset_group is None:
+                    self.prefetch_default_asset_group()
+
+        # part 1 - figure out which parameters are given and what should be created:
+        # - new or existing application
+        # - new or existing scan
+
+        # if scan_id is provided, verify it exists and matches other parameters (if provided)
+        if item.scan_id is not None:
+            scan_info = scan_lookup.result()
+            if scan_info is None:
+                raise IastException(f"Error - given scan id {item.scan_id} not found for the given credentials")
+            asoc_scan_name, asoc_app_name, asoc_app_id = scan_info
+            if item.scan_name is not None and item.scan_name != asoc_scan_name:
+                raise IastException(f"Error - given scan name \'{item.scan_name}\' does not match the given scan id "
+                                    f"{item.scan_id}")
+            if item.app_id is not None and item.app_id != asoc_app_id:
+                raise IastException(f"Error - given app id {item.app_id} does not match the given scan id "
+                                    f"{item.scan_id}")
+            if item.app_name is not None and item.app_name != asoc_app_name:
+                raise IastException(f"Error - given app name \'{item.app_name}\' does not match the given scan id "
+                                    f"{item.scan_id}")
+            item.scan_name, item.app_name, item.app_id = asoc_scan_name, asoc_app_name, asoc_app_id
+            print(f"Configuring IAST agent to associate to existing scan {item.scan_name} with id {item.scan_id}")
+            item.agent_key = self.get_new_iast_key(item)
+
+        # if scan_id is not provided and scan_name is provided,
+        # it may refer to an existing scan. if yes - verify it exists and matches other parameters (if provided)
+        elif item.scan_name is not None:
+            asoc_scan_id, asoc_app_name, asoc_app_id = scan_lookup.result()
+            if asoc_scan_id is not None:
+                if item.app_id is not None and item.app_id != asoc_app_id:
+                    raise IastException(f"Error - given app id {item.app_id} does not match the given scan name "
+                                        f"{item.scan_name}")
+                if item.app_name is not None and item.app_name != asoc_app_name:
+                    raise IastException(f"Error - given app name {item.app_name} does not match the given scan name "
+                                        f"{item.scan_name}")
+                item.scan_id, item.app_name, item.app_id = asoc_scan_id, asoc_app_name, asoc_app_id
+                print(f"Configuring IAST agent to associate to existing scan {item.scan_name} with id {item.scan_id}")
+                item.agent_key = self.get_new_iast_key(item)
+
+        # if the scan was not found and app_id is provided,
+        # verify it exists and matches other parameters (if provided)
+        if item.agent_key is None and item.app_id is not None:
+            asoc_app_name = app_lookup.result()
+            if asoc_app_name is None:
+                raise IastException(f"Error - given app id {item.app_id} not found for the given credentials")
+            if item.app_name is not None and asoc_app_name != item.app_name:
+                raise IastException(f"Error - given app name {item.app_name} does not match the given app id "
+                                    f"{item.app_id}")
+            item.app_name = asoc_app_name
+            print(f"Configuring IAST agent to associate to existing application {item.app_name} with id "
+                  f"{item.app_id}")
+
+        # part 2 - create new app/scan if needed
+
+        if item.app_id is None:
+            # if user did not provide app name, generate one
+            generated_name = item.app_name is None
+            if generated_name:
+                item.app_name = "iast-app-" + current_time
+            # items with the same new app name must not create it twice
+            with self.app_lock(item.app_name):
+                # if only app_name is provided, it may refer to an existing app - or to the app just created by
+                # another item, which the lookup sent before waiting did not find
+                if not generated_name:
+                    item.app_id = self.use_created_app(item) or app_lookup.result()
+                if item.app_id is not None:
+                    print(f"Configuring IAST agent to associate to existing application {item.app_name} with id "
+                          f"{item.app_id}")
+                else:
+                    print("Creating a new app.")
+                    # if user did not provide asset group, use default
+                    if item.asset_group is None:
+                        item.asset_group = self.get_default_asset_group()
+                    item.app_id = create_app(token, item.app_name, item.asset_group, host, session=session)
+                    item.app_created = True
+                    with self.lock:
+                        self.created_apps[item.app_name] = item.app_id
+                        self.app_users[item.app_id] = {item}
+                    print(f"Created a new application {item.app_name} with id {item.app_id}")
+
+        # generate a new IAST scan
+        if item.scan_id is None:
+            print("Creating a new scan.")
+            # if user did not provide scan name, generate one
+            if item.scan_name is None:
+                item.scan_name = "iast-scan-" + current_time
+            item.agent_key, item.scan_id = create_scan(item.app_id, token, item.scan_name, host,
+                                                       agent_type=item.agent_type, session=session)
+            item.scan_created = True
+            print(f"Created a new scan {item.scan_name} with id {item.scan_id}")
+        item.timings["resolve"] = time.monotonic() - started
+
+    def get_new_iast_key(self, item):
+        print(f"WARNING! You are asking to use an existing ASoC scan ({item.scan_name}). A new access token will be "
+              "generated and invalidate previous token. If you have running agents that use the previous token, they "
+              "will not be able to communicate with ASoC anymore. ")
+        agent_key = get_new_iast_key_for_scan(item.scan_id, self.token, self.host, session=self.session)
+        if agent_key is None:
+            raise IastException(f"Error - failed to get a new agent key for scan {item.scan_id}, it may not be an "
+                                "IAST scan")
+        return agent_key
+
+    # the id of the app of this name created by this provisioner for another item, None if there is none. the item is
+    # counted as a user of the app, so that it is not deleted while the item has a scan in it
+    def use_created_app(self, item):
+        with self.lock:
+            app_id = self.created_apps.get(item.app_name)
+            if app_id is not None:
+                self.app_users[app_id].add(item)
+            return app_id
+
+    # deletes the scan created for an item that failed, and the app created by this provisioner that it used, unless
+    # other items still use it - then the last of them deletes it if it fails too
+    def cleanup(self, item):
+        if item.scan_created:
+            print(f"Deleting scan {item.scan_name} with id {item.scan_id}.")
+            delete_scan(item.scan_id, self.token, self.host, session=self.session)
+            item.scan_created = False
+        with self.lock:
+            users = self.app_users.get(item.app_id)
+            if users is None or item not in users:
+                return
+            users.discard(item)
+            item.app_created = False
+            if users:
+                return
+            del self.app_users[item.app_id]
+            if self.created_apps.get(item.app_name) == item.app_id:
+                del self.created_apps[item.app_name]
+        print(f"Deleting application {item.app_name} with id {item.app_id}.")
+        delete_app(item.app_id, self.token, self.host, session=self.session)
+
+    # writes the agent package of an item: the base agent package of its agent type with the item's agent key in it
+    def package(self, item, base_zip, output_dir="."):
+        started = time.monotonic()
+        if item.output is None:
+            item.output = re.sub(r"[^\w.-]", "_", f"IASTAgent-{item.scan_name or item.scan_id}") + \
+                          get_agent_layout(item.agent_type).extension
+        item.output = os.path.join(output_dir, item.output)
+        package_agent(item.agent_type, base_zip, item.output, asoc_config_json(item.agent_key))
+        item.timings["package"] = time.monotonic() - started
+
+
+# reads provisioning items from a .json manifest (a list of objects, or {"agents": [...]}) or a .csv manifest with a
+# header line. the fields of every item are app_id, app_name, scan_id, scan_name, asset_group, output (the agent
+# package file name) and agent_type (Java, DotNet or NodeJS - default Java), all optional
+def read_manifest(path):
+    try:
+        with open(path, newline="") as manifest_file:
+            if path.lower().endswith(".json"):
+                rows = json.load(manifest_file)
+                if isinstance(rows, dict):
+                    rows = rows.get("agents", [])
+            else:
+                rows = list(csv.DictReader(manifest_file))
+    except (OSError, ValueError, csv.Error) as e:
+        raise IastException(f"failed to read manifest {path}: {str(e)}")
+    items = []
+    for line, row in enumerate(rows, 1):
+        unknown = [key for key in row if key not in manifest_fields]
+        if unknown:
+            raise IastException(f"manifest {path} item {line}: unknown fields {unknown}, expected {manifest_fields}")
+        items.append(ProvisioningItem(**{key: (value.strip() if isinstance(value, str) else value)
+                                         for key, value in row.items()}))
+    return items
+
+
+# provisions many agents in one run: resolves or creates all apps and scans concurrently, downloads the base agent of
+# every agent type of the items once (with the agent key of its first item, the types at the same time - or takes
+# them from agent_cache) and writes one keyed agent package per item to output_dir - e.g. a Java and a DotNet agent
+# for the two parts of a polyglot app. items that fail get their error set, and their newly created app / scan
+# deleted, without stopping the others. returns the items
+#     token: AsocTokenProvider (or token) - a provider logs in once for all items
+#     workers: number of items resolved and packaged at the same time
+#     agent_cache: AgentCache or cache directory for the base agents
+def provision_agents(items, token, output_dir=".", host=None, workers=default_provisioning_workers, agent_cache=None,
+                     session=None):
+    os.makedirs(output_dir, exist_ok=True)
+    with Provisioner(token, host, session=session) as provisioner:
+        batch_time = datetime.now().time().strftime('%H-%M-%S')
+
+        def resolve(index, item):
+            # generated names have to be unique within the batch
+            current_time = f"{batch_time}-{index}" if len(items) > 1 else batch_time
+            if item.error is not None:
+                return
+            try:
+                provisioner.resolve(item, current_time)
+            except IastException as e:
+                fail(item, e)
+
+        def package(item, base_zip):
+            try:
+                provisioner.package(item, base_zip, output_dir)
+            except (IastException, OSError) as e:
+                fail(item, e)
+
+        def fail(item, error):
+            item.error = str(error)
+            try:
+                provisioner.cleanup(item)
+            except IastException as e:
+                item.error += f" (cleanup failed: {str(e)})"
+
+        for item in items:
+            try:
+                get_agent_layout(item.agent_type)
+            except IastException as e:
+                item.error = str(e)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(resolve, range(len(items)), items))
+            resolved = {}
+            for item in items:
+                if item.error is None:
+                    resolved.setdefault(item.agent_type, []).append(item)
+
+            def get_type_agent(agent_type):
+                started = time.monotonic()
+                type_items = resolved[agent_type]
+                try:
+                    base_zip = get_base_agent(type_items[0].agent_key, output_dir, host, agent_cache, session,
+                                              agent_type)
+                except IastException as e:
+                    for item in type_items:
+                        fail(item, f"base agent download failed: {str(e)}")
+                    return None
+                for item in type_items:
+                    item.timings["download"] = time.monotonic() - started
+                return base_zip
+
+            base_zips = dict(zip(resolved, executor.map(get_type_agent, resolved)))
+            try:
+                list(executor.map(lambda item: package(item, base_zips[item.agent_type]),
+                                  [item for item in items if item.error is None]))
+            finally:
+                for base_zip in base_zips.values():
+                    if agent_cache is None and base_zip is not None and os.path.exists(base_zip):
+                        os.remove(base_zip)
+        return items
+
+
+# downloads the base agent package (no agent key in it) with an agent key (IAST/api/DownloadVersion) and returns its
+# path. without a cache, the package is written to output_dir and should be deleted by the caller.
+def get_base_agent(agent_key, output_dir, host=None, agent_cache=None, session=None, agent_type=default_agent_type):
+    if agent_cache is not None:
+        if not isinstance(agent_cache, AgentCache):
+            agent_cache = AgentCache(agent_cache)
+        return agent_cache.get_agent_iast_api(agent_key, host, session=session, agent_type=agent_type)
+    base_zip = os.path.join(output_dir, f"base-{agent_type}-IASTAgent{get_agent_layout(agent_type).extension}")
+    download_agent_iast_api(agent_key, host, session=session, destination=base_zip)
+    return base_zip
+
+
+# human readable summary of provisioned items: latency of every item and the errors of the failed ones
+def format_provisioning_summary(items, elapsed=None):
+    succeeded = [item for item in items if item.succeeded]
+    header = f"{len(succeeded)} of {len(items)} agents provisioned"
+    lines = [header + (f" in {elapsed:.1f}s" if elapsed is not None else "")]
+    for item in items:
+        timings = " ".join(f"{stage}={seconds:.2f}s" for stage, seconds in item.timings.items())
+        if item.succeeded:
+            lines.append(f"  ok     {item.label}: {item.output} {timings}")
+        else:
+            lines.append(f"  failed {item.label}: {item.error} {timings}")
+    return "\n".join(lines)
@@ -0,0 +1,196 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# batch report pipeline: create, poll and download security reports for many scans (or apps) at once.
+#     result = run_report_pipeline(scan_ids, token, "reports", host, max_in_flight=20)
+#     print(format_report_timings(result))
+# up to max_in_flight reports are being generated or downloaded at any time. the status of all pending reports is
+# polled with one request per round (see AsocUtils.get_reports_status) and every report is downloaded as soon as it
+# is ready, while the others are still being generated.
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from .AsocUtils import create_report, get_reports_status, download_report_to_file, is_report_ready, \
+    is_report_failed, poll_intervals, default_poll_deadline, default_poll_initial_interval, \
+    default_poll_max_interval, default_poll_backoff_factor, default_report_chunk_size
+from .IastUtils import IastException
+
+default_max_in_flight = 20
+default_pipeline_workers = 8
+
+pipeline_stages = ("create", "generate", "download")
+
+
+# one report of the pipeline. timings holds the seconds spent in every stage that was reached
+class ReportJob:
+    def __init__(self, scan_id, scope, path):
+        self.scan_id = scan_id
+        self.scope = scope
+        self.path = path
+        self.report_id = None
+        self.status = None
+        self.size = 0
+        self.error = None
+        self.timings = {}
+        self.stage_started = None
+
+    @property
+    def succeeded(self):
+        return self.error is None and is_report_ready(self.status)
+
+    def start_stage(self):
+        self.stage_started = time.monotonic()
+
+    def end_stage(self, stage):
+        self.timings[stage] = time.monotonic() - self.stage_started
+        self.stage_started = time.monotonic()
+
+    def __repr__(self):
+        return f"ReportJob(scan_id={self.scan_id!r}, report_id={self.report_id!r}, status={self.status!r}, " \
+               f"error={self.error!r})"
+
+
+class ReportPipelineResult:
+    def __init__(self, jobs, elapsed):
+        self.jobs = jobs
+        self.elapsed = elapsed
+
+    @property
+    def succeeded(self):
+        return [job for job in self.jobs if job.succeeded]
+
+    @property
+    def failed(self):
+        return [job for job in self.jobs if not job.succeeded]
+
+    # {stage: {"count", "total", "mean", "max"}} in seconds, over all reports that completed the stage
+    def stage_timings(self):
+        timings = {}
+        for stage in pipeline_stages:
+            values = [job.timings[stage] for job in self.jobs if stage in job.timings]
+            timings[stage] = {"count": len(values), "total": sum(values),
+                              "mean": sum(values) / len(values) if values else 0.0,
+                              "max": max(values) if values else 0.0}
+        return timings
+
+
+# creates, polls and downloads one xml report per scan id into output_dir (<scope>_<id>.xml), and returns a
+# ReportPipelineResult. a report that fails in any stage is recorded in its ReportJob.error and does not stop the
+# others.
+#     scope: Scan or Application - the ids are scan ids or app ids
+#     max_in_flight: max reports being created, generated or downloaded at the same time
+#     workers: threads for the create and download requests
+#     deadline: max seconds a report may take to become ready
+#     progress: optional callback(job, stage) called when a report completes a stage or fails
+def run_report_pipeline(scan_ids, token, output_dir, host=None, scope="Scan", max_in_flight=default_max_in_flight,
+                        workers=default_pipeline_workers, deadline=default_poll_deadline,
+                        initial_interval=default_poll_initial_interval, max_interval=default_poll_max_interval,
+                        backoff_factor=default_poll_backoff_factor, chunk_size=default_report_chunk_size,
+                        progress=None, session=None):
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.monotonic()
+    jobs = [ReportJob(scan_id, scope, os.path.join(output_dir, f"{scope}_{scan_id}.xml"))
+            for scan_id in dict.fromkeys(scan_ids)]
+    queued = list(reversed(jobs))
+    generating = {}
+    running = {}
+    intervals = None
+    next_poll = None
+
+    def notify(job, stage):
+        if job.error is not None:
+            logging.error(f"report for {job.scope} {job.scan_id} failed: {job.error}")
+        if progress is not None:
+            progress(job, stage)
+
+    def create(job):
+        job.start_stage()
+        job.report_id = create_report(job.scan_id, token, host, scope=scope, session=session)
+        job.end_stage("create")
+
+    def download(job):
+        job.size = download_report_to_file(job.report_id, token, job.path, host, chunk_size=chunk_size,
+                                           session=session)
+        job.end_stage("download")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while queued or generating or running:
+            while queued and len(generating) + len(running) < max_in_flight:
+                job = queued.pop()
+                running[executor.submit(create, job)] = ("create", job)
+
+            if generating and time.monotonic() >= next_poll:
+                try:
+                    statuses = get_reports_status([job.report_id for job in generating.values()], token, host,
+                                                  session=session)
+                except Exception as e:
+                    # the reports are polled again, and time out after the deadline if the polls keep failing
+                    logging.warning(f"report status poll failed: {error_text(e)}")
+                    statuses = {}
+                for report_id, job in list(generating.items()):
+                    job.status = statuses.get(report_id, job.status)
+                    if is_report_ready(job.status):
+                        job.end_stage("generate")
+                        notify(job, "generate")
+                        del generating[report_id]
+                        running[executor.submit(download, job)] = ("download", job)
+                    elif is_report_failed(job.status):
+                        job.error = "asoc report generation failed"
+                        del generating[report_id]
+                        notify(job, "generate")
+                    elif deadline is not None and time.monotonic() - job.stage_started > deadline:
+                        job.error = "Timed out waiting for report ready"
+                        del generating[report_id]
+                        notify(job, "generate")
+                next_poll = time.monotonic() + next(intervals)
+
+            timeout = max(0.0, next_poll - time.monotonic()) if generating else None
+            if not running:
+                if timeout:
+                    time.sleep(timeout)
+                continue
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, job = running.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    # one failed report does not stop the others
+                    job.error = error_text(e)
+                    notify(job, stage)
+                    continue
+                notify(job, stage)
+                if stage == "create":
+                    if not generating:
+                        # restart the adaptive interval for a new round of reports
+                        intervals = poll_intervals(initial_interval, max_interval, backoff_factor)
+                        next_poll = time.monotonic() + next(intervals)
+                    generating[job.report_id] = job
+    return ReportPipelineResult(jobs, time.monotonic() - started)
+
+
+# error message of a failed stage, with the exception type for unexpected errors (e.g. KeyError of a bad response)
+def error_text(error):
+    if isinstance(error, (IastException, OSError)):
+        return str(error)
+    return f"{type(error).__name__}: {str(error)}"
+
+
+# human readable summary of a ReportPipelineResult
+def format_report_timings(result):
+    lines = [f"{len(result.succeeded)} of {len(result.jobs)} reports downloaded in {result.elapsed:.1f}s"]
+    for stage, timing in result.stage_timings().items():
+        lines.append(f"  {stage:<9} count={timing['count']:<5} mean={timing['mean']:.2f}s max={timing['max']:.2f}s "
+                     f"total={timing['total']:.1f}s")
+    for job in result.failed:
+        lines.append(f"  failed: {job.scope} {job.scan_id}: {job.error}")
+    return "\n".join(lines)
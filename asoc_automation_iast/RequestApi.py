@@ -6,112 +6,266 @@
 # and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
 # and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
 #######################################################################################################################
+import email.utils
+import json
+import hashlib
+import os
+import random
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
+from requests.auth import AuthBase
+
 from .IastUtils import IastException
+from .RequestMetrics import start_request, finish_request
 
 default_num_of_retries = 80
 retry_wait_time = 5
 
+# status codes worth retrying: request timeout, throttling and transient server/gateway errors.
+# other 4xx errors will fail the same way on every retry, so they are raised immediately
+retryable_status_codes = (408, 425, 429, 500, 502, 503, 504)
+
+# connection pool defaults for AsocSession: number of hosts to keep pools for, and connections kept alive per host
+default_pool_connections = 4
+default_pool_size = 10
+
+# json body keys whose values are never printed
+redacted_keys = ("keysecret", "password", "token", "accesstoken", "agentkey")
+
+default_download_filename = 'IASTAgent.temp.zip'
+# bytes read at a time by download_request - also the most data lost when a download is interrupted
+download_chunk_size = 64 * 1024
+hash_chunk_size = 1024 * 1024
+
+
+# IastException of a request that failed with an http error status
+class HttpStatusException(IastException):
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+# adds "Authorization: Bearer <token>" to every request it is attached to
+class BearerAuth(AuthBase):
+    def __init__(self, token):
+        self.token = token
+
+    def __call__(self, request):
+        request.headers["Authorization"] = "Bearer " + self.token
+        return request
+
+
+# returns the auth object to send with a request.
+# token may be a raw token string, a requests AuthBase object or None when the session already carries the token
+def bearer_auth(token):
+    if token is None or isinstance(token, AuthBase):
+        return token
+    return BearerAuth(token)
+
+
+# reusable HTTP client - keeps a pool of keep-alive connections per host, so a chain of ASoC calls pays the
+# TCP + TLS handshake once instead of once per call.
+# pass it as session=... to any RequestApi, AsocUtils or AsocReportUtils function.
+#     pool_size: max connections kept alive per host
+#     pool_connections: number of different hosts to keep pools for
+#     headers: default headers sent with every request (request specific headers take precedence)
+#     token: default bearer token, used when a function is called with token=None
+class AsocSession:
+    def __init__(self, token=None, headers=None, pool_size=default_pool_size,
+                 pool_connections=default_pool_connections, verify=False):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.verify = verify
+        if headers is not None:
+            self.session.headers.update(headers)
+        self.set_token(token)
+
+    def set_token(self, token):
+        self.session.auth = bearer_auth(token)
+
+    def request(self, method, url, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# when and how long to wait before retrying a failed request. used by all RequestApi and AsyncRequestApi functions
+#     max_retries: number of retries after the first attempt
+#     backoff_base, backoff_cap: the wait before retry n is a random value up to min(cap, base * 2^n) seconds
+#                                (exact value if jitter is False)
+#     retry_status_codes: http status codes that are retried, other http errors are raised at once
+#     deadline: total time budget in seconds for all attempts and waits (None - no limit)
+#     respect_retry_after: wait as requested by the server's Retry-After header on 429/503 responses
+class RetryPolicy:
+    def __init__(self, max_retries=default_num_of_retries, backoff_base=0.5, backoff_cap=retry_wait_time, jitter=True,
+                 retry_status_codes=retryable_status_codes, deadline=None, respect_retry_after=True):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.jitter = jitter
+        self.retry_status_codes = retry_status_codes
+        self.deadline = deadline
+        self.respect_retry_after = respect_retry_after
+
+    def is_retryable_status(self, status_code):
+        return status_code in self.retry_status_codes
+
+    # seconds to wait before retry number <attempt> (0 based). retry_after is the value of the Retry-After header
+    def get_delay(self, attempt, retry_after=None):
+        if self.respect_retry_after and retry_after is not None:
+            delay = parse_retry_after(retry_after)
+            if delay is not None:
+                return delay
+        delay = min(self.backoff_cap, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, delay) if self.jitter else delay
+
+    # returns the wait before the next attempt, or None if the request should not be retried anymore
+    def next_delay(self, attempt, started, retry_after=None):
+        if attempt >= self.max_retries:
+            return None
+        delay = self.get_delay(attempt, retry_after)
+        if self.deadline is not None and time.monotonic() - started + delay > self.deadline:
+            return None
+        return delay
+
+
+# backwards compatible retries=<n> argument - n retries with the default backoff
+def get_retry_policy(retries=0, retry_policy=None):
+    if retry_policy is not None:
+        return retry_policy
+    return RetryPolicy(max_retries=retries)
+
+
+# Retry-After is either a number of seconds or an http date. returns seconds to wait or None if not parsable
+def parse_retry_after(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+# sends the request on the given AsocSession, or on a new connection if session is None
+def send_request(method, url, session=None, **kwargs):
+    if session is None:
+        return requests.request(method, url, verify=False, **kwargs)
+    return session.request(method, url, **kwargs)
+
+
+# sends a request and retries it according to the retry policy, without recursion.
+# on_response (optional) consumes the response inside the retry scope, e.g. to stream it to a file.
+# prepare (optional) is called with the request kwargs before every attempt.
+# raises IastException when the request fails and should not or can not be retried anymore
+def send_with_retries(method, url, retry_policy, session=None, on_response=None, prepare=None, **kwargs):
+    started = time.monotonic()
+    attempt = 0
+    event = start_request(method, url)
+    while True:
+        error = None
+        status_code = None
+        retryable = True
+        response = None
+        try:
+            if prepare is not None:
+                # lets the caller update the request before every attempt, e.g. the Range of a resumed download
+                prepare(kwargs)
+            response = send_request(method, url, session, **kwargs)
+            response.raise_for_status()
+            if on_response is not None:
+                on_response(response)
+            finish_request(event, response, attempt, streamed=kwargs.get("stream", False))
+            return response
+        except IastException as e:
+            finish_request(event, response, attempt, error=str(e), streamed=True)
+            raise
+        except requests.exceptions.Timeout:
+            error = f"request to {url} timed out."
+        except requests.exceptions.InvalidSchema as e:
+            error = f"request to {url} failed with connection error: {str(e)}"
+            retryable = False
+        except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+            error = f"request to {url} failed with connection error: {str(e)}"
+        except requests.exceptions.TooManyRedirects:
+            error = "Too many redirects!"
+            retryable = False
+        except requests.exceptions.HTTPError as e:
+            try:
+                error = str(e) + " : " + response.content.decode('utf-8')
+            except UnicodeDecodeError:
+                error = str(e)
+            status_code = response.status_code
+            retryable = retry_policy.is_retryable_status(status_code)
+        delay = None
+        if retryable:
+            retry_after = response.headers.get("Retry-After") if response is not None else None
+            delay = retry_policy.next_delay(attempt, started, retry_after)
+        if delay is None:
+            finish_request(event, response, attempt, error=error, streamed=True)
+            raise HttpStatusException(error, status_code) if status_code is not None else IastException(error)
+        print(f"{error}. Retrying request in {delay:.1f} seconds.")
+        time.sleep(delay)
+        attempt += 1
+
 
-def get_request(url, params=None, headers=None, timeout=30, stream=False, retries=0):
+def get_request(url, params=None, headers=None, timeout=30, stream=False, retries=0, auth=None, session=None,
+                retry_policy=None):
     if headers is None:
         headers = {}
     if params is None:
         params = {}
     print_url(url, params, 'GET')
-    error = None
-    response = None
-    try:
-        response = requests.get(url, verify=False, params=params, headers=headers, timeout=timeout, stream=stream)
-        response.raise_for_status()
-    except requests.exceptions.Timeout:
-        error = f"request to {url} timed out."
-    except (requests.exceptions.ConnectionError, requests.exceptions.InvalidSchema) as e:
-        error = f"request to {url} failed with connection error: {str(e)}"
-    except requests.exceptions.TooManyRedirects:
-        error = "Too many redirects!"
-    except requests.exceptions.HTTPError as e:
-        error = str(e) + " : " + response.content.decode('utf-8')
-    if error is not None:
-        if retries > 0:
-            print(error + ". Retrying request.")
-            return get_request(url, params=params, headers=headers, timeout=timeout, stream=stream, retries=retries-1)
-        else:
-            raise IastException(error)
-    else:
-        return response
+    return send_with_retries('GET', url, get_retry_policy(retries, retry_policy), session, params=params,
+                             headers=headers, auth=auth, timeout=timeout, stream=stream)
 
 
-def post_request(url, params=None, headers=None, json_body=None, data=None, files=None, timeout=30, retries=0):
-    return __put_or_post_request('POST', url, params, headers, json_body, data, files, timeout, retries)
+def post_request(url, params=None, headers=None, json_body=None, data=None, files=None, timeout=30, retries=0,
+                 auth=None, session=None, retry_policy=None):
+    return __put_or_post_request('POST', url, params, headers, json_body, data, files, timeout, retries, auth, session,
+                                 retry_policy)
 
 
-def put_request(url, params=None, headers=None, json_body=None, data=None, files=None, timeout=30, retries=0):
-    return __put_or_post_request('PUT', url, params, headers, json_body, data, files, timeout, retries)
+def put_request(url, params=None, headers=None, json_body=None, data=None, files=None, timeout=30, retries=0,
+                auth=None, session=None, retry_policy=None):
+    return __put_or_post_request('PUT', url, params, headers, json_body, data, files, timeout, retries, auth, session,
+                                 retry_policy)
 
 
-def __put_or_post_request(method_name, url, params=None, headers=None, json_body=None, data=None, files=None, timeout=30, retries=0):
+def __put_or_post_request(method_name, url, params=None, headers=None, json_body=None, data=None, files=None,
+                          timeout=30, retries=0, auth=None, session=None, retry_policy=None):
     if headers is None:
         headers = {}
     if params is None:
         params = {}
     print_url(url, params, method_name, json_body)
-    error = None
-    response = None
-    try:
-        if method_name == 'POST':
-            response = requests.post(
-                url, verify=False, params=params, headers=headers, json=json_body, data=data, files=files, timeout=timeout)
-        else:
-            response = requests.put(
-                url, verify=False, params=params, headers=headers, json=json_body, data=data, files=files, timeout=timeout)
-        response.raise_for_status()
-    except requests.exceptions.Timeout:
-        error = f"request to {url} timed out."
-    except (requests.exceptions.ConnectionError, requests.exceptions.InvalidSchema) as e:
-        error = f"request to {url} failed with connection error: {str(e)}"
-    except requests.exceptions.TooManyRedirects:
-        error = "Too many redirects!"
-    except requests.exceptions.HTTPError as e:
-        try:
-            error = str(e) + " : " + response.content.decode('utf-8')
-        except UnicodeDecodeError:
-            error = str(e)
-    if error is not None:
-        if retries > 0:
-            print(error + ". Retrying request.")
-            return __put_or_post_request(method_name=method_name, url=url, params=params, headers=headers, json_body=json_body, data=data, files=files,
-                         timeout=timeout, retries=retries-1)
-        else:
-            raise IastException(error)
-    else:
-        return response
+    return send_with_retries(method_name, url, get_retry_policy(retries, retry_policy), session, params=params,
+                             headers=headers, auth=auth, json=json_body, data=data, files=files, timeout=timeout)
 
 
-def delete_request(url, params=None, headers=None, timeout=30, retries=0):
+def delete_request(url, params=None, headers=None, timeout=30, retries=0, auth=None, session=None, retry_policy=None):
     if headers is None:
         headers = {}
     if params is None:
         params = {}
-    error = None
     print_url(url, params, 'DELETE')
-    try:
-        response = requests.delete(url, verify=False, params=params, headers=headers, timeout=timeout)
-        response.raise_for_status()
-    except requests.exceptions.Timeout:
-        error = f"request to {url} timed out."
-    except (requests.exceptions.ConnectionError, requests.exceptions.InvalidSchema) as e:
-        error = f"request to {url} failed with connection error: {str(e)}"
-    except requests.exceptions.TooManyRedirects:
-        error = "Too many redirects!"
-    except requests.exceptions.HTTPError as e:
-        error = str(e) + " : " + response.content.decode('utf-8')
-    if error is not None:
-        if retries > 0:
-            print(error + ". Retrying request.")
-            delete_request(url, params=params, headers=headers, timeout=timeout, retries=retries-1)
-        else:
-            raise IastException(error)
+    send_with_retries('DELETE', url, get_retry_policy(retries, retry_policy), session, params=params, headers=headers,
+                      auth=auth, timeout=timeout)
 
 
 def print_url(url, params, http_method, json_body=None):
@@ -119,39 +273,157 @@ def print_url(url, params, http_method, json_body=None):
     if len(params) > 0:
         line += f', params: {params}'
     if json_body is not None:
-        line += f', body: {json_body}'
+        line += f', body: {redact(json_body)}'
     print(line)
 
 
-# special method to download zip file, as in this case the response can't be returned
-def download_request(url, params=None, headers=None, timeout=30, stream=False, retries=0):
-    if headers is None:
-        headers = {}
+# returns a copy of a json body with the values of secret keys (api key secret, passwords, tokens) masked
+def redact(json_body):
+    if isinstance(json_body, dict):
+        return {key: "***" if isinstance(key, str) and key.lower() in redacted_keys else redact(value)
+                for key, value in json_body.items()}
+    if isinstance(json_body, list):
+        return [redact(value) for value in json_body]
+    return json_body
+
+
+# special method to download zip file, as in this case the response can't be returned.
+# the content is written to destination (default IASTAgent.temp.zip), except for a 304 Not Modified response to a
+# conditional request (If-None-Match / If-Modified-Since headers), which leaves destination untouched.
+# the body is streamed to <destination>.part and renamed to destination when complete. when the connection breaks,
+# the retry continues from the end of the .part file with a Range request. the url and the validator (ETag or
+# Last-Modified) and size of the content are kept in <destination>.part.json, so that a .part file left by an earlier
+# interrupted call is resumed only for the same url, with If-Range - a new build or report is downloaded from the
+# start. a .part file of another url, or without a validator, is deleted (as with resume=False).
+#     sha256: expected hex digest of the content, raises IastException (and drops the .part file) on mismatch
+#     chunk_size: size of the blocks read from the response and written to the file
+def download_request(url, params=None, headers=None, timeout=30, stream=True, retries=0, auth=None, session=None,
+                     retry_policy=None, destination=None, resume=True, sha256=None, chunk_size=download_chunk_size):
     if params is None:
         params = {}
+    if destination is None:
+        destination = default_download_filename
+    headers = dict(headers) if headers is not None else {}
+    part_path = str(destination) + ".part"
+    part_info_path = part_path + ".json"
+    source = {"url": url, "params": [[str(key), str(value)] for key, value in sorted(params.items())]}
+    # validator ("If-Range") and size of the content being downloaded, so a resumed range is only accepted for the
+    # same content
+    validator = {}
+    part_info = read_part_info(part_info_path) if resume and os.path.exists(part_path) else None
+    if part_info is not None and part_info.get("source") == source and part_info.get("validator", {}).get("If-Range"):
+        validator.update(part_info["validator"])
+    else:
+        remove_part(part_path)
     print_url(url, params, 'GET')
-    error = None
-    response = None
-    try:
-        response = requests.get(url, verify=False, params=params, headers=headers, timeout=timeout, stream=stream)
-        status_code = response.status_code
-        print("response.status_code:", status_code)
-        if status_code != 200:
-            print(f'error: {response.content}')
-        with open('IASTAgent.temp.zip', 'wb') as f:
-            for chunk in response:
-                f.write(chunk)
-    except requests.exceptions.Timeout:
-        error = f"request to {url} timed out."
-    except (requests.exceptions.ConnectionError, requests.exceptions.InvalidSchema) as e:
-        error = f"request to {url} failed with connection error: {str(e)}"
-    except requests.exceptions.TooManyRedirects:
-        error = "Too many redirects!"
-    if error is not None:
-        if retries > 0:
-            print(error + ". Retrying request.")
-            return download_request(url, params=params, headers=headers, timeout=timeout, stream=stream, retries=retries-1)
+
+    def prepare(kwargs):
+        request_headers = dict(headers)
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        if offset > 0:
+            request_headers["Range"] = f"bytes={offset}-"
+            if validator.get("If-Range"):
+                request_headers["If-Range"] = validator["If-Range"]
+        kwargs["headers"] = request_headers
+
+    def write_to_file(response):
+        print("response.status_code:", response.status_code)
+        if response.status_code == 304:
+            return
+        if response.status_code not in (200, 206):
+            raise IastException(f"download from {url} failed: unexpected status {response.status_code}")
+        total = None
+        if response.status_code == 206:
+            offset, total = parse_content_range(response.headers.get("Content-Range"))
+            if offset is None or offset != (os.path.getsize(part_path) if os.path.exists(part_path) else 0) or \
+                    (validator.get("size") is not None and total != validator["size"]):
+                # the server did not send the requested range of the same content - start over
+                remove_part(part_path)
+                validator.clear()
+                raise requests.exceptions.ChunkedEncodingError(f"unexpected Content-Range "
+                                                               f"{response.headers.get('Content-Range')}")
         else:
-            raise IastException(error)
-    else:
-        return response
+            # new content: its validator is kept with the .part file, to resume it only for the same content
+            validator.clear()
+            if response.headers.get("ETag") and not response.headers["ETag"].startswith("W/"):
+                validator["If-Range"] = response.headers["ETag"]
+            elif response.headers.get("Last-Modified"):
+                validator["If-Range"] = response.headers["Last-Modified"]
+            if response.headers.get("Content-Length", "").isdigit() and "Content-Encoding" not in response.headers:
+                total = int(response.headers["Content-Length"])
+            validator["size"] = total
+            if validator.get("If-Range"):
+                write_part_info(part_info_path, {"source": source, "validator": validator})
+            elif os.path.exists(part_info_path):
+                os.remove(part_info_path)
+        # a 200 response holds the whole content, even if a range was requested
+        with open(part_path, "ab" if response.status_code == 206 else "wb") as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+            size = f.tell()
+        if total is not None and size != total:
+            raise requests.exceptions.ChunkedEncodingError(f"incomplete download: {size} of {total} bytes")
+        if sha256 is not None and file_sha256(part_path) != sha256.lower():
+            remove_part(part_path)
+            raise IastException(f"download from {url} failed: sha256 mismatch")
+        os.replace(part_path, destination)
+        if os.path.exists(part_info_path):
+            os.remove(part_info_path)
+
+    try:
+        return send_with_retries('GET', url, get_retry_policy(retries, retry_policy), session,
+                                 on_response=write_to_file, prepare=prepare, params=params, headers=headers, auth=auth,
+                                 timeout=timeout, stream=stream)
+    except HttpStatusException as e:
+        # 416 Range Not Satisfiable
+        if e.status_code != 416 or not os.path.exists(part_path):
+            raise
+        # the .part file is not a prefix of the current content - download it again from the start
+        remove_part(part_path)
+        validator.clear()
+        return send_with_retries('GET', url, get_retry_policy(retries, retry_policy), session,
+                                 on_response=write_to_file, prepare=prepare, params=params, headers=headers, auth=auth,
+                                 timeout=timeout, stream=stream)
+
+
+# the url and validator saved with a .part file, None if there is none or it can't be read
+def read_part_info(part_info_path):
+    try:
+        with open(part_info_path) as f:
+            part_info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return part_info if isinstance(part_info, dict) else None
+
+
+def write_part_info(part_info_path, part_info):
+    with open(part_info_path, "w") as f:
+        json.dump(part_info, f)
+
+
+# deletes a .part file and its .part.json
+def remove_part(part_path):
+    for path in (part_path, part_path + ".json"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# parses "bytes <first>-<last>/<total>" - returns (first, total), total is None if unknown ("*")
+def parse_content_range(value):
+    if not value or not value.startswith("bytes "):
+        return None, None
+    try:
+        byte_range, total = value[len("bytes "):].split("/")
+        first = int(byte_range.split("-")[0])
+        return first, int(total) if total != "*" else None
+    except ValueError:
+        return None, None
+
+
+# hex sha256 digest of a file, read in chunks
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(hash_chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,182 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# instrumentation of the http calls of RequestApi and AsyncRequestApi.
+# a request hook is any object with request_started(event) and / or request_finished(event) methods. every registered
+# hook is called for every call, once before the first attempt and once after the call succeeded or failed (after all
+# retries). RequestMetrics is a hook that aggregates latency percentiles per endpoint:
+#     with collect_request_metrics() as metrics:
+#         run_pipeline()
+#     print(metrics.format_summary())
+
+import contextlib
+import logging
+import math
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+# hooks called for every request, see add_request_hook
+request_hooks = []
+
+# path segments that are ids: guids, numbers, and long tokens with digits
+id_segment_pattern = re.compile(r"^([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+|"
+                                r"(?=[\w-]*\d)[\w-]{8,})$")
+
+
+# one http call. status, bytes, retries, latency and error are set when the call finishes
+#     endpoint: url path with the ids replaced by {id}, e.g. /api/v4/Scans/NewIASTKey/{id}
+#     bytes: size of the response body (Content-Length for streamed responses, None if unknown)
+#     retries: number of attempts after the first one
+#     error: error text if the call failed, None otherwise
+class RequestEvent:
+    __slots__ = ("method", "url", "endpoint", "status", "bytes", "retries", "latency", "error", "started")
+
+    def __init__(self, method, url):
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint_template(url)
+        self.status = None
+        self.bytes = None
+        self.retries = 0
+        self.latency = None
+        self.error = None
+        self.started = time.monotonic()
+
+    def __repr__(self):
+        return f"RequestEvent({self.method} {self.endpoint}, status={self.status}, latency={self.latency}, " \
+               f"retries={self.retries}, error={self.error!r})"
+
+
+def add_request_hook(hook):
+    request_hooks.append(hook)
+    return hook
+
+
+def remove_request_hook(hook):
+    if hook in request_hooks:
+        request_hooks.remove(hook)
+
+
+# returns the url path with the ids replaced by {id} - the same template for every call of an endpoint
+def endpoint_template(url):
+    path = urlparse(url).path
+    return "/".join("{id}" if id_segment_pattern.match(segment) else segment for segment in path.split("/"))
+
+
+# called by the request functions before the first attempt. returns None when no hook is registered
+def start_request(method, url):
+    if not request_hooks:
+        return None
+    event = RequestEvent(method, url)
+    call_hooks("request_started", event)
+    return event
+
+
+# called by the request functions when the call succeeded (response) or failed (error)
+def finish_request(event, response=None, retries=0, error=None, streamed=False):
+    if event is None:
+        return
+    event.latency = time.monotonic() - event.started
+    event.retries = retries
+    event.error = error
+    if response is not None:
+        event.status = response.status_code
+        event.bytes = response_size(response, streamed)
+    call_hooks("request_finished", event)
+
+
+def response_size(response, streamed):
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit():
+        return int(length)
+    if streamed:
+        return None
+    return len(response.content)
+
+
+def call_hooks(name, event):
+    for hook in list(request_hooks):
+        method = getattr(hook, name, None)
+        if method is None:
+            continue
+        try:
+            method(event)
+        except Exception as e:
+            # a broken hook must not break the request
+            logging.warning(f"request hook {hook!r}.{name} failed: {str(e)}")
+
+
+# nearest rank percentile of sorted values
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+# request hook that aggregates the finished calls per method + endpoint: count, errors, retries, bytes and latency
+# percentiles. thread safe
+class RequestMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.retries = {}
+        self.bytes = {}
+
+    def request_finished(self, event):
+        key = (event.method, event.endpoint)
+        with self.lock:
+            self.latencies.setdefault(key, []).append(event.latency)
+            self.errors[key] = self.errors.get(key, 0) + (1 if event.error is not None else 0)
+            self.retries[key] = self.retries.get(key, 0) + event.retries
+            self.bytes[key] = self.bytes.get(key, 0) + (event.bytes or 0)
+
+    # {"<method> <endpoint>": {"count", "errors", "retries", "bytes", "total", "p50", "p95", "p99", "max"}},
+    # latencies in seconds
+    def summary(self):
+        with self.lock:
+            summary = {}
+            for key, latencies in self.latencies.items():
+                ordered = sorted(latencies)
+                summary[f"{key[0]} {key[1]}"] = {
+                    "count": len(ordered), "errors": self.errors[key], "retries": self.retries[key],
+                    "bytes": self.bytes[key], "total": sum(ordered), "p50": percentile(ordered, 50),
+                    "p95": percentile(ordered, 95), "p99": percentile(ordered, 99), "max": ordered[-1]}
+            return summary
+
+    # table of the endpoints, slowest total time first
+    def format_summary(self):
+        rows = sorted(self.summary().items(), key=lambda item: item[1]["total"], reverse=True)
+        lines = [f"{'endpoint':<60} {'count':>6} {'errors':>6} {'retries':>7} {'p50':>8} {'p95':>8} {'p99':>8} "
+                 f"{'total':>8}"]
+        for endpoint, stats in rows:
+            lines.append(f"{endpoint:<60} {stats['count']:>6} {stats['errors']:>6} {stats['retries']:>7} "
+                         f"{stats['p50']:>8.3f} {stats['p95']:>8.3f} {stats['p99']:>8.3f} {stats['total']:>8.2f}")
+        return "\n".join(lines)
+
+    def clear(self):
+        with self.lock:
+            self.latencies.clear()
+            self.errors.clear()
+            self.retries.clear()
+            self.bytes.clear()
+
+
+# registers a RequestMetrics hook for the duration of the with block
+@contextlib.contextmanager
+def collect_request_metrics(metrics=None):
+    metrics = metrics if metrics is not None else RequestMetrics()
+    add_request_hook(metrics)
+    try:
+        yield metrics
+    finally:
+        remove_request_hook(metrics)
@@ -37,6 +37,22 @@ input_options = {
         "optional"),
     "host": (
         "host url. If not specified, the default value will be ASoc North America.",
+        "optional"),
+    "token_cache": (
+        "Directory to cache the ASoC login token in. Consecutive runs with the same key id reuse the cached token "
+        "until it expires, instead of logging in again. If not specified, the token is not cached.",
+        "optional"),
+    "agent_cache": (
+        "Directory to cache the downloaded IAST agent in. Consecutive runs download the agent again only if ASoC has "
+        "a new build. If not specified, the agent is downloaded on every run.",
+        "optional"),
+    "agent_type": (
+        "IAST agent type: Java, DotNet or NodeJS. A new scan is created for this agent type. Default: Java. The Java "
+        "agent is written to IASTAgent.zip, the DotNet agent to the nuget package <id>.<version>.nupkg.",
+        "optional"),
+    "previous": (
+        "Path of an agent package written before for the same agent type. Its custom config (user-config.json in the "
+        "war, the DotNet content/ files) is copied to the new package. If not specified, no custom config is kept.",
         "optional")
 }
 
@@ -88,3 +104,5 @@ def usage():
     print("If a scan named my-scan exists, it will be used. Otherwise, a new application with generated name, and a new scan named my-scan will be created.\n")
     print(sys.argv[0] + " --id=abcd --secret=efgh --scan_name=my-scan --app_id=12345")
     print("If a scan named my-scan exists, it will be used. Otherwise, a new application named my-scan will be created, associated with app 12345.\n")
+    print(sys.argv[0] + " --id=abcd --secret=efgh --app_name=my-app --agent_type=DotNet")
+    print("A new IAST scan for a DotNet agent will be generated, associated with the application my-app.\n")
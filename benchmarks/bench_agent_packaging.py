@@ -0,0 +1,111 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# wall clock of adding asoc-config.json to the war inside an agent zip: AgentPackaging.package_agent_zip (raw copy of
+# the unchanged entries) vs. extracting the zip and compressing every entry again with zipfile, as the scripts did
+# before, and vs. the jdk "jar" tool if it is installed. the agent zip is generated like the mock server's.
+# usage: python benchmarks/bench_agent_packaging.py [--entries=2000] [--entry_size=4096] [--runs=5]
+
+import getopt
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from asoc_automation_iast.AgentPackaging import package_agent_zip, asoc_config_json
+from asoc_automation_iast.IastUtils import asoc_config_filename, war_name
+from mock_asoc_server import build_agent_zip
+
+
+# extract, add the config to the war and zip again, every entry is decompressed and compressed again
+def package_with_zipfile(source_zip, destination_zip, config, work_dir, jar=False):
+    extract_dir = os.path.join(work_dir, "extract")
+    with zipfile.ZipFile(source_zip) as agent_zip:
+        agent_zip.extractall(extract_dir)
+    war_path = os.path.join(extract_dir, war_name)
+    if jar:
+        with open(os.path.join(extract_dir, asoc_config_filename), "wb") as config_file:
+            config_file.write(config)
+        subprocess.run(["jar", "-uf", war_name, asoc_config_filename], cwd=extract_dir, check=True,
+                       stdout=subprocess.DEVNULL)
+        os.remove(os.path.join(extract_dir, asoc_config_filename))
+    else:
+        new_war_path = war_path + ".new"
+        with zipfile.ZipFile(war_path) as war, zipfile.ZipFile(new_war_path, "w", zipfile.ZIP_DEFLATED) as new_war:
+            for info in war.infolist():
+                new_war.writestr(info, war.read(info), compress_type=zipfile.ZIP_DEFLATED)
+            new_war.writestr(asoc_config_filename, config)
+        os.replace(new_war_path, war_path)
+    with zipfile.ZipFile(destination_zip, "w", zipfile.ZIP_DEFLATED) as new_zip:
+        for root, dirs, files in os.walk(extract_dir):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                new_zip.write(path, os.path.relpath(path, extract_dir))
+    shutil.rmtree(extract_dir)
+
+
+def check_package(path, config):
+    with zipfile.ZipFile(path) as agent_zip:
+        with zipfile.ZipFile(io.BytesIO(agent_zip.read(war_name))) as war:
+            assert war.read(asoc_config_filename) == config
+            assert war.testzip() is None
+
+
+def bench(name, function, runs):
+    times = []
+    for run in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    print(f"{name:<28} mean {sum(times) / len(times):7.3f}s  min {min(times):7.3f}s")
+    return min(times)
+
+
+def main():
+    entries, entry_size, runs = 2000, 4096, 5
+    opts, args = getopt.getopt(sys.argv[1:], "", ["entries=", "entry_size=", "runs="])
+    for opt, arg in opts:
+        if opt == "--entries":
+            entries = int(arg)
+        elif opt == "--entry_size":
+            entry_size = int(arg)
+        elif opt == "--runs":
+            runs = int(arg)
+
+    work_dir = tempfile.mkdtemp(prefix="bench_agent_packaging")
+    try:
+        source_zip = os.path.join(work_dir, "IASTAgent.temp.zip")
+        destination_zip = os.path.join(work_dir, "IASTAgent.zip")
+        with open(source_zip, "wb") as source_file:
+            source_file.write(build_agent_zip(entries, entry_size))
+        config = asoc_config_json("bench-agent-key")
+        print(f"agent zip of {os.path.getsize(source_zip) / 1e6:.1f}MB, {entries} entries of {entry_size} bytes")
+
+        raw_time = bench("package_agent_zip", lambda: package_agent_zip(source_zip, destination_zip, config), runs)
+        check_package(destination_zip, config)
+        zipfile_time = bench("extract + zipfile", lambda: package_with_zipfile(source_zip, destination_zip, config,
+                                                                               work_dir), runs)
+        check_package(destination_zip, config)
+        print(f"package_agent_zip is x{zipfile_time / raw_time:.1f} faster than extract + zipfile")
+        if shutil.which("jar"):
+            jar_time = bench("extract + jar", lambda: package_with_zipfile(source_zip, destination_zip, config,
+                                                                           work_dir, jar=True), runs)
+            print(f"package_agent_zip is x{jar_time / raw_time:.1f} faster than extract + jar")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
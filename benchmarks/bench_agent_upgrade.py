@@ -0,0 +1,135 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# wall clock of upgrading a DotNet agent nupkg with its configuration: AgentPackaging.package_agent with the old
+# package as previous (raw copy of the new entries) vs. extracting both packages, copying the config over and
+# compressing the new package again, as Powershell-script/AppscanDotNetIASTAgentUpdate.ps1 does. then, against the
+# local mock server, AgentUpgrade.check_for_upgrade of an agent that is up to date, with and without the agent cache.
+# usage: python benchmarks/bench_agent_upgrade.py [--entries=2000] [--entry_size=4096] [--runs=5] [--latency=0.05]
+
+import contextlib
+import getopt
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from asoc_automation_iast.AgentCache import AgentCache
+from asoc_automation_iast.AgentPackaging import package_agent, asoc_config_json, read_agent_config
+from asoc_automation_iast.AgentUpgrade import check_for_upgrade
+from asoc_automation_iast.RequestApi import AsocSession
+from mock_asoc_server import MockAsocServer, build_agent_package
+
+config_path = "iastConfig/asoc-config.json"
+
+
+# extract both packages, copy asoc-config.json and content/ of the old one over the new one and compress it again
+def upgrade_with_extract(old_package, new_package, destination, work_dir):
+    old_dir = os.path.join(work_dir, "Previous version")
+    new_dir = os.path.join(work_dir, "Latest version")
+    with zipfile.ZipFile(old_package) as old_zip:
+        old_zip.extractall(old_dir)
+    with zipfile.ZipFile(new_package) as new_zip:
+        new_zip.extractall(new_dir)
+    shutil.copy(os.path.join(old_dir, config_path), os.path.join(new_dir, config_path))
+    shutil.copytree(os.path.join(old_dir, "content"), os.path.join(new_dir, "content"), dirs_exist_ok=True)
+    with zipfile.ZipFile(destination, "w", zipfile.ZIP_DEFLATED) as upgraded_zip:
+        for root, dirs, files in os.walk(new_dir):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                upgraded_zip.write(path, os.path.relpath(path, new_dir).replace(os.sep, "/"))
+    shutil.rmtree(old_dir)
+    shutil.rmtree(new_dir)
+
+
+def check_upgraded(path, config):
+    with zipfile.ZipFile(path) as upgraded_zip:
+        assert upgraded_zip.testzip() is None
+        assert upgraded_zip.read(config_path) == config
+        assert upgraded_zip.read("content/custom.config") == b"<custom/>"
+        assert b"<version>1.1.0</version>" in upgraded_zip.read("com.HCL.AppScan.IAST.agent.nuspec")
+
+
+def bench(name, function, runs):
+    times = []
+    for run in range(runs):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    print(f"{name:<36} mean {sum(times) / len(times):7.3f}s  min {min(times):7.3f}s")
+    return min(times)
+
+
+def main():
+    entries, entry_size, runs, latency = 2000, 4096, 5, 0.05
+    opts, args = getopt.getopt(sys.argv[1:], "", ["entries=", "entry_size=", "runs=", "latency="])
+    for opt, arg in opts:
+        if opt == "--entries":
+            entries = int(arg)
+        elif opt == "--entry_size":
+            entry_size = int(arg)
+        elif opt == "--runs":
+            runs = int(arg)
+        elif opt == "--latency":
+            latency = float(arg)
+
+    work_dir = tempfile.mkdtemp(prefix="bench_agent_upgrade")
+    try:
+        config = asoc_config_json("bench-agent-key")
+        old_package = os.path.join(work_dir, "com.HCL.AppScan.IAST.agent.1.0.0.nupkg")
+        new_package = os.path.join(work_dir, "base.nupkg")
+        destination = os.path.join(work_dir, "com.HCL.AppScan.IAST.agent.1.1.0.nupkg")
+        with open(os.path.join(work_dir, "base-1.0.0.nupkg"), "wb") as base_file:
+            base_file.write(build_agent_package("DotNet", entries, entry_size, "1.0.0")[0])
+        with open(new_package, "wb") as new_file:
+            new_file.write(build_agent_package("DotNet", entries, entry_size, "1.1.0")[0])
+        package_agent("DotNet", os.path.join(work_dir, "base-1.0.0.nupkg"), old_package, config)
+        with zipfile.ZipFile(old_package, "a") as old_zip:
+            old_zip.writestr("content/custom.config", "<custom/>")
+        print(f"DotNet agent of {os.path.getsize(new_package) / 1e6:.1f}MB, {entries} entries of {entry_size} bytes")
+
+        raw_time = bench("package_agent, previous=old", lambda: package_agent(
+            "DotNet", new_package, destination, read_agent_config("DotNet", old_package), previous=old_package), runs)
+        check_upgraded(destination, config)
+        extract_time = bench("extract + copy + recompress", lambda: upgrade_with_extract(
+            old_package, new_package, destination, work_dir), runs)
+        check_upgraded(destination, config)
+        print(f"package_agent is x{extract_time / raw_time:.1f} faster than extract + recompress")
+
+        # an agent that is up to date: the whole agent is downloaded to check it, or one 304 with the agent cache
+        with MockAsocServer(latency=latency, agent_entries=entries, agent_entry_size=entry_size) as server, \
+                AsocSession() as session:
+            agent_key = server.add_agent_key(server.add_scan(server.add_app("bench-upgrade"), "bench-upgrade",
+                                                             "DotNet"))
+            installed = os.path.join(work_dir, "installed.nupkg")
+            package_agent("DotNet", io.BytesIO(server.get_agent("DotNet")), installed, asoc_config_json(agent_key))
+            print(f"\n{latency * 1000:.0f}ms latency per request")
+
+            def check(agent_cache):
+                # RequestApi prints every response, keep it out of the measurement
+                with contextlib.redirect_stdout(io.StringIO()):
+                    upgrade = check_for_upgrade("DotNet", installed, server.url, agent_cache=agent_cache,
+                                                session=session)
+                upgrade.discard_download()
+                assert not upgrade.available
+            bench("check_for_upgrade, up to date", lambda: check(None), runs)
+            agent_cache = AgentCache(os.path.join(work_dir, "cache"))
+            check(agent_cache)
+            bench("check_for_upgrade, agent cache", lambda: check(agent_cache), runs)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# time and memory of classifying the issues of several executions as new / recurring / fixed findings with
+# FindingIndex, compared with a bare set of the AsmHash strings, and the size of the index on disk next to the plain
+# AsmHash list. runs offline, without the mock server.
+# usage: python benchmarks/bench_finding_index.py [--findings=500000] [--executions=4] [--changed=1000]
+
+import getopt
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from itertools import chain
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from asoc_automation_iast.FindingIndex import FindingIndex
+from mock_asoc_server import create_issue
+
+
+def measured(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+# AsmHash set baseline: the findings kept as a set of strings
+def compare_with_set(known, issues):
+    found = {}
+    for issue in issues:
+        found.setdefault(issue["AsmHash"], []).append(issue)
+    new = {asm_hash: found_issues for asm_hash, found_issues in found.items() if asm_hash not in known}
+    fixed = [asm_hash for asm_hash in known if asm_hash not in found]
+    return new, fixed
+
+
+def main():
+    findings, executions, changed = 500000, 4, 1000
+    opts, args = getopt.getopt(sys.argv[1:], "", ["findings=", "executions=", "changed="])
+    for opt, arg in opts:
+        if opt == "--findings":
+            findings = int(arg)
+        elif opt == "--executions":
+            executions = int(arg)
+        elif opt == "--changed":
+            changed = int(arg)
+
+    # every execution finds a part of the findings, together they find all but <changed> of them plus <changed> new
+    per_execution = (findings + executions - 1) // executions
+    known_issues = [create_issue("previous", i) for i in range(findings)]
+    execution_issues = [[create_issue(f"execution{e}", i)
+                         for i in range(changed + e * per_execution, min(findings, (e + 1) * per_execution) + changed)]
+                        for e in range(executions)]
+    print(f"{findings} indexed findings, {executions} executions with {sum(map(len, execution_issues))} issues, "
+          f"{changed} new and {changed} fixed findings")
+
+    elapsed, peak, index = measured(lambda: FindingIndex.from_issues(known_issues))
+    print(f"{'build FindingIndex':<28} {elapsed:7.3f}s  peak {peak / 1024 / 1024:7.1f}MB")
+    elapsed, peak, known = measured(lambda: {issue["AsmHash"] for issue in known_issues})
+    print(f"{'build AsmHash set':<28} {elapsed:7.3f}s  peak {peak / 1024 / 1024:7.1f}MB")
+
+    elapsed, peak, comparison = measured(lambda: index.compare(chain(*execution_issues)))
+    print(f"{'FindingIndex.compare':<28} {elapsed:7.3f}s  peak {peak / 1024 / 1024:7.1f}MB  "
+          f"new {len(comparison.new)}, recurring {len(comparison.recurring)}, fixed {len(comparison.fixed)}")
+    elapsed, peak, (new, fixed) = measured(lambda: compare_with_set(known, chain(*execution_issues)))
+    print(f"{'AsmHash set':<28} {elapsed:7.3f}s  peak {peak / 1024 / 1024:7.1f}MB  "
+          f"new {len(new)}, fixed {len(fixed)}")
+
+    index_dir = tempfile.mkdtemp(prefix="bench_finding_index")
+    try:
+        path = os.path.join(index_dir, "app.findings")
+        start = time.perf_counter()
+        index.save(path)
+        saved = time.perf_counter() - start
+        start = time.perf_counter()
+        FindingIndex.load(path)
+        loaded = time.perf_counter() - start
+        plain_size = sum(len(asm_hash) + 1 for asm_hash in index.asm_hashes)
+        print(f"{'save / load':<28} {saved:7.3f}s / {loaded:.3f}s  {os.path.getsize(path) / 1024 / 1024:.1f}MB on disk "
+              f"({plain_size / 1024 / 1024:.1f}MB as plain text)")
+    finally:
+        shutil.rmtree(index_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# wall clock of fetching the details of many issues against the local mock server: one by one with
+# get_issue_details_from_asoc vs. IssueDetailsFetcher with a worker pool, and again from its cache.
+# usage: python benchmarks/bench_issue_details.py [--issues=500] [--workers=16] [--rate=0] [--latency=0.05]
+#                                                 [--error_rate=0]
+
+import contextlib
+import getopt
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from asoc_automation_iast.AsocReportUtils import get_issue_details_from_asoc
+from asoc_automation_iast.IssueDetails import IssueDetailsFetcher
+from asoc_automation_iast.RequestApi import AsocSession
+from mock_asoc_server import MockAsocServer, create_issue
+
+
+def timed(function):
+    start = time.perf_counter()
+    # RequestApi prints every url, keep it out of the measurement
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    issues, workers, rate, latency, error_rate = 500, 16, 0.0, 0.05, 0.0
+    opts, args = getopt.getopt(sys.argv[1:], "", ["issues=", "workers=", "rate=", "latency=", "error_rate="])
+    for opt, arg in opts:
+        if opt == "--issues":
+            issues = int(arg)
+        elif opt == "--workers":
+            workers = int(arg)
+        elif opt == "--rate":
+            rate = float(arg)
+        elif opt == "--latency":
+            latency = float(arg)
+        elif opt == "--error_rate":
+            error_rate = float(arg)
+
+    cache_dir = tempfile.mkdtemp(prefix="bench_issue_details")
+    try:
+        with MockAsocServer(latency=latency, error_rate=error_rate, error_status=429) as server, \
+                AsocSession(token="token", pool_size=workers) as session:
+            print(f"{issues} issues, {workers} workers, rate limit {rate or 'none'}, "
+                  f"{latency * 1000:.0f}ms latency per request, error rate {error_rate}")
+            scan_issues = [create_issue("scan", i) for i in range(issues)]
+            sample = scan_issues[:max(1, issues // 10)]
+            serial_time, _ = timed(lambda: [get_issue_details_from_asoc(issue["Id"], "token", server.api_url,
+                                                                        session=session) for issue in sample])
+            serial_time *= issues / len(sample)
+            print(f"one by one (estimated):  {serial_time:7.3f}s")
+            fetcher = IssueDetailsFetcher("token", server.api_url, cache_dir, workers=workers, rate=rate or None,
+                                          session=session)
+            for name in ("fetcher", "fetcher, cached"):
+                elapsed, result = timed(lambda: fetcher.fetch_details(scan_issues))
+                print(f"{name + ':':<24} {elapsed:7.3f}s  x{serial_time / elapsed:.1f}  {result}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# wall clock of fetching all the issues of a scan serially (iter_issues_for_scan) vs. in parallel
+# (get_all_issues_for_scan) against the local mock server.
+# usage: python benchmarks/bench_issue_paging.py [--issues=20000] [--page_size=500] [--latency=0.05]
+
+import contextlib
+import getopt
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from asoc_automation_iast.AsocReportUtils import iter_issues_for_scan, get_all_issues_for_scan
+from asoc_automation_iast.RequestApi import AsocSession
+from mock_asoc_server import MockAsocServer
+
+
+def timed(function):
+    start = time.perf_counter()
+    # RequestApi prints every url, keep it out of the measurement
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    issues, page_size, latency = 20000, 500, 0.05
+    opts, args = getopt.getopt(sys.argv[1:], "", ["issues=", "page_size=", "latency="])
+    for opt, arg in opts:
+        if opt == "--issues":
+            issues = int(arg)
+        elif opt == "--page_size":
+            page_size = int(arg)
+        elif opt == "--latency":
+            latency = float(arg)
+
+    with MockAsocServer(latency=latency, max_page_size=page_size, issues_per_scan=issues) as server:
+        print(f"{issues} issues, page size {page_size}, {latency * 1000:.0f}ms latency per request")
+        with AsocSession(token="token", pool_size=16) as session:
+            serial_time, serial = timed(lambda: list(iter_issues_for_scan("scan", None, server.api_url,
+                                                                          page_size=page_size, session=session)))
+            print(f"serial:             {serial_time:7.3f}s  ({len(serial)} issues)")
+            for workers in (2, 4, 8, 16):
+                parallel_time, parallel = timed(lambda: get_all_issues_for_scan("scan", None, server.api_url,
+                                                                                page_size=page_size, workers=workers,
+                                                                                session=session))
+                assert parallel["Items"] == serial
+                print(f"parallel {workers:2} workers: {parallel_time:7.3f}s  x{serial_time / parallel_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
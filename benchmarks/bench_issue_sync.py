@@ -0,0 +1,89 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# wall clock and requests of syncing the issues of a scan with IssueSync against the local mock server: the first
+# (full) sync, then incremental syncs after a few issues were updated / added and after issues were removed, compared
+# with fetching all the issues again.
+# usage: python benchmarks/bench_issue_sync.py [--issues=20000] [--page_size=500] [--latency=0.05] [--changed=200]
+
+import contextlib
+import getopt
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from asoc_automation_iast.AsocReportUtils import get_all_issues_for_scan
+from asoc_automation_iast.IssueSync import IssueSync
+from asoc_automation_iast.RequestApi import AsocSession
+from mock_asoc_server import MockAsocServer
+
+
+def timed(server, function):
+    requests = server.request_count
+    start = time.perf_counter()
+    # RequestApi prints every url, keep it out of the measurement
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function()
+    return time.perf_counter() - start, server.request_count - requests, result
+
+
+def main():
+    issues, page_size, latency, changed = 20000, 500, 0.05, 200
+    opts, args = getopt.getopt(sys.argv[1:], "", ["issues=", "page_size=", "latency=", "changed="])
+    for opt, arg in opts:
+        if opt == "--issues":
+            issues = int(arg)
+        elif opt == "--page_size":
+            page_size = int(arg)
+        elif opt == "--latency":
+            latency = float(arg)
+        elif opt == "--changed":
+            changed = int(arg)
+
+    sync_dir = tempfile.mkdtemp(prefix="bench_issue_sync")
+    try:
+        with MockAsocServer(latency=latency, max_page_size=page_size, issues_per_scan=issues) as server, \
+                AsocSession(token="token", pool_size=16) as session:
+            print(f"{issues} issues, page size {page_size}, {latency * 1000:.0f}ms latency per request, "
+                  f"{changed} issues changed between syncs")
+            issue_sync = IssueSync("token", server.api_url, sync_dir, page_size=page_size, overlap=0, session=session)
+
+            def report(name, elapsed, requests, result):
+                print(f"{name:<28} {elapsed:7.3f}s  {requests:4} requests  {result.fetched:6} issues fetched  "
+                      f"+{len(result.added)} -{len(result.removed)} ~{len(result.changed)}")
+
+            report("first sync (full)", *timed(server, lambda: issue_sync.sync_scan("scan")))
+            # the generated issues all have the same LastUpdated, which every sync would fetch again (ge). update one
+            # issue, so that the next syncs start after it
+            time.sleep(1)
+            server.change_issues("scan", updated=1)
+            timed(server, lambda: issue_sync.sync_scan("scan"))
+            time.sleep(1)
+            server.change_issues("scan", updated=changed // 2, added=changed // 2)
+            report("updated and added issues", *timed(server, lambda: issue_sync.sync_scan("scan")))
+            time.sleep(1)
+            server.change_issues("scan", removed=changed)
+            report("removed issues", *timed(server, lambda: issue_sync.sync_scan("scan")))
+            report("no changes", *timed(server, lambda: issue_sync.sync_scan("scan")))
+            elapsed, requests, full = timed(server, lambda: get_all_issues_for_scan("scan", None, server.api_url,
+                                                                                    page_size=page_size,
+                                                                                    session=session))
+            print(f"{'get_all_issues_for_scan':<28} {elapsed:7.3f}s  {requests:4} requests  "
+                  f"{len(full['Items']):6} issues fetched")
+    finally:
+        shutil.rmtree(sync_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
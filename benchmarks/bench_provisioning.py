@@ -0,0 +1,157 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# wall clock of end to end agent provisioning against the local mock server: ConfigureIastAgent.main() for a new app,
+# an existing app and an existing scan (with and without the agent cache), and a batch with
+# Provisioning.provision_agents - also a batch of Java, DotNet and NodeJS agents, compared with one batch per agent
+# type. prints the requests sent per endpoint for the single runs.
+# usage: python benchmarks/bench_provisioning.py [--runs=5] [--batch=20] [--workers=8] [--latency=0.05]
+#                                                [--agent_entries=2000] [--error_rate=0]
+
+import contextlib
+import getopt
+import io
+import os
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+
+repo_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, repo_dir)
+
+from asoc_automation_iast.AgentCache import AgentCache
+from asoc_automation_iast.Provisioning import ProvisioningItem, provision_agents, format_provisioning_summary
+from asoc_automation_iast.RequestApi import AsocSession
+from asoc_automation_iast.RequestMetrics import collect_request_metrics
+from mock_asoc_server import MockAsocServer
+
+
+def timed(function):
+    start = time.perf_counter()
+    # RequestApi prints every url, keep it out of the measurement
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        result = function()
+    return time.perf_counter() - start, result
+
+
+# runs ConfigureIastAgent.py as the command line does, in work_dir. returns the exit code
+def run_configure_iast_agent(arguments, work_dir):
+    saved_argv, saved_dir = sys.argv, os.getcwd()
+    sys.argv = [os.path.join(repo_dir, "ConfigureIastAgent.py")] + arguments
+    os.chdir(work_dir)
+    try:
+        runpy.run_path(sys.argv[0], run_name="__main__")
+        return 0
+    except SystemExit as e:
+        return e.code or 0
+    finally:
+        sys.argv = saved_argv
+        os.chdir(saved_dir)
+
+
+def bench_single(server, name, arguments, runs, work_dir):
+    times = []
+    with collect_request_metrics() as metrics:
+        for run in range(runs):
+            run_dir = os.path.join(work_dir, f"{name.replace(' ', '-')}-{run}")
+            os.makedirs(run_dir)
+            elapsed, exit_code = timed(lambda: run_configure_iast_agent(arguments(run), run_dir))
+            if exit_code != 0 or not os.path.isfile(os.path.join(run_dir, "IASTAgent.zip")):
+                print(f"{name}: run {run} failed with exit code {exit_code}")
+                continue
+            times.append(elapsed)
+    if times:
+        calls = sum(stats["count"] for stats in metrics.summary().values())
+        print(f"{name:<36} mean {sum(times) / len(times):7.3f}s  min {min(times):7.3f}s  "
+              f"({calls / runs:.0f} requests per run)")
+    return metrics
+
+
+def main():
+    runs, batch, workers, latency, agent_entries, error_rate = 5, 20, 8, 0.05, 2000, 0.0
+    opts, args = getopt.getopt(sys.argv[1:], "", ["runs=", "batch=", "workers=", "latency=", "agent_entries=",
+                                                  "error_rate="])
+    for opt, arg in opts:
+        if opt == "--runs":
+            runs = int(arg)
+        elif opt == "--batch":
+            batch = int(arg)
+        elif opt == "--workers":
+            workers = int(arg)
+        elif opt == "--latency":
+            latency = float(arg)
+        elif opt == "--agent_entries":
+            agent_entries = int(arg)
+        elif opt == "--error_rate":
+            error_rate = float(arg)
+
+    work_dir = tempfile.mkdtemp(prefix="bench_provisioning")
+    try:
+        with MockAsocServer(latency=latency, agent_entries=agent_entries, error_rate=error_rate) as server:
+            print(f"{latency * 1000:.0f}ms latency per request, agent of {len(server.get_agent()) / 1e6:.1f}MB, "
+                  f"error rate {error_rate}")
+            app_id = server.add_app("bench-app")
+            scan_id = server.add_scan(app_id, "bench-scan")
+            login = ["--id=key", "--secret=secret", "--host=" + server.url]
+            agent_cache = os.path.join(work_dir, "agent-cache")
+
+            bench_single(server, "new app and scan", lambda run: login + [f"--app_name=bench-new-{run}"], runs,
+                         work_dir)
+            bench_single(server, "existing app, new scan", lambda run: login + [f"--app_id={app_id}"], runs,
+                         work_dir)
+            bench_single(server, "existing scan", lambda run: login + [f"--scan_id={scan_id}"], runs, work_dir)
+            metrics = bench_single(server, "existing scan, agent cache",
+                                   lambda run: login + [f"--scan_id={scan_id}", "--agent_cache=" + agent_cache],
+                                   runs, work_dir)
+            print(metrics.format_summary())
+
+            with AsocSession(token="token", pool_size=max(workers, 10)) as session:
+                for cache in (None, AgentCache(agent_cache)):
+                    items = [ProvisioningItem(app_name=f"bench-batch-{i % 5}", scan_name=f"bench-batch-scan-{i}",
+                                              output=f"IASTAgent-{i}.zip") for i in range(batch)]
+                    output_dir = os.path.join(work_dir, "batch-cache" if cache else "batch")
+                    elapsed, items = timed(lambda: provision_agents(items, "token", output_dir, server.url,
+                                                                    workers=workers, agent_cache=cache,
+                                                                    session=session))
+                    label = f"batch of {batch}, {workers} workers" + (", agent cache" if cache else "")
+                    print(f"{label:<36} {elapsed:7.3f}s  {elapsed / batch:7.3f}s per agent")
+                    failed = [item for item in items if not item.succeeded]
+                    if failed:
+                        print(format_provisioning_summary(failed))
+
+                agent_types = ("Java", "DotNet", "NodeJS")
+
+                def polyglot_items(prefix):
+                    return [ProvisioningItem(app_name=f"{prefix}-{i % 5}", scan_name=f"{prefix}-scan-{i}",
+                                             agent_type=agent_types[i % len(agent_types)]) for i in range(batch)]
+
+                def batch_per_type(items):
+                    for agent_type in agent_types:
+                        provision_agents([item for item in items if item.agent_type == agent_type], "token",
+                                         os.path.join(work_dir, "polyglot-serial"), server.url, workers=workers,
+                                         session=session)
+                    return items
+                for label, function in (("batch per agent type", batch_per_type),
+                                        ("polyglot batch", lambda items: provision_agents(
+                                            items, "token", os.path.join(work_dir, "polyglot"), server.url,
+                                            workers=workers, session=session))):
+                    elapsed, items = timed(lambda: function(polyglot_items(label.replace(" ", "-"))))
+                    label = f"{label} of {batch}, {len(agent_types)} types"
+                    print(f"{label:<36} {elapsed:7.3f}s  {elapsed / batch:7.3f}s per agent")
+                    failed = [item for item in items if not item.succeeded]
+                    if failed:
+                        print(format_provisioning_summary(failed))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# wall clock of report downloads against the local mock server: one large report read to memory (download_report)
+# vs. streamed to a file (download_report_to_file), and many reports created, polled and downloaded one after the
+# other (create_report + wait_for_report_ready) vs. with ReportPipeline.run_report_pipeline.
+# usage: python benchmarks/bench_report_download.py [--report_size=50000000] [--reports=20] [--report_delay=2]
+#                                                   [--latency=0.05] [--error_rate=0]
+
+import contextlib
+import getopt
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from asoc_automation_iast.AsocUtils import create_report, download_report, download_report_to_file, \
+    poll_report_ready
+from asoc_automation_iast.ReportPipeline import run_report_pipeline, format_report_timings
+from asoc_automation_iast.RequestApi import AsocSession
+from mock_asoc_server import MockAsocServer
+
+
+def timed(function):
+    start = time.perf_counter()
+    # RequestApi prints every url, keep it out of the measurement
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function()
+    return time.perf_counter() - start, result
+
+
+# returns seconds, peak traced memory in bytes and the result of function
+def timed_with_memory(function):
+    tracemalloc.start()
+    try:
+        elapsed, result = timed(function)
+        return elapsed, tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    report_size, reports, report_delay, latency, error_rate = 50 * 1000 * 1000, 20, 2.0, 0.05, 0.0
+    opts, args = getopt.getopt(sys.argv[1:], "", ["report_size=", "reports=", "report_delay=", "latency=",
+                                                  "error_rate="])
+    for opt, arg in opts:
+        if opt == "--report_size":
+            report_size = int(arg)
+        elif opt == "--reports":
+            reports = int(arg)
+        elif opt == "--report_delay":
+            report_delay = float(arg)
+        elif opt == "--latency":
+            latency = float(arg)
+        elif opt == "--error_rate":
+            error_rate = float(arg)
+
+    work_dir = tempfile.mkdtemp(prefix="bench_report_download")
+    try:
+        with MockAsocServer(latency=latency, report_size=report_size, report_delay=report_delay,
+                            error_rate=error_rate) as server, AsocSession(token="token", pool_size=16) as session:
+            print(f"{len(server.get_report()) / 1e6:.0f}MB report, {latency * 1000:.0f}ms latency per request, "
+                  f"{report_delay}s report generation, error rate {error_rate}")
+            app_id = server.add_app("bench-app")
+            scan_ids = [server.add_scan(app_id, f"bench-scan-{i}") for i in range(reports)]
+            _, report_id = timed(lambda: create_report(scan_ids[0], "token", server.url, session=session))
+            time.sleep(report_delay)
+
+            memory_time, memory_peak, text = timed_with_memory(
+                lambda: download_report(report_id, "token", server.url, session=session))
+            print(f"download_report:         {memory_time:7.3f}s  peak memory {memory_peak / 1e6:7.1f}MB")
+            path = os.path.join(work_dir, "report.xml")
+            file_time, file_peak, size = timed_with_memory(
+                lambda: download_report_to_file(report_id, "token", path, server.url, session=session))
+            assert size == len(text.encode("utf-8"))
+            print(f"download_report_to_file: {file_time:7.3f}s  peak memory {file_peak / 1e6:7.1f}MB")
+
+            server.report_size = min(report_size, 1000 * 1000)
+            server.report = None
+
+            def serial():
+                for scan_id in scan_ids:
+                    serial_report_id = create_report(scan_id, "token", server.url, session=session)
+                    poll_report_ready(serial_report_id, "token", server.url, session=session)
+                    download_report_to_file(serial_report_id, "token", os.path.join(work_dir, f"serial_{scan_id}.xml"),
+                                            server.url, session=session)
+            serial_time, _ = timed(serial)
+            print(f"{reports} reports one by one: {serial_time:7.3f}s")
+            pipeline_time, result = timed(lambda: run_report_pipeline(scan_ids, "token",
+                                                                      os.path.join(work_dir, "pipeline"),
+                                                                      server.url, session=session))
+            print(f"{reports} reports pipeline:   {pipeline_time:7.3f}s  x{serial_time / pipeline_time:.1f}")
+            print(format_report_timings(result))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
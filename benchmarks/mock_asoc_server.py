@@ -0,0 +1,491 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# local stand-in for the ASoC REST api, used by the benchmarks to measure performance offline. implements the
+# api/v4 endpoints used by AsocUtils and AsocReportUtils (login, asset groups, apps, scans, reports, issues, agent
+# download) and the IAST/api endpoints used with an agent key. apps, scans and reports are kept in memory.
+#     latency: seconds added to every response
+#     max_page_size: largest $top the server honors, like the real server's page size cap
+#     issues_per_scan: number of issues returned for every scan / execution
+#     error_rate: fraction of requests answered with error_status (and Retry-After: 0) instead of the real response
+#     report_size: bytes of every downloaded report
+#     report_delay: seconds a report is Running before it is Ready
+#     agent_entries, agent_entry_size: number and size of the files of every agent package (the class files in the war
+#                                      of the Java agent zip)
+#     details_size: bytes of the xml details of every issue
+#     seed: seed of the error injection, so runs are repeatable
+
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zipfile
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+filter_pattern = re.compile(r"^\s*(\w+)\s+(eq|ne|in|gt|ge|lt|le)\s+(.+?)\s*$")
+issue_timestamp = "2026-01-01T00:00:00.000Z"
+id_pattern = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+agent_types = ("Java", "DotNet", "NodeJS")
+
+
+class MockAsocServer:
+    def __init__(self, latency=0.0, max_page_size=1000, issues_per_scan=1000, port=0, error_rate=0.0,
+                 error_status=503, report_size=1024 * 1024, report_delay=0.0, agent_entries=200,
+                 agent_entry_size=4096, details_size=8192, seed=0):
+        self.latency = latency
+        self.max_page_size = max_page_size
+        self.issues_per_scan = issues_per_scan
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.report_size = report_size
+        self.report_delay = report_delay
+        self.agent_entries = agent_entries
+        self.agent_entry_size = agent_entry_size
+        self.details_size = details_size
+        self.random = random.Random(seed)
+        self.request_count = 0
+        self.error_count = 0
+        self.requests = {}
+        self.lock = threading.Lock()
+        self.asset_group_id = "asset-group-default"
+        self.apps = {}
+        self.scans = {}
+        self.reports = {}
+        self.issues = {}
+        self.added_issues = 0
+        # agent type: (package, etag, file name)
+        self.agents = {}
+        self.agent_version = "1.0.0"
+        # agent key: agent type of its scan, for the agent download with the agent key
+        self.agent_keys = {}
+        self.report = None
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self.create_handler())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_port}/"
+
+    # base url for the AsocReportUtils functions, which expect the api path in the host
+    @property
+    def api_url(self):
+        return self.url + "api/v4"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    # adds an app (and optionally scans of it) to the server, returns the app id
+    def add_app(self, name, scan_names=()):
+        app_id = new_id()
+        with self.lock:
+            self.apps[app_id] = {"Id": app_id, "Name": name, "AssetGroupId": self.asset_group_id,
+                                 "LastUpdated": "2026-01-01T00:00:00Z"}
+        for scan_name in scan_names:
+            self.add_scan(app_id, scan_name)
+        return app_id
+
+    def add_scan(self, app_id, name, agent_type="Java"):
+        scan_id = new_id()
+        with self.lock:
+            self.scans[scan_id] = {"Id": scan_id, "Name": name, "AppId": app_id,
+                                   "AppName": self.apps[app_id]["Name"], "AgentType": agent_type}
+        return scan_id
+
+    # a new agent key of a scan
+    def add_agent_key(self, scan_id):
+        key = "mock-agent-key-" + new_id()
+        with self.lock:
+            scan = self.scans.get(scan_id)
+            self.agent_keys[key] = scan["AgentType"] if scan is not None else "Java"
+        return key
+
+    # publishes a new build of the agents: the next downloads get new packages (and ETags) of the given version
+    def release_agent(self, version):
+        with self.lock:
+            self.agent_version = version
+            self.agents = {}
+
+    # number of requests received per "<method> <path>" with the ids replaced by {id}
+    def request_counts(self):
+        with self.lock:
+            return dict(self.requests)
+
+    # the agent package downloaded by the Tools/IastAgent and IAST/api/DownloadVersion endpoints, built once per
+    # agent type: IASTAgent.zip with Secagent.war inside for Java, a nupkg for DotNet, a zip for NodeJS
+    def get_agent(self, agent_type="Java"):
+        return self.get_agent_download(agent_type)[0]
+
+    # (package, etag, file name) of an agent type
+    def get_agent_download(self, agent_type="Java"):
+        with self.lock:
+            if agent_type not in self.agents:
+                package, file_name = build_agent_package(agent_type, self.agent_entries, self.agent_entry_size,
+                                                         self.agent_version)
+                etag = '"' + hashlib.sha256(package).hexdigest()[:16] + '"'
+                self.agents[agent_type] = (package, etag, file_name)
+            return self.agents[agent_type]
+
+    def agent_response(self, agent_type, headers):
+        if agent_type not in agent_types:
+            return 400, {"Message": f"unknown agent type {agent_type}"}
+        package, etag, file_name = self.get_agent_download(agent_type)
+        response = self.get_binary(package, headers, etag, "application/zip")
+        response[2]["Content-Disposition"] = f"attachment; filename={file_name}"
+        return response
+
+    def get_report(self):
+        with self.lock:
+            if self.report is None:
+                self.report = build_report(self.report_size)
+            return self.report
+
+    # the issues of a scan / execution: {Id: issue}, issues_per_scan generated issues until they are changed
+    def get_owner_issues(self, owner_id):
+        with self.lock:
+            if owner_id not in self.issues:
+                self.issues[owner_id] = dict((issue["Id"], issue) for issue in
+                                             (create_issue(owner_id, i) for i in range(self.issues_per_scan)))
+            return self.issues[owner_id]
+
+    # changes the issues of a scan / execution like a new scan would: updates the Status and LastUpdated of <updated>
+    # issues, removes <removed> issues and adds <added> new issues
+    def change_issues(self, owner_id, updated=0, removed=0, added=0, timestamp=None):
+        issues = self.get_owner_issues(owner_id)
+        timestamp = timestamp if timestamp is not None else time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime())
+        with self.lock:
+            issue_ids = list(issues)
+            for issue_id in issue_ids[:updated]:
+                issues[issue_id] = dict(issues[issue_id], Status="Fixed", LastUpdated=timestamp)
+            for issue_id in issue_ids[len(issue_ids) - removed:]:
+                del issues[issue_id]
+            for i in range(self.added_issues, self.added_issues + added):
+                issue = create_issue(owner_id, self.issues_per_scan + i, timestamp)
+                issues[issue["Id"]] = issue
+            self.added_issues += added
+
+    def get_issues(self, owner_id, query):
+        issues = self.get_owner_issues(owner_id)
+        with self.lock:
+            items = list(issues.values())
+        return self.get_items(items, query)
+
+    # OData list response of items, with $filter (eq / ne / in / gt / ge / lt / le on one field), $select, $skip,
+    # $top and $count
+    def get_items(self, items, query):
+        odata_filter = query.get("$filter", [None])[0]
+        if odata_filter:
+            match = filter_pattern.match(odata_filter)
+            if match is None:
+                return 400, {"Message": f"unsupported $filter {odata_filter}"}
+            field, operator, value = match.groups()
+            if operator in ("gt", "ge", "lt", "le"):
+                # timestamps and ids compare as strings
+                compare = {"gt": str.__gt__, "ge": str.__ge__, "lt": str.__lt__, "le": str.__le__}[operator]
+                items = [item for item in items if compare(str(item.get(field)), parse_value(value))]
+            else:
+                if operator == "in":
+                    values = {parse_value(part) for part in value.strip("()").split(",")}
+                else:
+                    values = {parse_value(value)}
+                items = [item for item in items if (str(item.get(field)) in values) == (operator != "ne")]
+        skip = int(query.get("$skip", ["0"])[0])
+        top = min(int(query.get("$top", [str(self.max_page_size)])[0]), self.max_page_size)
+        page = items[skip:skip + top]
+        select = query.get("$select", [None])[0]
+        if select:
+            fields = [field.strip() for field in select.split(",")]
+            page = [{field: item[field] for field in fields if field in item} for item in page]
+        body = {"Items": page}
+        if query.get("$count", ["false"])[0] == "true":
+            body["Count"] = len(items)
+        return 200, body
+
+    # response with binary content, honoring If-None-Match and Range: bytes=<start>- like the real server
+    def get_binary(self, payload, headers, etag=None, content_type="application/octet-stream"):
+        response_headers = {"Content-Type": content_type, "Accept-Ranges": "bytes"}
+        if etag is not None:
+            response_headers["ETag"] = etag
+            if headers.get("If-None-Match") == etag:
+                return 304, b"", response_headers
+        byte_range = re.match(r"bytes=(\d+)-$", headers.get("Range", ""))
+        if byte_range and (etag is None or headers.get("If-Range") in (None, etag)):
+            start = int(byte_range.group(1))
+            if start >= len(payload):
+                response_headers["Content-Range"] = f"bytes */{len(payload)}"
+                return 416, b"", response_headers
+            response_headers["Content-Range"] = f"bytes {start}-{len(payload) - 1}/{len(payload)}"
+            return 206, payload[start:], response_headers
+        return 200, payload, response_headers
+
+    def handle_api(self, method, parts, query, body, headers):
+        resource = parts[0] if parts else ""
+        if resource == "Account" and parts[1:] == ["ApiKeyLogin"] and method == "POST":
+            return 200, {"Token": "mock-token-" + new_id(), "Expire": "2099-01-01T00:00:00Z"}
+        if resource == "AssetGroups" and method == "GET":
+            return self.get_items([{"Id": self.asset_group_id, "IsDefault": "true"}], query)
+
+        if resource == "Apps":
+            if len(parts) == 1 and method == "GET":
+                with self.lock:
+                    apps = list(self.apps.values())
+                return self.get_items(apps, query)
+            if len(parts) == 1 and method == "POST":
+                model = json.loads(body)
+                app_id = new_id()
+                with self.lock:
+                    self.apps[app_id] = {"Id": app_id, "Name": model["Name"],
+                                         "AssetGroupId": model.get("AssetGroupId"),
+                                         "LastUpdated": "2026-01-01T00:00:00Z"}
+                return 201, {"Id": app_id, "Name": model["Name"]}
+            if len(parts) == 2 and method == "DELETE":
+                with self.lock:
+                    self.apps.pop(parts[1], None)
+                return 204, b""
+            if len(parts) == 3 and parts[2] == "Scans" and method == "GET":
+                with self.lock:
+                    scans = [scan for scan in self.scans.values() if scan["AppId"] == parts[1]]
+                return self.get_items(scans, query)
+
+        if resource == "Scans":
+            if len(parts) == 1 and method == "GET":
+                odata_filter = query.get("$filter", [""])[0]
+                if odata_filter.startswith("Id eq "):
+                    # a single scan is returned as an object, see AsocUtils.get_scan_info_by_id
+                    with self.lock:
+                        scan = self.scans.get(odata_filter[len("Id eq "):].strip())
+                    if scan is None:
+                        return 400, {"Message": "Client Error: 400 invalid scan id"}
+                    return 200, dict(scan)
+                with self.lock:
+                    scans = list(self.scans.values())
+                return self.get_items(scans, query)
+            if parts[1:] == ["Iast"] and method == "POST":
+                model = json.loads(body)
+                with self.lock:
+                    if model["AppId"] not in self.apps:
+                        return 400, {"Message": f"app {model['AppId']} not found"}
+                scan_id = self.add_scan(model["AppId"], model["ScanName"], model.get("AgentType", "Java"))
+                return 201, {"Id": scan_id, "Agentkey": self.add_agent_key(scan_id)}
+            if len(parts) == 3 and parts[1] == "NewIASTKey" and method == "POST":
+                return 200, {"Key": self.add_agent_key(parts[2])}
+            if len(parts) == 3 and parts[1] == "UpdateIastScan" and method == "PUT":
+                return 204, b""
+            if len(parts) == 2 and method == "DELETE":
+                with self.lock:
+                    self.scans.pop(parts[1], None)
+                return 204, b""
+
+        if resource == "FileUpload" and method == "POST":
+            return 201, {"FileId": new_id()}
+
+        if resource == "Tools" and parts[1:] in (["IastAgent"], ["IastAgentWithKey"]) and method == "GET":
+            return self.agent_response(query.get("type", ["Java"])[0], headers)
+
+        if resource == "Reports":
+            if len(parts) == 4 and parts[1] == "Security" and method == "POST":
+                report_id = new_id()
+                with self.lock:
+                    self.reports[report_id] = time.monotonic()
+                return 200, {"Id": report_id}
+            if len(parts) == 1 and method == "GET":
+                now = time.monotonic()
+                with self.lock:
+                    reports = [{"Id": report_id, "Status": "Ready" if now - created >= self.report_delay
+                                else "Running"} for report_id, created in self.reports.items()]
+                return self.get_items(reports, query)
+            if len(parts) == 3 and parts[2] == "Download" and method == "GET":
+                if parts[1] not in self.reports:
+                    return 404, {"Message": f"report {parts[1]} not found"}
+                return self.get_binary(self.get_report(), headers, content_type="text/xml")
+
+        if resource == "Issues" and method == "GET":
+            if len(parts) == 3 and parts[1] in ("Scan", "ScanExecution"):
+                return self.get_issues(parts[2], query)
+            if len(parts) == 2:
+                return 200, {"Id": parts[1], "AsmHash": "hash-" + parts[1], "IssueTypeId": "type0",
+                             "Status": "Open", "Severity": "High"}
+            if len(parts) == 3 and parts[2] == "Details":
+                details = f"<issue id='{parts[1]}'><details>{'x' * self.details_size}</details></issue>"
+                return 200, details.encode("utf-8"), {"Content-Type": "text/xml"}
+        return None
+
+    def handle_iast(self, method, parts, query, body, headers):
+        if parts == ["DownloadVersion"] and method == "GET":
+            # the agent of the type of the agent key's scan
+            agent_key = headers.get("Authorization", "")[len("Bearer "):]
+            with self.lock:
+                agent_type = self.agent_keys.get(agent_key, "Java")
+            return self.agent_response(agent_type, headers)
+        if parts == ["StartNewExecution"] and method == "POST":
+            return 200, {"ExecutionId": new_id()}
+        if parts == ["StopExecution"] and method == "POST":
+            return 200, {}
+        return None
+
+    # returns (status, dict or bytes) or (status, dict or bytes, response headers)
+    def handle(self, method, path, query, body, headers=None):
+        headers = headers if headers is not None else {}
+        parts = [part for part in path.split("/") if part]
+        with self.lock:
+            key = f"{method} {'/'.join('{id}' if id_pattern.match(part) else part for part in parts)}"
+            self.requests[key] = self.requests.get(key, 0) + 1
+            inject_error = self.error_rate and self.random.random() < self.error_rate
+            if inject_error:
+                self.error_count += 1
+        if inject_error:
+            return self.error_status, {"Message": "injected error"}, {"Retry-After": "0"}
+        response = None
+        if len(parts) >= 2 and parts[0].lower() == "api" and parts[1].lower() == "v4":
+            response = self.handle_api(method, parts[2:], query, body, headers)
+        elif len(parts) >= 2 and parts[0] == "IAST" and parts[1] == "api":
+            response = self.handle_iast(method, parts[2:], query, body, headers)
+        if response is None:
+            return 404, {"Message": f"{method} {path} is not implemented by the mock server"}
+        return response
+
+    def create_handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body are written separately, without TCP_NODELAY the body waits for a delayed ack
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def dispatch(self, method):
+                with mock.lock:
+                    mock.request_count += 1
+                parsed = urlparse(self.path)
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length) if length else b""
+                if mock.latency:
+                    time.sleep(mock.latency)
+                status, response, *response_headers = mock.handle(method, parsed.path, parse_qs(parsed.query), body,
+                                                                  self.headers)
+                response_headers = response_headers[0] if response_headers else {}
+                payload = response if isinstance(response, bytes) else json.dumps(response).encode("utf-8")
+                self.send_response(status)
+                if "Content-Type" not in response_headers:
+                    self.send_header("Content-Type", "application/json")
+                for name, value in response_headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self.dispatch("GET")
+
+            def do_POST(self):
+                self.dispatch("POST")
+
+            def do_PUT(self):
+                self.dispatch("PUT")
+
+            def do_DELETE(self):
+                self.dispatch("DELETE")
+
+        return Handler
+
+
+def new_id():
+    return str(uuid.uuid4())
+
+
+def create_issue(owner_id, i, timestamp=issue_timestamp):
+    return {"Id": f"{owner_id}-issue-{i}", "AsmHash": f"hash-{i}", "IssueTypeId": f"type{i % 20}",
+            "Path": f"/app/path/{i % 50}", "Api": f"GET /api/{i % 30}", "SourceFile": f"File{i % 40}.java",
+            "ScanName": f"scan-{owner_id}", "ApplicationId": "app-1", "Status": "Open",
+            "Severity": ("High", "Medium", "Low")[i % 3], "LastUpdated": timestamp}
+
+
+def parse_value(value):
+    return value.strip().strip("'")
+
+
+# IASTAgent.zip with a Secagent.war of <entries> class files of <entry_size> bytes each. the class files have
+# repeating content, so they compress about as well as real class files
+def build_agent_zip(entries, entry_size, version="1.0.0"):
+    war = io.BytesIO()
+    with zipfile.ZipFile(war, "w", zipfile.ZIP_DEFLATED) as war_zip:
+        war_zip.writestr("META-INF/MANIFEST.MF", f"Manifest-Version: 1.0\nImplementation-Version: {version}\n")
+        for i in range(entries):
+            war_zip.writestr(f"WEB-INF/classes/com/hcl/secagent/Class{i}.class", agent_entry_content(i, entry_size))
+    agent = io.BytesIO()
+    with zipfile.ZipFile(agent, "w", zipfile.ZIP_DEFLATED) as agent_zip:
+        agent_zip.writestr("readme.txt", "IAST agent\n")
+        agent_zip.writestr("Secagent.war", war.getvalue(), compress_type=zipfile.ZIP_STORED)
+    return agent.getvalue()
+
+
+# (package, file name) of the agent of an agent type, with <entries> files of <entry_size> bytes
+def build_agent_package(agent_type, entries, entry_size, version):
+    if agent_type == "Java":
+        return build_agent_zip(entries, entry_size, version), "IASTAgent.zip"
+    package = io.BytesIO()
+    package_id = "com.HCL.AppScan.IAST.agent"
+    with zipfile.ZipFile(package, "w", zipfile.ZIP_DEFLATED) as package_zip:
+        if agent_type == "DotNet":
+            package_zip.writestr(f"{package_id}.nuspec", f"<?xml version=\"1.0\"?>\n<package><metadata><id>{package_id}"
+                                                         f"</id><version>{version}</version></metadata></package>\n")
+            package_zip.writestr("iastConfig/asoc-config.json", "{}")
+            package_zip.writestr("content/iast-framework.config", f"<config version=\"{version}\"/>\n")
+            for i in range(entries):
+                package_zip.writestr(f"lib/net6.0/Agent{i}.dll", agent_entry_content(i, entry_size))
+        else:
+            package_zip.writestr("package/package.json", json.dumps({"name": "secagent", "version": version}))
+            for i in range(entries):
+                package_zip.writestr(f"package/lib/agent{i}.js", agent_entry_content(i, entry_size))
+    return package.getvalue(), f"{package_id}.{version}.nupkg" if agent_type == "DotNet" else "IASTAgent.zip"
+
+
+def agent_entry_content(i, entry_size):
+    seed = hashlib.sha256(str(i).encode("ascii")).digest()
+    return (seed * (entry_size // len(seed) + 1))[:entry_size]
+
+
+# xml report of about size bytes
+def build_report(size):
+    issue = "<issue><type>type{0}</type><path>/app/path/{0}</path><details>{1}</details></issue>\n"
+    parts = ["<?xml version=\"1.0\" encoding=\"utf-8\"?>\n<xml-report>\n"]
+    length = len(parts[0])
+    i = 0
+    while length < size:
+        part = issue.format(i, "x" * 200)
+        parts.append(part)
+        length += len(part)
+        i += 1
+    parts.append("</xml-report>\n")
+    return "".join(parts).encode("utf-8")
+
+
+if __name__ == "__main__":
+    with MockAsocServer(port=8080) as server:
+        print(f"mock ASoC server listening on {server.url}")
+        server.thread.join()
@@ -0,0 +1,52 @@
+#######################################################################################################################
+# Licensed Materials –Property of HCL Technologies Ltd.
+# © Copyright HCL Technologies Ltd. 2026.
+# All rights reserved. See product license for details. US Government Users Restricted Rights. Use, duplication,
+# or disclosure restricted by GSA ADP Schedule Contract with HCL Technologies Ltd. Java and all Java-based trademarks
+# and logos are trademarks or registered trademarks of Oracle and/or its affiliates. HCL, the HCL logo,
+# and Tivoli are registered trademarks of HCL Technologies in the United States, other countries, or both.
+#######################################################################################################################
+
+# runs all the benchmarks one after the other, each in its own python process. --quick runs them with small inputs,
+# e.g. to check that they still work.
+# usage: python benchmarks/run_all.py [--quick]
+
+import os
+import subprocess
+import sys
+import time
+
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+
+# benchmark script: arguments for --quick
+benchmarks = {
+    "bench_issue_paging.py": ["--issues=2000", "--page_size=200", "--latency=0.01"],
+    "bench_issue_sync.py": ["--issues=2000", "--page_size=200", "--latency=0.01", "--changed=20"],
+    "bench_issue_details.py": ["--issues=100", "--latency=0.01"],
+    "bench_finding_index.py": ["--findings=20000", "--changed=100"],
+    "bench_report_download.py": ["--report_size=5000000", "--reports=5", "--report_delay=0.5", "--latency=0.01"],
+    "bench_provisioning.py": ["--runs=2", "--batch=5", "--latency=0.01", "--agent_entries=200"],
+    "bench_agent_packaging.py": ["--entries=500", "--runs=2"],
+    "bench_agent_upgrade.py": ["--entries=500", "--runs=2", "--latency=0.01"],
+}
+
+
+def main():
+    quick = "--quick" in sys.argv[1:]
+    failed = []
+    for script, quick_arguments in benchmarks.items():
+        print(f"=== {script}", flush=True)
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, os.path.join(benchmarks_dir, script)] +
+                                (quick_arguments if quick else []), cwd=benchmarks_dir)
+        if result.returncode != 0:
+            failed.append(script)
+        print(f"=== {script} {'failed' if result.returncode != 0 else 'done'} in {time.perf_counter() - start:.1f}s\n",
+              flush=True)
+    if failed:
+        print(f"failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
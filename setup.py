@@ -7,4 +7,5 @@ setup(name='asoc_automation_iast',
       author='Tali Rabetti',
       author_email='tali.rabetti@hcl.com',
       packages=['asoc_automation_iast'],
-      zip_safe=False, install_requires=['urllib3', 'requests'])
+      zip_safe=False, install_requires=['urllib3', 'requests'],
+      extras_require={'async': ['httpx']})